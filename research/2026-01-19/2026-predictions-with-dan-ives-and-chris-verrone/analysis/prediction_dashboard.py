@@ -8,8 +8,8 @@ app = marimo.App()
 def _():
     import marimo as mo
     import pandas as pd
-    import requests
     import os
+    from src.life_agents.core.http import get_http_client
     from src.life_agents.core.utils import load_env_vars
     from datetime import datetime, timedelta
     import matplotlib.pyplot as plt
@@ -30,23 +30,30 @@ def _():
     - Thesis validation status (✅ Confirming / ⚠️ Neutral / ❌ Violating)
     - Key thresholds
     """.format(date=datetime.now().strftime('%Y-%m-%d %H:%M PST')))
-    return FRED_KEY, mo, pd, plt, requests
+    return FRED_KEY, get_http_client, mo, pd, plt
 
 
 @app.cell
-def _(pd):
+def _():
+    from src.life_agents.core.redfin import get_redfin_store
 
     def download_redfin_data():
-        """Download Redfin city-level housing data"""
+        """Download Redfin city-level housing data and load Irvine single-family homes"""
         print("Downloading Redfin city-level data...")
-    
-        # Redfin's city-level data URL
-        url = "https://redfin-public-data.s3.us-west-2.amazonaws.com/redfin_market_tracker/city_market_tracker.tsv000.gz"
-    
+
         try:
-            # Read the compressed TSV file directly from URL
-            df = pd.read_csv(url, sep='\t', compression='gzip')
-            print(f"✓ Downloaded {len(df):,} rows of data")
+            # Partitioned Parquet mirror of city_market_tracker.tsv000.gz;
+            # refresh re-downloads weekly and appends only new periods
+            store = get_redfin_store('city')
+            store.refresh()
+
+            df = store.load(
+                cities='Irvine',
+                states='CA',
+                property_types='Single Family Residential',
+                start='2023-01-01',
+            )
+            print(f"✓ Loaded {len(df):,} rows of data")
             return df
         except Exception as e:
             print(f"Error downloading data: {e}")
@@ -63,19 +70,17 @@ def _(redfin_df):
 
 
 @app.cell
-def _(pd, plt, redfin_df):
-    irvine_redfin_df = redfin_df[
-        redfin_df.CITY.eq('Irvine') &
-        redfin_df.STATE_CODE.eq('CA') & 
-        redfin_df.PROPERTY_TYPE.eq('Single Family Residential') &
-        redfin_df.PERIOD_BEGIN.ge('2023-01-01')
-    ].pipe(
+def _(mo, pd, redfin_df):
+    from src.life_agents.charts import small_multiples
+
+    # Already filtered to Irvine, CA single-family homes since 2023 on load
+    irvine_redfin_df = redfin_df.pipe(
         lambda d: d.assign(
             period = pd.to_datetime(d.PERIOD_BEGIN)
         )
     ).sort_values('PERIOD_BEGIN').set_index('PERIOD_BEGIN')
 
-    for c in [
+    IRVINE_METRICS = [
             'MEDIAN_SALE_PRICE',
            'MEDIAN_SALE_PRICE_MOM', 'MEDIAN_SALE_PRICE_YOY', 'MEDIAN_LIST_PRICE',
            'MEDIAN_LIST_PRICE_MOM', 'MEDIAN_LIST_PRICE_YOY', 'MEDIAN_PPSF',
@@ -89,21 +94,24 @@ def _(pd, plt, redfin_df):
            'MEDIAN_DOM_YOY', 'AVG_SALE_TO_LIST', 'AVG_SALE_TO_LIST_MOM',
            'AVG_SALE_TO_LIST_YOY', 'SOLD_ABOVE_LIST', 'SOLD_ABOVE_LIST_MOM',
            'SOLD_ABOVE_LIST_YOY', 'PRICE_DROPS', 'PRICE_DROPS_MOM'
-    ]:
-        plt.figure(figsize=(16, 8))
-        ax = plt.gca()
-        plt.title(c)
-        irvine_redfin_df[c].plot(ax=ax)
-        plt.show()
-    return c, irvine_redfin_df
+    ]
+
+    # One faceted image for all metrics, reused from disk while the data is unchanged
+    mo.image(small_multiples(
+        irvine_redfin_df,
+        IRVINE_METRICS,
+        ncols=4,
+        title='Irvine, CA single-family homes',
+    ))
+    return (irvine_redfin_df,)
 
 
 @app.cell
-def _(c, irvine_redfin_df, plt):
+def _(irvine_redfin_df, plt):
 
     plt.figure(figsize=(16, 8))
     ax2 = plt.gca()
-    plt.title(c)
+    plt.title('Irvine PPSF vs sale-to-list')
     irvine_redfin_df[[
         'MEDIAN_LIST_PPSF',
         'MEDIAN_PPSF',
@@ -114,30 +122,39 @@ def _(c, irvine_redfin_df, plt):
 
 
 @app.cell
-def _(FRED_KEY, pd, requests):
-    # FRED API Helper
-    def get_fred_data(series_id, start_date=None):
-        """Fetch data from FRED API"""
-        url = f"https://api.stlouisfed.org/fred/series/observations"
-        params = {
-            'series_id': series_id,
-            'api_key': FRED_KEY,
-            'file_type': 'json',
-            'sort_order': 'desc',
-            'limit': 100
-        }
-        if start_date:
-            params['observation_start'] = start_date
-
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            data = response.json()
-            df = pd.DataFrame(data['observations'])
-            df['date'] = pd.to_datetime(df['date'])
-            df['value'] = pd.to_numeric(df['value'], errors='coerce')
-            return df.sort_values('date')
-        return pd.DataFrame()
-    return
+def _(redfin_df):
+    from src.life_agents.core.metros import compare_metros
+
+    # Orange County cities for the home-purchase comparison: one indexed read
+    # of the city store refreshed above, aligned into periods x cities x metrics
+    OC_CITIES = [
+        'Irvine', 'Tustin', 'Costa Mesa', 'Newport Beach', 'Huntington Beach',
+        'Lake Forest', 'Mission Viejo', 'Laguna Niguel', 'Aliso Viejo', 'Orange',
+    ]
+    oc_panel = compare_metros(
+        OC_CITIES,
+        property_type='Single Family Residential',
+        start='2023-01-01',
+        states='CA',
+    ) if redfin_df is not None else None
+    oc_panel.latest() if oc_panel is not None else None
+    return (oc_panel,)
+
+
+@app.cell
+def _(FRED_KEY):
+    from src.life_agents.core.fred import get_fred_store
+
+    # Macro series kept locally with full history (DATA_DIR/fred); update only
+    # asks FRED about series not checked in the last FRED_MAX_AGE_HOURS and
+    # fetches observations only for those revised since
+    MACRO_SERIES = ['FEDFUNDS', 'DGS10', 'DGS2', 'MORTGAGE30US', 'CPIAUCSL', 'UNRATE']
+    fred_store = get_fred_store(FRED_KEY)
+    fred_store.update(MACRO_SERIES)
+
+    macro_df = fred_store.wide(MACRO_SERIES).to_pandas().set_index('date')
+    macro_df.tail()
+    return fred_store, macro_df
 
 
 @app.cell
@@ -152,8 +169,8 @@ def _(mo):
 
 
 @app.cell
-def _(pd):
-    from src.life_agents.core.utils import get_sec_financial_concept
+def _():
+    from src.life_agents.core.utils import get_sec_financial_concepts
 
     # Hyperscaler tickers
     HYPERSCALERS = {
@@ -163,82 +180,68 @@ def _(pd):
         'META': 'Meta (Facebook)'
     }
 
-    # Fetch capex data for all hyperscalers
+    # Fetch capex data for all hyperscalers in one batch: each company's facts
+    # are downloaded once, concurrently, under the shared SEC rate limit
     # Using PaymentsToAcquirePropertyPlantAndEquipment - the standard cash flow capex line item
-    capex_data = {}
-
-    for ticker, name in HYPERSCALERS.items():
-        try:
-            df = get_sec_financial_concept(
-                ticker=ticker,
-                concept='PaymentsToAcquirePropertyPlantAndEquipment',
-                taxonomy='us-gaap',
-                units='USD'
-            )
-
-            # Filter to just annual reports (10-K) for cleaner trend
-            annual = df[df['form'] == '10-K'].copy()
-            annual['company'] = name
-            annual['ticker'] = ticker
-
-            capex_data[ticker] = annual
-
-            print(f"✓ Fetched {len(annual)} annual capex records for {name}")
+    capex_facts = get_sec_financial_concepts(
+        HYPERSCALERS.keys(),
+        ['PaymentsToAcquirePropertyPlantAndEquipment'],
+        taxonomy='us-gaap',
+        units='USD'
+    )
 
-        except Exception as e:
-            print(f"✗ Error fetching {ticker}: {e}")
+    # Filter to just annual reports (10-K) for cleaner trend
+    combined_capex = capex_facts[capex_facts['form'] == '10-K'].copy()
+    combined_capex['company'] = combined_capex['ticker'].map(HYPERSCALERS)
 
-    # Combine all data
-    if capex_data:
-        combined_capex = pd.concat(capex_data.values(), ignore_index=True)
+    for ticker, name in HYPERSCALERS.items():
+        n_annual = int((combined_capex['ticker'] == ticker).sum())
+        if n_annual:
+            print(f"✓ Fetched {n_annual} annual capex records for {name}")
+        else:
+            print(f"✗ No annual capex records for {name}")
 
-        # Convert to billions for readability
-        combined_capex['capex_billions'] = combined_capex['val'] / 1_000_000_000
+    # Convert to billions for readability
+    combined_capex['capex_billions'] = combined_capex['val'] / 1_000_000_000
 
-        # Sort by filing date
-        combined_capex = combined_capex.sort_values(['ticker', 'end'])
-    return combined_capex, get_sec_financial_concept, ticker
+    # Sort by filing date
+    combined_capex = combined_capex.sort_values(['ticker', 'end'])
+    return HYPERSCALERS, capex_facts, combined_capex
 
 
 @app.cell
-def _(get_sec_financial_concept, ticker):
-    msft = get_sec_financial_concept(
-                ticker=ticker,
-                concept='PaymentsToAcquirePropertyPlantAndEquipment',
-                taxonomy='us-gaap',
-                units='USD'
-            )
-    msft
-    return (msft,)
+def _(HYPERSCALERS, capex_facts):
+    from src.life_agents.core.fiscal_calendar import calendar_quarter, quarter_label
+    from src.life_agents.core.quarters import derive_quarters
 
+    # Capex is reported year-to-date in 10-Qs and Q4 only inside the 10-K total;
+    # de-accumulate every company's filings into discrete quarters at once
+    quarterly_capex = derive_quarters(capex_facts)
+    quarterly_capex['company'] = quarterly_capex['ticker'].map(HYPERSCALERS)
+    quarterly_capex['capex_billions'] = quarterly_capex['val'] / 1_000_000_000
 
-@app.cell
-def _(msft):
-    clean_quarterly_msft = msft[
-        msft.form.eq('10-Q')
-    ].sort_values('filed').groupby('end').last().reset_index()
-    clean_quarterly_msft['capex_billions'] = clean_quarterly_msft['val'] / 1_000_000_000
-    clean_quarterly_msft['fiscal_year'] = clean_quarterly_msft['end'].dt.year
-    clean_quarterly_msft['quarter_capex'] = clean_quarterly_msft.groupby('fiscal_year')['val'].diff().fillna(clean_quarterly_msft['val'])
-    clean_quarterly_msft['quarter_capex_billions'] = clean_quarterly_msft['quarter_capex'] / 1_000_000_000
-    clean_quarterly_msft
-    return (clean_quarterly_msft,)
+    # MSFT's fiscal year ends in June: align everyone on calendar quarters
+    quarterly_capex['cal_quarter'] = calendar_quarter(quarterly_capex['end'])
+    quarterly_capex['quarter'] = quarterly_capex['cal_quarter'].map(quarter_label)
+    quarterly_capex
+    return (quarterly_capex,)
 
 
 @app.cell
-def _(clean_quarterly_msft):
+def _(quarterly_capex):
     import plotly.express as px
 
+    msft_quarters = quarterly_capex[quarterly_capex['ticker'] == 'MSFT']
     fig = px.bar(
-        clean_quarterly_msft,
+        msft_quarters,
         x='end',
-        y='val',
-        title='Microsoft Quarterly Capex (10-Q Filings)',
+        y='capex_billions',
+        color='derived',
+        title='Microsoft Quarterly Capex (Q4 and YTD-only quarters derived)',
         labels={'end': 'Quarter End Date', 'capex_billions': 'Capex ($ Billions)'},
         text='capex_billions'
     )
 
-
     fig.update_traces(texttemplate='%{text:.2f}B', textposition='outside')
     fig.update_layout(height=500)
     fig
@@ -246,20 +249,17 @@ def _(clean_quarterly_msft):
 
 
 @app.cell
-def _(clean_quarterly_msft, px):
-
-
-
+def _(px, quarterly_capex):
     fig2 = px.bar(
-        clean_quarterly_msft[clean_quarterly_msft['end'] >= '2020-01-01'],
-        x='end',
-        y='quarter_capex_billions',
-        title='Microsoft Quarterly Capex - Individual Quarters (Non-Cumulative)',
-        labels={'end': 'Quarter End Date', 'quarter_capex_billions': 'Capex ($ Billions)'},
-        text='quarter_capex_billions'
+        quarterly_capex[quarterly_capex['end'] >= '2020-01-01'].sort_values('cal_quarter'),
+        x='quarter',
+        y='capex_billions',
+        color='company',
+        barmode='group',
+        title='Hyperscaler Quarterly Capex - Individual Quarters (Non-Cumulative)',
+        labels={'quarter': 'Calendar Quarter', 'capex_billions': 'Capex ($ Billions)'},
     )
 
-    fig2.update_traces(texttemplate='%{text:.1f}B', textposition='outside')
     fig2.update_layout(height=500)
     fig2
     return
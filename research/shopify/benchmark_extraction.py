@@ -0,0 +1,116 @@
+"""
+Benchmark: pandas vs. vectorized (polars) extract_shopify_metrics
+=================================================================
+
+Times both extraction paths end-to-end from the raw companyfacts bytes of the
+largest payloads (AMZN, MSFT by default), checks that they agree, and reports
+the speedup. Target: >= 10x.
+
+- legacy:     json.loads + per-fact pandas path, one metric at a time
+- vectorized: msgspec index + one polars NDJSON decode and query for all metrics
+
+Two workloads are measured: the standard metric bundle
+(get_all_shopify_metrics) and every USD us-gaap concept as its own metric.
+Quarter derivation (derive_quarters) is left out on both sides: it did not
+exist on the original pandas path, and timing it there would charge the
+legacy side for a polars step it never ran.
+
+Usage:
+    uv run python research/shopify/benchmark_extraction.py
+    uv run python research/shopify/benchmark_extraction.py AMZN MSFT SHOP
+    uv run python research/shopify/benchmark_extraction.py --file CIK0001018724.json
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import typer
+from typing_extensions import Annotated
+
+import shopify_edgar_helper as helper
+from shopify_edgar_helper import extract_shopify_metrics
+
+app = typer.Typer()
+
+BUNDLE_TAGS = {
+    "revenue": helper.SHOPIFY_TOTAL_REVENUE_TAGS,
+    "net_income": helper.SHOPIFY_NET_INCOME_TAGS,
+    "gross_profit": helper.SHOPIFY_GROSS_PROFIT_TAGS,
+    "operating_income": helper.SHOPIFY_OPERATING_INCOME_TAGS,
+    "operating_cf": helper.SHOPIFY_OPERATING_CF_TAGS,
+}
+
+
+def _time(func: Callable, repeat: int) -> float:
+    """Best wall-clock time of ``repeat`` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _load(tickers: List[str], files: Optional[List[Path]]) -> dict:
+    if files:
+        return {path.stem: path.read_bytes() for path in files}
+
+    from src.life_agents.core.utils import fetch_sec_bytes, get_cik_from_ticker
+
+    return {
+        ticker: fetch_sec_bytes(
+            f"https://data.sec.gov/api/xbrl/companyfacts/CIK{get_cik_from_ticker(ticker)}.json"
+        )
+        for ticker in tickers
+    }
+
+
+def _same(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    """Both paths keep the same value for every period end."""
+    if a.empty or b.empty:
+        return a.empty and b.empty
+    key = ["end", "val", "xbrl_tag"]
+    a = a[key].sort_values("end").reset_index(drop=True)
+    b = b[key].sort_values("end").reset_index(drop=True)
+    return (
+        (a["end"].to_numpy("datetime64[ns]") == b["end"].to_numpy("datetime64[ns]")).all()
+        and (a["val"].to_numpy(float) == b["val"].to_numpy(float)).all()
+    )
+
+
+def _run(payload: bytes, metrics: Dict[str, List[str]], vectorized: bool) -> Dict[str, pd.DataFrame]:
+    """Extract every metric from the raw payload, parse time included."""
+    return extract_shopify_metrics(payload, metrics, quarterly=True, vectorized=vectorized, derive=False)
+
+
+@app.command()
+def main(
+    tickers: Annotated[Optional[List[str]], typer.Argument()] = None,
+    file: Annotated[Optional[List[Path]], typer.Option(help="Local companyfacts JSON file(s)")] = None,
+    repeat: int = 3,
+):
+    """Compare both extraction paths on full companyfacts payloads."""
+    payloads = _load(tickers or ["AMZN", "MSFT"], file)
+
+    print(f"{'company':<16}{'workload':<12}{'metrics':>8}{'pandas s':>11}{'polars s':>11}{'speedup':>9}  match")
+    print("-" * 76)
+    for name, payload in payloads.items():
+        us_gaap = json.loads(payload).get("facts", {}).get("us-gaap", {})
+        concepts = {tag: [tag] for tag, data in us_gaap.items() if data.get("units", {}).get("USD")}
+
+        for workload, metrics in (("bundle", BUNDLE_TAGS), ("concepts", concepts)):
+            legacy_s = _time(lambda: _run(payload, metrics, False), repeat)
+            fast_s = _time(lambda: _run(payload, metrics, True), repeat)
+            legacy, fast = _run(payload, metrics, False), _run(payload, metrics, True)
+            match = all(_same(legacy[name], fast[name]) for name in metrics)
+            print(
+                f"{name:<16}{workload:<12}{len(metrics):>8}{legacy_s:>11.3f}{fast_s:>11.3f}"
+                f"{legacy_s / fast_s:>8.1f}x  {'yes' if match else 'NO'}"
+            )
+
+
+if __name__ == "__main__":
+    app()
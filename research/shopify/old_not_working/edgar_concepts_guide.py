@@ -35,11 +35,25 @@ Usage:
 """
 
 import os
+import sys
 import time
+from pathlib import Path
 import requests
 import pandas as pd
 from typing import Optional, Dict, List, Any
-from dataclasses import dataclass
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+# The concept registry lives in life_agents so other code can resolve it too
+from src.life_agents.core.concepts import (
+    ALL_CONCEPTS,
+    BALANCE_SHEET_CONCEPTS,
+    CASH_FLOW_CONCEPTS,
+    INCOME_STATEMENT_CONCEPTS,
+    ConceptMapping,
+)
+from src.life_agents.core.tables import append_metrics, combine_metrics
+from src.life_agents.core.tickers import get_ticker_index
 
 
 # =============================================================================
@@ -53,428 +67,6 @@ SEC_BASE_URL = "https://data.sec.gov"
 REQUEST_DELAY = 0.15  # seconds between requests
 
 
-# =============================================================================
-# CONCEPT MAPPINGS: The Rosetta Stone for XBRL
-# =============================================================================
-
-@dataclass
-class ConceptMapping:
-    """Maps a human-readable metric to its possible XBRL tags"""
-    display_name: str           # What you'd call it (e.g., "Revenue")
-    description: str            # What it means
-    primary_tag: str            # Most common XBRL tag
-    alternate_tags: List[str]   # Other tags companies might use
-    statement: str              # Which statement it appears on
-
-
-# -----------------------------------------------------------------------------
-# INCOME STATEMENT CONCEPTS
-# -----------------------------------------------------------------------------
-
-INCOME_STATEMENT_CONCEPTS = {
-    # Revenue / Top Line
-    "revenue": ConceptMapping(
-        display_name="Revenue",
-        description="Total revenue from all sources",
-        primary_tag="Revenues",
-        alternate_tags=[
-            "RevenueFromContractWithCustomerExcludingAssessedTax",
-            "RevenueFromContractWithCustomerIncludingAssessedTax",
-            "SalesRevenueNet",
-            "SalesRevenueGoodsNet",
-            "SalesRevenueServicesNet",
-            "TotalRevenuesAndOtherIncome",
-            "RevenuesNetOfInterestExpense",  # Banks
-        ],
-        statement="income_statement"
-    ),
-
-    # Cost of Revenue
-    "cost_of_revenue": ConceptMapping(
-        display_name="Cost of Revenue",
-        description="Direct costs of producing goods/services sold",
-        primary_tag="CostOfRevenue",
-        alternate_tags=[
-            "CostOfGoodsAndServicesSold",
-            "CostOfGoodsSold",
-            "CostOfServices",
-        ],
-        statement="income_statement"
-    ),
-
-    # Gross Profit
-    "gross_profit": ConceptMapping(
-        display_name="Gross Profit",
-        description="Revenue minus cost of revenue",
-        primary_tag="GrossProfit",
-        alternate_tags=[],
-        statement="income_statement"
-    ),
-
-    # Operating Expenses
-    "operating_expenses": ConceptMapping(
-        display_name="Operating Expenses",
-        description="Total operating expenses (R&D, SG&A, etc.)",
-        primary_tag="OperatingExpenses",
-        alternate_tags=[
-            "CostsAndExpenses",
-            "OperatingCostsAndExpenses",
-        ],
-        statement="income_statement"
-    ),
-
-    "research_and_development": ConceptMapping(
-        display_name="R&D Expense",
-        description="Research and development costs",
-        primary_tag="ResearchAndDevelopmentExpense",
-        alternate_tags=[
-            "ResearchAndDevelopmentExpenseExcludingAcquiredInProcessCost",
-        ],
-        statement="income_statement"
-    ),
-
-    "sga_expense": ConceptMapping(
-        display_name="SG&A Expense",
-        description="Selling, general & administrative expenses",
-        primary_tag="SellingGeneralAndAdministrativeExpense",
-        alternate_tags=[
-            "SellingAndMarketingExpense",
-            "GeneralAndAdministrativeExpense",
-        ],
-        statement="income_statement"
-    ),
-
-    # Operating Income
-    "operating_income": ConceptMapping(
-        display_name="Operating Income",
-        description="Profit from core operations (EBIT proxy)",
-        primary_tag="OperatingIncomeLoss",
-        alternate_tags=[
-            "IncomeLossFromContinuingOperationsBeforeIncomeTaxesExtraordinaryItemsNoncontrollingInterest",
-        ],
-        statement="income_statement"
-    ),
-
-    # Net Income
-    "net_income": ConceptMapping(
-        display_name="Net Income",
-        description="Bottom line profit attributable to shareholders",
-        primary_tag="NetIncomeLoss",
-        alternate_tags=[
-            "NetIncomeLossAvailableToCommonStockholdersBasic",
-            "NetIncomeLossAttributableToParent",
-            "ProfitLoss",
-        ],
-        statement="income_statement"
-    ),
-
-    # EPS
-    "eps_basic": ConceptMapping(
-        display_name="EPS (Basic)",
-        description="Earnings per share - basic",
-        primary_tag="EarningsPerShareBasic",
-        alternate_tags=[],
-        statement="income_statement"
-    ),
-
-    "eps_diluted": ConceptMapping(
-        display_name="EPS (Diluted)",
-        description="Earnings per share - diluted",
-        primary_tag="EarningsPerShareDiluted",
-        alternate_tags=[],
-        statement="income_statement"
-    ),
-
-    # Shares Outstanding
-    "shares_outstanding": ConceptMapping(
-        display_name="Shares Outstanding",
-        description="Weighted average shares outstanding",
-        primary_tag="WeightedAverageNumberOfSharesOutstandingBasic",
-        alternate_tags=[
-            "CommonStockSharesOutstanding",
-            "WeightedAverageNumberOfDilutedSharesOutstanding",
-        ],
-        statement="income_statement"
-    ),
-}
-
-
-# -----------------------------------------------------------------------------
-# BALANCE SHEET CONCEPTS
-# -----------------------------------------------------------------------------
-
-BALANCE_SHEET_CONCEPTS = {
-    # Assets
-    "total_assets": ConceptMapping(
-        display_name="Total Assets",
-        description="Sum of all assets",
-        primary_tag="Assets",
-        alternate_tags=[],
-        statement="balance_sheet"
-    ),
-
-    "current_assets": ConceptMapping(
-        display_name="Current Assets",
-        description="Assets expected to convert to cash within 1 year",
-        primary_tag="AssetsCurrent",
-        alternate_tags=[],
-        statement="balance_sheet"
-    ),
-
-    "cash": ConceptMapping(
-        display_name="Cash & Equivalents",
-        description="Cash and cash equivalents",
-        primary_tag="CashAndCashEquivalentsAtCarryingValue",
-        alternate_tags=[
-            "Cash",
-            "CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalents",
-        ],
-        statement="balance_sheet"
-    ),
-
-    "short_term_investments": ConceptMapping(
-        display_name="Short-Term Investments",
-        description="Marketable securities and short-term investments",
-        primary_tag="ShortTermInvestments",
-        alternate_tags=[
-            "MarketableSecuritiesCurrent",
-            "AvailableForSaleSecuritiesDebtSecuritiesCurrent",
-        ],
-        statement="balance_sheet"
-    ),
-
-    "accounts_receivable": ConceptMapping(
-        display_name="Accounts Receivable",
-        description="Money owed by customers",
-        primary_tag="AccountsReceivableNetCurrent",
-        alternate_tags=[
-            "AccountsReceivableNet",
-            "ReceivablesNetCurrent",
-        ],
-        statement="balance_sheet"
-    ),
-
-    "inventory": ConceptMapping(
-        display_name="Inventory",
-        description="Goods held for sale",
-        primary_tag="InventoryNet",
-        alternate_tags=[
-            "Inventory",
-            "InventoryFinishedGoods",
-        ],
-        statement="balance_sheet"
-    ),
-
-    "property_plant_equipment": ConceptMapping(
-        display_name="PP&E (Net)",
-        description="Property, plant & equipment net of depreciation",
-        primary_tag="PropertyPlantAndEquipmentNet",
-        alternate_tags=[],
-        statement="balance_sheet"
-    ),
-
-    "goodwill": ConceptMapping(
-        display_name="Goodwill",
-        description="Premium paid in acquisitions over fair value",
-        primary_tag="Goodwill",
-        alternate_tags=[],
-        statement="balance_sheet"
-    ),
-
-    "intangible_assets": ConceptMapping(
-        display_name="Intangible Assets",
-        description="Non-physical assets (patents, trademarks, etc.)",
-        primary_tag="IntangibleAssetsNetExcludingGoodwill",
-        alternate_tags=[
-            "FiniteLivedIntangibleAssetsNet",
-        ],
-        statement="balance_sheet"
-    ),
-
-    # Liabilities
-    "total_liabilities": ConceptMapping(
-        display_name="Total Liabilities",
-        description="Sum of all liabilities",
-        primary_tag="Liabilities",
-        alternate_tags=[],
-        statement="balance_sheet"
-    ),
-
-    "current_liabilities": ConceptMapping(
-        display_name="Current Liabilities",
-        description="Obligations due within 1 year",
-        primary_tag="LiabilitiesCurrent",
-        alternate_tags=[],
-        statement="balance_sheet"
-    ),
-
-    "accounts_payable": ConceptMapping(
-        display_name="Accounts Payable",
-        description="Money owed to suppliers",
-        primary_tag="AccountsPayableCurrent",
-        alternate_tags=[
-            "AccountsPayableAndAccruedLiabilitiesCurrent",
-        ],
-        statement="balance_sheet"
-    ),
-
-    "long_term_debt": ConceptMapping(
-        display_name="Long-Term Debt",
-        description="Debt obligations due after 1 year",
-        primary_tag="LongTermDebtNoncurrent",
-        alternate_tags=[
-            "LongTermDebt",
-            "LongTermDebtAndCapitalLeaseObligations",
-        ],
-        statement="balance_sheet"
-    ),
-
-    "total_debt": ConceptMapping(
-        display_name="Total Debt",
-        description="All debt (short + long term)",
-        primary_tag="DebtLongtermAndShorttermCombinedAmount",
-        alternate_tags=[
-            "LongTermDebtAndCapitalLeaseObligations",
-        ],
-        statement="balance_sheet"
-    ),
-
-    # Equity
-    "total_equity": ConceptMapping(
-        display_name="Total Equity",
-        description="Shareholders' equity (book value)",
-        primary_tag="StockholdersEquity",
-        alternate_tags=[
-            "StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest",
-            "Equity",
-        ],
-        statement="balance_sheet"
-    ),
-
-    "retained_earnings": ConceptMapping(
-        display_name="Retained Earnings",
-        description="Accumulated profits not paid as dividends",
-        primary_tag="RetainedEarningsAccumulatedDeficit",
-        alternate_tags=[],
-        statement="balance_sheet"
-    ),
-}
-
-
-# -----------------------------------------------------------------------------
-# CASH FLOW STATEMENT CONCEPTS
-# -----------------------------------------------------------------------------
-
-CASH_FLOW_CONCEPTS = {
-    # Operating Activities
-    "operating_cash_flow": ConceptMapping(
-        display_name="Operating Cash Flow",
-        description="Cash generated from core business operations",
-        primary_tag="NetCashProvidedByUsedInOperatingActivities",
-        alternate_tags=[],
-        statement="cash_flow"
-    ),
-
-    "depreciation_amortization": ConceptMapping(
-        display_name="D&A",
-        description="Depreciation and amortization (non-cash)",
-        primary_tag="DepreciationDepletionAndAmortization",
-        alternate_tags=[
-            "DepreciationAndAmortization",
-            "Depreciation",
-        ],
-        statement="cash_flow"
-    ),
-
-    "stock_based_compensation": ConceptMapping(
-        display_name="Stock-Based Comp",
-        description="Non-cash compensation expense",
-        primary_tag="ShareBasedCompensation",
-        alternate_tags=[
-            "StockIssuedDuringPeriodValueShareBasedCompensation",
-            "AllocatedShareBasedCompensationExpense",
-        ],
-        statement="cash_flow"
-    ),
-
-    # Investing Activities
-    "investing_cash_flow": ConceptMapping(
-        display_name="Investing Cash Flow",
-        description="Cash used for investments (CapEx, acquisitions)",
-        primary_tag="NetCashProvidedByUsedInInvestingActivities",
-        alternate_tags=[],
-        statement="cash_flow"
-    ),
-
-    "capex": ConceptMapping(
-        display_name="Capital Expenditures",
-        description="Cash spent on property, plant & equipment",
-        primary_tag="PaymentsToAcquirePropertyPlantAndEquipment",
-        alternate_tags=[
-            "CapitalExpendituresIncurredButNotYetPaid",
-        ],
-        statement="cash_flow"
-    ),
-
-    "acquisitions": ConceptMapping(
-        display_name="Acquisitions",
-        description="Cash spent acquiring businesses",
-        primary_tag="PaymentsToAcquireBusinessesNetOfCashAcquired",
-        alternate_tags=[
-            "PaymentsToAcquireBusinessesGross",
-        ],
-        statement="cash_flow"
-    ),
-
-    # Financing Activities
-    "financing_cash_flow": ConceptMapping(
-        display_name="Financing Cash Flow",
-        description="Cash from/to shareholders and creditors",
-        primary_tag="NetCashProvidedByUsedInFinancingActivities",
-        alternate_tags=[],
-        statement="cash_flow"
-    ),
-
-    "dividends_paid": ConceptMapping(
-        display_name="Dividends Paid",
-        description="Cash dividends paid to shareholders",
-        primary_tag="PaymentsOfDividendsCommonStock",
-        alternate_tags=[
-            "PaymentsOfDividends",
-            "DividendsCash",
-        ],
-        statement="cash_flow"
-    ),
-
-    "share_repurchases": ConceptMapping(
-        display_name="Share Repurchases",
-        description="Cash spent buying back stock",
-        primary_tag="PaymentsForRepurchaseOfCommonStock",
-        alternate_tags=[
-            "PaymentsForRepurchaseOfEquity",
-        ],
-        statement="cash_flow"
-    ),
-
-    # Free Cash Flow (derived, not a direct XBRL tag)
-    "free_cash_flow": ConceptMapping(
-        display_name="Free Cash Flow",
-        description="Operating cash flow minus CapEx (calculated)",
-        primary_tag="",  # Not a direct tag - must calculate
-        alternate_tags=[],
-        statement="cash_flow"
-    ),
-}
-
-
-# Combine all concepts for easy lookup
-ALL_CONCEPTS = {
-    **INCOME_STATEMENT_CONCEPTS,
-    **BALANCE_SHEET_CONCEPTS,
-    **CASH_FLOW_CONCEPTS,
-}
-
-
 # =============================================================================
 # API FUNCTIONS
 # =============================================================================
@@ -895,20 +487,9 @@ def get_company_cik(ticker: str) -> Optional[str]:
     Returns:
         10-digit CIK string or None if not found
     """
-    url = f"{SEC_BASE_URL}/submissions/CIK-lookup.json"
-    # Actually we need to use the company tickers file
-    url = "https://www.sec.gov/files/company_tickers.json"
-
-    data = _make_request(url)
-    if not data:
-        return None
-
-    ticker_upper = ticker.upper()
-    for entry in data.values():
-        if entry.get("ticker") == ticker_upper:
-            return str(entry.get("cik_str")).zfill(10)
-
-    return None
+    # Process-wide index seeded with COMMON_CIKS; company_tickers.json is
+    # only loaded on a miss
+    return get_ticker_index().cik(ticker)
 
 
 def fetch_company_concept(
@@ -1093,9 +674,14 @@ def fetch_key_financials(
     return results
 
 
+# Row key of the financials table -> source column in each concept frame
+FINANCIALS_TABLE_KEYS = {"period_end": "end", "fiscal_year": "fy", "fiscal_period": "fp"}
+
+
 def create_financials_table(
     financials: Dict[str, pd.DataFrame],
-    value_col: str = "val"
+    value_col: str = "val",
+    existing: Optional[pd.DataFrame] = None,
 ) -> pd.DataFrame:
     """
     Pivot the fetched financials into a clean table.
@@ -1103,73 +689,32 @@ def create_financials_table(
     Args:
         financials: Output from fetch_key_financials
         value_col: Column containing the values
+        existing: Table from a previous call; when given, only the periods in
+            ``financials`` are merged into it instead of rebuilding the table
 
     Returns:
         DataFrame with periods as rows and metrics as columns
     """
     if not financials:
-        return pd.DataFrame()
-
-    # Collect all periods and values
-    all_data = []
+        return existing if existing is not None else pd.DataFrame()
 
+    # Label columns with display names
+    named = {}
     for concept_key, df in financials.items():
-        if df.empty:
-            continue
-
         concept = ALL_CONCEPTS.get(concept_key)
-        display_name = concept.display_name if concept else concept_key
-
-        for _, row in df.iterrows():
-            all_data.append({
-                "period_end": row.get("end"),
-                "fiscal_year": row.get("fy"),
-                "fiscal_period": row.get("fp"),
-                "metric": display_name,
-                "value": row.get(value_col)
-            })
-
-    if not all_data:
-        return pd.DataFrame()
+        named[concept.display_name if concept else concept_key] = df
 
-    combined = pd.DataFrame(all_data)
-
-    # Pivot to wide format
-    wide = combined.pivot_table(
-        index=["period_end", "fiscal_year", "fiscal_period"],
-        columns="metric",
-        values="value",
-        aggfunc="first"
-    ).reset_index()
-
-    wide = wide.sort_values("period_end", ascending=False)
-
-    return wide
+    if existing is not None:
+        return append_metrics(existing, named, keys=FINANCIALS_TABLE_KEYS, value_col=value_col)
+    return combine_metrics(named, keys=FINANCIALS_TABLE_KEYS, value_col=value_col)
 
 
 # =============================================================================
 # CONVENIENCE FUNCTIONS FOR COMMON COMPANIES
 # =============================================================================
 
-# Common CIKs for quick access
-COMMON_CIKS = {
-    "SHOP": "0001594805",  # Shopify
-    "AAPL": "0000320193",  # Apple
-    "MSFT": "0000789019",  # Microsoft
-    "GOOGL": "0001652044", # Alphabet
-    "AMZN": "0001018724",  # Amazon
-    "META": "0001326801",  # Meta
-    "NVDA": "0001045810",  # NVIDIA
-    "TSLA": "0001318605",  # Tesla
-}
-
-
 def get_cik(ticker: str) -> str:
-    """Get CIK for a ticker (uses cache for common tickers)"""
-    ticker_upper = ticker.upper()
-    if ticker_upper in COMMON_CIKS:
-        return COMMON_CIKS[ticker_upper]
-
+    """Get CIK for a ticker (common tickers are answered from COMMON_CIKS without a download)"""
     cik = get_company_cik(ticker)
     if cik:
         return cik
@@ -1187,7 +732,7 @@ if __name__ == "__main__":
     print("SEC EDGAR Concept Fetcher - Example")
     print("="*60)
 
-    shopify_cik = COMMON_CIKS["SHOP"]
+    shopify_cik = get_cik("SHOP")
 
     print(f"\nFetching Shopify (CIK: {shopify_cik}) quarterly financials...")
     print("-"*60)
@@ -3,11 +3,17 @@ Find All Shopify SEC Filing URLs
 =================================
 
 Queries SEC submissions API to get all 10-K, 10-Q, and 40-F filing URLs.
+The filing index is kept up to date incrementally by ``life sec sync``.
 """
 
-import requests
-import time
 import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from src.life_agents.core.sec_sync import SecSync
+
+SHOP_CIK = "0001594805"
 
 
 def get_shopify_filings(forms=['10-K', '10-Q', '40-F'], limit=None):
@@ -21,41 +27,26 @@ def get_shopify_filings(forms=['10-K', '10-Q', '40-F'], limit=None):
     Returns:
         List of dicts with filing metadata
     """
-    headers = {'User-Agent': 'Research bryan@example.com'}
-    url = 'https://data.sec.gov/submissions/CIK0001594805.json'
-
-    time.sleep(0.15)
-    response = requests.get(url, headers=headers, timeout=30)
-    response.raise_for_status()
-    data = response.json()
-
-    filings_data = data['filings']['recent']
+    # Revalidate the submissions feed (a 304 if nothing new) and read the stored index
+    sync = SecSync()
+    sync.update_filings(SHOP_CIK)
+    filings_data = sync.load_filings(SHOP_CIK, forms=forms).to_dicts()
     results = []
 
-    for i in range(len(filings_data['form'])):
-        form = filings_data['form'][i]
-
-        if form not in forms:
-            continue
-
-        accession = filings_data['accessionNumber'][i]
-        filing_date = filings_data['filingDate'][i]
-        report_date = filings_data['reportDate'][i]
-        primary_doc = filings_data['primaryDocument'][i]
-
-        # Build EDGAR URL
-        accession_clean = accession.replace('-', '')
+    for filing in filings_data:
+        form = filing['form']
+        accession = filing['accession']
+        filing_date = str(filing['filing_date'])
+        report_date = str(filing['report_date'])
+        primary_doc = filing['primary_document']
+        filing_url = filing['url']
 
         # For 40-F, check if it's the main filing or exhibit
         if form == '40-F':
             # 40-F exhibits typically have "exhibit" in the filename
-            if 'exhibit' in primary_doc.lower() and 'mda' in primary_doc.lower():
-                filing_url = f'https://www.sec.gov/Archives/edgar/data/1594805/{accession_clean}/{primary_doc}'
-            else:
+            if not ('exhibit' in primary_doc.lower() and 'mda' in primary_doc.lower()):
                 # Skip the main 40-F filing, we want the MD&A exhibit
                 continue
-        else:
-            filing_url = f'https://www.sec.gov/Archives/edgar/data/1594805/{accession_clean}/{primary_doc}'
 
         results.append({
             'form': form,
@@ -20,46 +20,65 @@ def _():
 
 
 @app.cell
-def _(datetime, mo):
+def _(TICKER, datetime, mo, ticker_picker):
     # Cell 2: Dashboard Header
-    mo.md(f"""
-    # 📊 Shopify (SHOP) Financial Analysis Dashboard
+    mo.vstack([
+        ticker_picker,
+        mo.md(f"""
+    # 📊 {TICKER} Financial Analysis Dashboard
 
     **Last Updated:** {datetime.now().strftime('%Y-%m-%d %H:%M PST')}
 
     Comprehensive financial analysis leveraging Financial Modeling Prep API data.
 
     ---
-    """)
+    """),
+    ])
     return
 
 
 @app.cell
-def _():
+def _(mo):
     # Cell 3: Configuration and API Key Loading
+    from src.life_agents.core.fmp import FMP_BASE_URL
     from src.life_agents.core.utils import load_env_vars
 
     ENV_VARS = load_env_vars()
     FMP_API_KEY = ENV_VARS.get('FMP_API_KEY')
-    TICKER = "SHOP"
-    BASE_URL = "https://financialmodelingprep.com/stable"
+    BASE_URL = FMP_BASE_URL
+
+    # Tickers offered in the dropdown; neighbours of the selection are prefetched
+    TICKERS = ['SHOP', 'AMZN', 'MSFT', 'GOOGL', 'META', 'AAPL', 'NVDA', 'TSLA', 'MELI', 'SE']
+    ticker_picker = mo.ui.dropdown(options=TICKERS, value='SHOP', label='Ticker')
 
     if not FMP_API_KEY:
         print("⚠️ Warning: FMP_API_KEY not found in environment variables")
     else:
         print("✓ FMP API Key loaded successfully")
-    return BASE_URL, FMP_API_KEY
+    return BASE_URL, FMP_API_KEY, TICKERS, ticker_picker
 
 
 @app.cell
-def _(BASE_URL, FMP_API_KEY, datetime, mo, pd, requests):
+def _(ticker_picker):
+    # Cell 3b: Selected Ticker
+    TICKER = ticker_picker.value
+    return (TICKER,)
+
+
+@app.cell
+def _(BASE_URL, FMP_API_KEY, mo):
     # Cell 4: Helper Functions
+    from src.life_agents.core import fmp
+    from src.life_agents.core.features import get_feature_store
+    from src.life_agents.core.fiscal_calendar import calendar_quarter
 
-    @mo.cache
     def fetch_fmp_data(ticker, endpoint, params=None):
         """
         Generic FMP API fetcher with error handling
 
+        Responses come from the on-disk FMP cache shared by every kernel and
+        process, refreshed in the background once stale
+
         Args:
             ticker: Stock ticker symbol (e.g., 'SHOP')
             endpoint: API endpoint (e.g., 'income-statement')
@@ -68,63 +87,79 @@ def _(BASE_URL, FMP_API_KEY, datetime, mo, pd, requests):
         Returns:
             DataFrame with API data or empty DataFrame on error
         """
-        url = f"{BASE_URL}/{endpoint}"
-        default_params = {"apikey": FMP_API_KEY, "symbol": ticker.upper()}
-        if params:
-            default_params.update(params)
-
-        try:
-            response = requests.get(url, params=default_params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+        return fmp.fetch_fmp_data(ticker, endpoint, params, api_key=FMP_API_KEY, base_url=BASE_URL)
 
-            # Check for API error messages
-            if isinstance(data, dict) and 'Error Message' in data:
-                print(f"FMP API Error: {data['Error Message']}")
-                return pd.DataFrame()
 
-            if not data:
-                return pd.DataFrame()
+    # Per-ticker FMP bundles shared by every chart; kept across ticker
+    # switches and cell reruns, and prefetched in the background
+    company_bundles = fmp.get_company_bundles(FMP_API_KEY, BASE_URL)
 
-            # Convert to DataFrame
-            df = pd.DataFrame(data)
 
-            # Parse date columns
-            if 'date' in df.columns:
-                df['date'] = pd.to_datetime(df['date'])
-
-            # Create quarter column if available
-            if 'calendarYear' in df.columns and 'period' in df.columns:
-                df['quarter'] = df['calendarYear'].astype(str) + '-' + df['period']
+    # Dashboard column -> feature store metric
+    GROWTH_METRICS = {
+        'revenue': 'revenue',
+        'grossProfit': 'gross_profit',
+        'operatingIncome': 'operating_income',
+        'netIncome': 'net_income',
+        'operatingCashFlow': 'operating_cash_flow',
+        'freeCashFlow': 'free_cash_flow',
+    }
+    MARGIN_COLUMNS = {
+        'gross_profit': 'gross_margin_pct',
+        'operating_income': 'operating_margin_pct',
+        'net_income': 'net_margin_pct',
+        'free_cash_flow': 'fcf_margin_pct',
+    }
 
-            return df
 
-        except requests.exceptions.Timeout:
-            print(f"Request timed out for {endpoint}")
-            return pd.DataFrame()
-        except requests.exceptions.HTTPError as e:
-            print(f"HTTP error for {endpoint}: {e}")
-            return pd.DataFrame()
-        except Exception as e:
-            print(f"Unexpected error fetching {endpoint}: {e}")
-            return pd.DataFrame()
+    @mo.cache
+    def load_growth_features(ticker):
+        """
+        Precomputed QoQ/YoY growth and margins from the SEC feature store
 
+        Args:
+            ticker: Stock ticker symbol (synced with `life sec sync`)
 
-    def calculate_growth_metrics(df):
+        Returns:
+            DataFrame keyed by 'cal_quarter' with dashboard column names
+            (empty if the ticker has no stored features)
         """
-        Add QoQ and YoY growth calculations
+        wide = get_feature_store().wide(
+            ticker, list(GROWTH_METRICS.values()), ['qoq_pct', 'yoy_pct', 'margin_pct']
+        ).to_pandas()
+        renames = {}
+        for col, metric in GROWTH_METRICS.items():
+            renames[f'{metric}_qoq_pct'] = f'{col}_qoq'
+            renames[f'{metric}_yoy_pct'] = f'{col}_yoy'
+        for metric, col in MARGIN_COLUMNS.items():
+            renames[f'{metric}_margin_pct'] = col
+        return wide[[c for c in ['cal_quarter', *renames] if c in wide.columns]].rename(columns=renames)
+
+
+    def calculate_growth_metrics(df, ticker):
+        """
+        Add QoQ and YoY growth and margin columns
+
+        Reads the precomputed SEC feature store when it has the ticker;
+        otherwise computes them from df.
 
         Args:
             df: DataFrame with financial data sorted by date
+            ticker: Company whose precomputed features to use
 
         Returns:
             DataFrame with additional growth columns
         """
         df = df.sort_values('date').copy()
 
+        features = load_growth_features(ticker)
+        if not features.empty:
+            if 'cal_quarter' not in df.columns:
+                df['cal_quarter'] = calendar_quarter(df['date'])
+            return df.merge(features, on='cal_quarter', how='left')
+
         # Define columns to calculate growth for
-        numeric_cols = ['revenue', 'grossProfit', 'operatingIncome', 'netIncome',
-                       'operatingCashFlow', 'freeCashFlow']
+        numeric_cols = list(GROWTH_METRICS)
 
         for col in numeric_cols:
             if col in df.columns:
@@ -148,49 +183,20 @@ def _(BASE_URL, FMP_API_KEY, datetime, mo, pd, requests):
         return df
 
 
-    def quarter_to_date(q_str):
-        """
-        Convert quarter string to quarter-end date
-
-        Args:
-            q_str: Quarter string like '2025-Q3'
-
-        Returns:
-            datetime object for end of quarter
-        """
-        try:
-            year, quarter = q_str.split('-Q')
-            year = int(year)
-            quarter = int(quarter)
-            month = quarter * 3
-
-            # Get last day of quarter month
-            if month == 3:
-                return datetime(year, 3, 31)
-            elif month == 6:
-                return datetime(year, 6, 30)
-            elif month == 9:
-                return datetime(year, 9, 30)
-            else:  # month == 12
-                return datetime(year, 12, 31)
-        except Exception as e:
-            print(f"Error parsing quarter {q_str}: {e}")
-            return None
-
-
     def merge_with_gmv_mrr(fmp_df, csv_df):
         """
         Merge FMP data with historical GMV/MRR CSV data
 
         Args:
             fmp_df: FMP income statement DataFrame with 'date' column
-            csv_df: CSV DataFrame with GMV/MRR data
+            csv_df: CSV DataFrame with GMV/MRR data keyed by 'cal_quarter'
 
         Returns:
             Merged DataFrame
         """
-        # Merge on date
-        merged = fmp_df.merge(csv_df, on='date', how='left')
+        # Merge on the integer calendar quarter of each period end
+        merged = fmp_df.assign(cal_quarter=calendar_quarter(fmp_df['date']))
+        merged = merged.merge(csv_df, on='cal_quarter', how='left')
 
         # Calculate derived metrics (GMV and MRR are in billions in CSV)
         if 'revenue' in merged.columns:
@@ -226,16 +232,19 @@ def _(BASE_URL, FMP_API_KEY, datetime, mo, pd, requests):
     return (
         apply_theme,
         calculate_growth_metrics,
+        company_bundles,
         fetch_fmp_data,
         merge_with_gmv_mrr,
-        quarter_to_date,
     )
 
 
 @app.cell
-def _(Path, pd, quarter_to_date):
+def _(Path, pd):
     # Cell 5: Load Historical GMV/MRR CSV Data
+    from src.life_agents.core.fiscal_calendar import parse_quarter_label, quarter_label
 
+    # Shopify-only KPIs, merged only when SHOP is selected
+    GMV_MRR_TICKER = 'SHOP'
     csv_path = Path("shopify_gmv_mrr_data.csv")
 
     try:
@@ -246,17 +255,17 @@ def _(Path, pd, quarter_to_date):
             gmv_mrr_raw['time_period'] == gmv_mrr_raw['reporting_quarter']
         ].copy()
 
-        # Parse quarter to datetime
-        gmv_mrr_clean['date'] = gmv_mrr_clean['time_period'].apply(quarter_to_date)
+        # Parse '2025-Q3' labels to integer calendar quarter keys
+        gmv_mrr_clean['cal_quarter'] = parse_quarter_label(gmv_mrr_clean['time_period'])
 
-        # Remove rows with invalid dates
-        gmv_mrr_clean = gmv_mrr_clean[gmv_mrr_clean['date'].notna()]
+        # Remove rows with invalid quarters
+        gmv_mrr_clean = gmv_mrr_clean[gmv_mrr_clean['cal_quarter'].notna()]
 
         # Select relevant columns
-        gmv_mrr_df = gmv_mrr_clean[['date', 'gmv', 'mrr', 'cumulative_gmv']].copy()
+        gmv_mrr_df = gmv_mrr_clean[['cal_quarter', 'gmv', 'mrr', 'cumulative_gmv']].copy()
 
         print(f"✓ Loaded {len(gmv_mrr_df)} quarters of GMV/MRR data")
-        print(f"  Date range: {gmv_mrr_df['date'].min().date()} to {gmv_mrr_df['date'].max().date()}")
+        print(f"  Quarter range: {quarter_label(gmv_mrr_df['cal_quarter'].min())} to {quarter_label(gmv_mrr_df['cal_quarter'].max())}")
 
     except FileNotFoundError:
         print(f"⚠️ Warning: CSV file not found at {csv_path}")
@@ -264,18 +273,31 @@ def _(Path, pd, quarter_to_date):
     except Exception as e:
         print(f"⚠️ Error loading CSV: {e}")
         gmv_mrr_df = pd.DataFrame()
-    return (gmv_mrr_df,)
+    return GMV_MRR_TICKER, gmv_mrr_df
+
+
+@app.cell
+def _(TICKER, TICKERS, company_bundles):
+    # Cell 5b: Fetch All FMP Endpoints for the Selected Ticker
+    # The endpoints are fetched concurrently, once per ticker; switching back
+    # to a ticker reuses its bundle
+
+    fmp_data = company_bundles.get(TICKER)
+
+    # Warm the neighbours in the dropdown while this ticker renders
+    ticker_pos = TICKERS.index(TICKER) if TICKER in TICKERS else 0
+    company_bundles.prefetch([
+        TICKERS[(ticker_pos - 1) % len(TICKERS)],
+        TICKERS[(ticker_pos + 1) % len(TICKERS)],
+    ])
+    return (fmp_data,)
 
 
 @app.cell
-def _(fetch_fmp_data):
+def _(fmp_data):
     # Cell 6: Fetch Income Statement
 
-    income_df = fetch_fmp_data(
-        'SHOP',
-        'income-statement',
-        {'period': 'quarter', 'limit': 20}
-    )
+    income_df = fmp_data['income']
 
     if not income_df.empty:
         print(f"✓ Fetched {len(income_df)} quarters of income statement data")
@@ -285,14 +307,10 @@ def _(fetch_fmp_data):
 
 
 @app.cell
-def _(fetch_fmp_data):
+def _(fmp_data):
     # Cell 7: Fetch Balance Sheet
 
-    balance_df = fetch_fmp_data(
-        'SHOP',
-        'balance-sheet-statement',
-        {'period': 'quarter', 'limit': 20}
-    )
+    balance_df = fmp_data['balance']
 
     if not balance_df.empty:
         print(f"✓ Fetched {len(balance_df)} quarters of balance sheet data")
@@ -302,14 +320,10 @@ def _(fetch_fmp_data):
 
 
 @app.cell
-def _(fetch_fmp_data):
+def _(fmp_data):
     # Cell 8: Fetch Cash Flow Statement
 
-    cashflow_df = fetch_fmp_data(
-        'SHOP',
-        'cash-flow-statement',
-        {'period': 'quarter', 'limit': 20}
-    )
+    cashflow_df = fmp_data['cashflow']
 
     if not cashflow_df.empty:
         print(f"✓ Fetched {len(cashflow_df)} quarters of cash flow data")
@@ -319,14 +333,10 @@ def _(fetch_fmp_data):
 
 
 @app.cell
-def _(fetch_fmp_data):
+def _(fmp_data):
     # Cell 9: Fetch Key Metrics
 
-    metrics_df = fetch_fmp_data(
-        'SHOP',
-        'key-metrics',
-        {'period': 'quarter', 'limit': 20}
-    )
+    metrics_df = fmp_data['metrics']
 
     if not metrics_df.empty:
         print(f"✓ Fetched {len(metrics_df)} quarters of key metrics")
@@ -336,14 +346,10 @@ def _(fetch_fmp_data):
 
 
 @app.cell
-def _(fetch_fmp_data):
+def _(fmp_data):
     # Cell 10: Fetch Financial Ratios
 
-    ratios_df = fetch_fmp_data(
-        'SHOP',
-        'ratios',
-        {'period': 'quarter', 'limit': 20}
-    )
+    ratios_df = fmp_data['ratios']
 
     if not ratios_df.empty:
         print(f"✓ Fetched {len(ratios_df)} quarters of financial ratios")
@@ -353,14 +359,10 @@ def _(fetch_fmp_data):
 
 
 @app.cell
-def _(fetch_fmp_data):
+def _(fmp_data):
     # Cell 11: Fetch Financial Growth
 
-    growth_df = fetch_fmp_data(
-        'SHOP',
-        'financial-growth',
-        {'period': 'quarter', 'limit': 20}
-    )
+    growth_df = fmp_data['growth']
 
     if not growth_df.empty:
         print(f"✓ Fetched {len(growth_df)} quarters of growth metrics")
@@ -370,10 +372,10 @@ def _(fetch_fmp_data):
 
 
 @app.cell
-def _(datetime, fetch_fmp_data, pd, timedelta):
+def _(datetime, fmp_data, pd, timedelta):
     # Cell 12: Fetch Stock Price Data
 
-    price_data = fetch_fmp_data('SHOP', 'historical-price-eod/full')
+    price_data = fmp_data['price']
 
     if not price_data.empty:
         # Data now comes directly as a DataFrame
@@ -402,18 +404,14 @@ def _(datetime, fetch_fmp_data, pd, timedelta):
 
 
 @app.cell
-def _(fetch_fmp_data, pd):
+def _(fmp_data, pd):
     # Cell 13: Fetch Analyst Data
 
     # Analyst estimates
-    estimates_df = fetch_fmp_data(
-        'SHOP',
-        'analyst-estimates',
-        {'period': 'quarter', 'limit': 4}
-    )
+    estimates_df = fmp_data['estimates']
 
     # Price target consensus
-    price_target_data = fetch_fmp_data('SHOP', 'price-target-consensus')
+    price_target_data = fmp_data['price_target']
 
     if not price_target_data.empty:
         price_target_df = price_target_data
@@ -431,6 +429,8 @@ def _(fetch_fmp_data, pd):
 
 @app.cell
 def _(
+    GMV_MRR_TICKER,
+    TICKER,
     balance_df,
     calculate_growth_metrics,
     cashflow_df,
@@ -443,50 +443,29 @@ def _(
     ratios_df,
 ):
     # Cell 14: Merge All Data Sources and Calculate Metrics
+    from src.life_agents.core.tables import join_statements
 
     if income_df.empty:
         print("⚠️ Cannot create unified dataset: income statement is empty")
         unified_df = pd.DataFrame()
     else:
-        # Start with income statement
-        unified_df = income_df.copy()
-
-        # Merge balance sheet
-        if not balance_df.empty:
-            balance_cols = ['date'] + [col for col in balance_df.columns
-                                      if col not in unified_df.columns and col != 'date']
-            unified_df = unified_df.merge(balance_df[balance_cols], on='date', how='left')
-
-        # Merge cash flow
-        if not cashflow_df.empty:
-            cashflow_cols = ['date'] + [col for col in cashflow_df.columns
-                                        if col not in unified_df.columns and col != 'date']
-            unified_df = unified_df.merge(cashflow_df[cashflow_cols], on='date', how='left')
-
-        # Merge key metrics
-        if not metrics_df.empty:
-            metrics_cols = ['date'] + [col for col in metrics_df.columns
-                                      if col not in unified_df.columns and col != 'date']
-            unified_df = unified_df.merge(metrics_df[metrics_cols], on='date', how='left')
-
-        # Merge ratios
-        if not ratios_df.empty:
-            ratios_cols = ['date'] + [col for col in ratios_df.columns
-                                     if col not in unified_df.columns and col != 'date']
-            unified_df = unified_df.merge(ratios_df[ratios_cols], on='date', how='left')
-
-        # Merge growth
-        if not growth_df.empty:
-            growth_cols = ['date'] + [col for col in growth_df.columns
-                                     if col not in unified_df.columns and col != 'date']
-            unified_df = unified_df.merge(growth_df[growth_cols], on='date', how='left')
+        # Align every statement on the income statement's dates in one pass;
+        # a column already supplied by an earlier statement is not repeated
+        unified_df = join_statements({
+            'income': income_df,
+            'balance': balance_df,
+            'cashflow': cashflow_df,
+            'metrics': metrics_df,
+            'ratios': ratios_df,
+            'growth': growth_df,
+        }, on='date', how='left', conflict='first')
 
         # Merge GMV/MRR data
-        if not gmv_mrr_df.empty:
+        if TICKER == GMV_MRR_TICKER and not gmv_mrr_df.empty:
             unified_df = merge_with_gmv_mrr(unified_df, gmv_mrr_df)
 
         # Calculate growth metrics
-        unified_df = calculate_growth_metrics(unified_df)
+        unified_df = calculate_growth_metrics(unified_df, TICKER)
 
         # Sort by date descending (most recent first)
         unified_df = unified_df.sort_values('date', ascending=False).reset_index(drop=True)
@@ -557,11 +536,22 @@ def _(mo, pd, unified_df):
             </div>
             """
 
+        if 'gmv' in unified_df.columns:
+            kpi_cards = (
+                format_metric_card('GMV', gmv, 'B', gmv_yoy, '#28a745')
+                + format_metric_card('MRR', mrr, 'M', mrr_yoy, '#17a2b8')
+            )
+        else:
+            kpi_cards = (
+                format_metric_card('Operating Income', latest.get('operatingIncome', 0) / 1e9, 'B',
+                                   latest.get('operatingIncome_yoy'), '#28a745')
+                + format_metric_card('Operating Margin', operating_margin, '%', color='#17a2b8')
+            )
+
         kpi_grid = f"""
         <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 20px; margin: 20px 0;">
             {format_metric_card('Revenue', revenue, 'B', revenue_yoy, '#007bff')}
-            {format_metric_card('GMV', gmv, 'B', gmv_yoy, '#28a745')}
-            {format_metric_card('MRR', mrr, 'M', mrr_yoy, '#17a2b8')}
+            {kpi_cards}
         </div>
         <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 20px; margin: 20px 0;">
             {format_metric_card('Net Income', net_income, 'B', net_income_yoy, '#6f42c1')}
@@ -992,15 +982,21 @@ def _(mo):
 
 
 @app.cell
-def _(apply_theme, go, mo, pd, unified_df):
+def _(apply_theme, go, mo, unified_df):
     # Cell 26: Growth - QoQ and YoY Comparison
+    from src.life_agents.analytics import growth
 
     if unified_df.empty:
         mo.md("*No growth data available*")
         growth_fig = None
     else:
-        # Get last 8 quarters with growth data
-        growth_chart_data = unified_df.head(8).sort_values('date')
+        # Oldest first, so the kernels compare each quarter with earlier ones
+        chronological = unified_df.sort_values('date')
+        if 'gmv' in chronological.columns:
+            chronological = chronological.assign(gmv_yoy_calc=growth(chronological['gmv'], 4))
+
+        # Last 8 quarters with growth data
+        growth_chart_data = chronological.tail(8)
 
         # Create grouped bar chart
         growth_fig = go.Figure()
@@ -1016,33 +1012,12 @@ def _(apply_theme, go, mo, pd, unified_df):
                 )
             )
 
-        # GMV YoY (calculate manually if needed)
-        if 'gmv' in unified_df.columns:
-            gmv_growth_data = growth_chart_data.copy()
-            gmv_yoy_list = []
-
-            for idx, row in gmv_growth_data.iterrows():
-                # Find row 4 quarters ago
-                current_date = row['date']
-                quarter_4_ago = unified_df[unified_df['date'] < current_date].head(4)
-
-                if len(quarter_4_ago) == 4 and 'gmv' in quarter_4_ago.columns:
-                    gmv_4q = quarter_4_ago.iloc[-1]['gmv']
-                    current_gmv = row['gmv']
-                    if pd.notna(gmv_4q) and pd.notna(current_gmv) and gmv_4q > 0:
-                        yoy = ((current_gmv / gmv_4q) - 1) * 100
-                        gmv_yoy_list.append(yoy)
-                    else:
-                        gmv_yoy_list.append(None)
-                else:
-                    gmv_yoy_list.append(None)
-
-            gmv_growth_data['gmv_yoy_calc'] = gmv_yoy_list
-
+        # GMV YoY
+        if 'gmv_yoy_calc' in growth_chart_data.columns:
             growth_fig.add_trace(
                 go.Bar(
-                    x=gmv_growth_data['date'],
-                    y=gmv_growth_data['gmv_yoy_calc'],
+                    x=growth_chart_data['date'],
+                    y=growth_chart_data['gmv_yoy_calc'],
                     name='GMV YoY',
                     marker_color='#28a745'
                 )
@@ -1064,64 +1039,27 @@ def _(apply_theme, go, mo, pd, unified_df):
 @app.cell
 def _(mo, pd, unified_df):
     # Cell 27: Growth - Multi-Period CAGR Table
+    from src.life_agents.analytics import cagr
 
     if unified_df.empty or 'revenue' not in unified_df.columns:
         mo.md("*Growth comparison data not available*")
     else:
-        # Calculate CAGR for different periods
-        def calculate_cagr(start_val, end_val, periods):
-            if start_val <= 0 or end_val <= 0 or pd.isna(start_val) or pd.isna(end_val):
-                return None
-            return (((end_val / start_val) ** (1 / periods)) - 1) * 100
+        # One (metric x quarter) array, oldest first; every horizon in one call
+        cagr_metrics = {'Revenue': 'revenue', 'GMV': 'gmv'}
+        cagr_history = unified_df.sort_values('date').reindex(columns=list(cagr_metrics.values()))
+        cagr_by_horizon = cagr(cagr_history.to_numpy(dtype=float).T, [1, 4, 8])
 
         cagr_data = []
-
-        if len(unified_df) >= 2:
-            # 1Q growth (QoQ)
-            latest_rev = unified_df.iloc[0]['revenue']
-            q1_rev = unified_df.iloc[1]['revenue']
-            q1_growth = ((latest_rev / q1_rev) - 1) * 100 if q1_rev > 0 else None
-
-            latest_gmv = unified_df.iloc[0].get('gmv', 0)
-            q1_gmv = unified_df.iloc[1].get('gmv', 0)
-            q1_gmv_growth = ((latest_gmv / q1_gmv) - 1) * 100 if q1_gmv > 0 and pd.notna(latest_gmv) else None
-
-            cagr_data.append({
-                'Period': '1 Quarter',
-                'Revenue Growth (%)': f"{q1_growth:.2f}" if q1_growth else "N/A",
-                'GMV Growth (%)': f"{q1_gmv_growth:.2f}" if q1_gmv_growth else "N/A"
-            })
-
-        if len(unified_df) >= 5:
-            # 4Q CAGR (1 year)
-            latest_rev = unified_df.iloc[0]['revenue']
-            q4_rev = unified_df.iloc[4]['revenue']
-            q4_cagr = calculate_cagr(q4_rev, latest_rev, 4)
-
-            latest_gmv = unified_df.iloc[0].get('gmv', 0)
-            q4_gmv = unified_df.iloc[4].get('gmv', 0)
-            q4_gmv_cagr = calculate_cagr(q4_gmv, latest_gmv, 4)
-
-            cagr_data.append({
-                'Period': '4 Quarters (1Y)',
-                'Revenue Growth (%)': f"{q4_cagr:.2f}" if q4_cagr else "N/A",
-                'GMV Growth (%)': f"{q4_gmv_cagr:.2f}" if q4_gmv_cagr else "N/A"
-            })
-
-        if len(unified_df) >= 9:
-            # 8Q CAGR (2 years)
-            latest_rev = unified_df.iloc[0]['revenue']
-            q8_rev = unified_df.iloc[8]['revenue']
-            q8_cagr = calculate_cagr(q8_rev, latest_rev, 8)
-
-            latest_gmv = unified_df.iloc[0].get('gmv', 0)
-            q8_gmv = unified_df.iloc[8].get('gmv', 0)
-            q8_gmv_cagr = calculate_cagr(q8_gmv, latest_gmv, 8)
-
+        for horizon, period in [(1, '1 Quarter'), (4, '4 Quarters (1Y)'), (8, '8 Quarters (2Y)')]:
+            if len(unified_df) <= horizon:
+                continue
+            latest_cagr = cagr_by_horizon[horizon][:, -1]
             cagr_data.append({
-                'Period': '8 Quarters (2Y)',
-                'Revenue Growth (%)': f"{q8_cagr:.2f}" if q8_cagr else "N/A",
-                'GMV Growth (%)': f"{q8_gmv_cagr:.2f}" if q8_gmv_cagr else "N/A"
+                'Period': period,
+                **{
+                    f'{label} Growth (%)': f"{rate:.2f}" if pd.notna(rate) else "N/A"
+                    for label, rate in zip(cagr_metrics, latest_cagr)
+                },
             })
 
         if cagr_data:
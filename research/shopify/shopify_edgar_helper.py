@@ -13,8 +13,19 @@ Shopify's XBRL tag usage has evolved:
 This helper handles all that complexity.
 """
 
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+import polars as pl
+from typing import Dict, List, Optional, Union
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from src.life_agents.core.companyfacts import CompanyFacts, read_fact_arrays
+from src.life_agents.core.quarters import derive_quarters
+from src.life_agents.core.tables import append_metrics, combine_metrics
 
 
 # =============================================================================
@@ -73,24 +84,61 @@ SHOPIFY_CAPEX_TAGS = [
 # HELPER FUNCTIONS
 # =============================================================================
 
+# Schema of one SEC fact as it appears in the companyfacts JSON
+FACT_SCHEMA = {
+    "start": pl.String,
+    "end": pl.String,
+    "val": pl.Float64,
+    "accn": pl.String,
+    "fy": pl.Int64,
+    "fp": pl.String,
+    "form": pl.String,
+    "filed": pl.String,
+    "frame": pl.String,
+}
+
+
 def extract_shopify_metric(
-    facts: Dict,
+    facts: Union[Dict, bytes, CompanyFacts],
     tags: List[str],
     quarterly: bool = True,
-    debug: bool = False
+    debug: bool = False,
+    vectorized: bool = True,
+    as_of: Optional[str] = None,
+    derive: bool = True
 ) -> pd.DataFrame:
     """
     Extract a metric from Shopify's company facts using the specified tags.
 
     Args:
-        facts: Company facts dict from SEC API
+        facts: Company facts dict from SEC API, the raw response bytes
+            (fastest: fact arrays are then decoded straight into polars), or
+            a CompanyFacts index of them (vectorized path only) to reuse
+            across calls
         tags: List of XBRL tags to try (in priority order)
         quarterly: If True, filter to quarterly periods
         debug: If True, print diagnostic info
+        vectorized: If True, build the frame with polars straight from the JSON
+            lists; if False, use the original per-fact pandas path
+        as_of: Only use facts filed on or before this date ('YYYY-MM-DD'), so
+            later restatements are not visible (for backtests). For many as-of
+            dates use life_agents.core.point_in_time.PointInTimeIndex instead.
+        derive: If True (and quarterly), add quarters only reported inside
+            year-to-date or annual totals (Q4, YTD cash flows), flagged in a
+            ``derived`` column
 
     Returns:
         DataFrame with the metric history
     """
+    if vectorized:
+        return _extract_metric_vectorized(facts, tags, quarterly, debug, as_of, derive)
+
+    if isinstance(facts, CompanyFacts):
+        raise TypeError("The pandas path needs the company facts dict or raw bytes")
+
+    if isinstance(facts, (bytes, bytearray)):
+        facts = json.loads(facts)
+
     if not facts or "facts" not in facts:
         return pd.DataFrame()
 
@@ -129,6 +177,11 @@ def extract_shopify_metric(
         df["start"] = pd.to_datetime(df["start"])
     if "filed" in df.columns:
         df["filed"] = pd.to_datetime(df["filed"])
+        if as_of is not None:
+            df = df[df["filed"] <= pd.Timestamp(as_of)].copy()
+
+    if quarterly and derive and "start" in df.columns and "filed" in df.columns:
+        df = derive_quarters(df)
 
     # Calculate period length to distinguish quarterly from annual
     if "start" in df.columns:
@@ -170,97 +223,226 @@ def extract_shopify_metric(
     return df
 
 
-def get_shopify_revenue(facts: Dict, quarterly: bool = True, debug: bool = False) -> pd.DataFrame:
+def extract_shopify_metrics(
+    facts: Union[Dict, bytes, CompanyFacts],
+    metrics: Dict[str, List[str]],
+    quarterly: bool = True,
+    debug: bool = False,
+    vectorized: bool = True,
+    as_of: Optional[str] = None,
+    derive: bool = True
+) -> Dict[str, pd.DataFrame]:
+    """
+    Extract several metrics at once (see extract_shopify_metric).
+
+    The vectorized path handles every metric in one columnar query, which is
+    far faster than one extract_shopify_metric call per metric when there are
+    many of them.
+
+    Args:
+        facts: Company facts dict, raw response bytes or CompanyFacts index
+        metrics: Metric name -> XBRL tags to try (in priority order)
+        quarterly, debug, vectorized, as_of, derive: As for extract_shopify_metric
+
+    Returns:
+        Dict of metric name -> DataFrame with the metric history
+    """
+    if vectorized:
+        return _extract_metrics_vectorized(facts, metrics, quarterly, debug, as_of, derive)
+    if isinstance(facts, (bytes, bytearray)):
+        facts = json.loads(facts)
+    return {
+        name: extract_shopify_metric(facts, tags, quarterly, debug, vectorized=False, as_of=as_of, derive=derive)
+        for name, tags in metrics.items()
+    }
+
+
+def _extract_metric_vectorized(
+    facts: Union[Dict, bytes, CompanyFacts],
+    tags: List[str],
+    quarterly: bool,
+    debug: bool,
+    as_of: Optional[str] = None,
+    derive: bool = True
+) -> pd.DataFrame:
+    """Columnar version of extract_shopify_metric (see _extract_metrics_vectorized)."""
+    return _extract_metrics_vectorized(facts, {"metric": tags}, quarterly, debug, as_of, derive)["metric"]
+
+
+def _extract_metrics_vectorized(
+    facts: Union[Dict, bytes, CompanyFacts],
+    metrics: Dict[str, List[str]],
+    quarterly: bool,
+    debug: bool,
+    as_of: Optional[str] = None,
+    derive: bool = True
+) -> Dict[str, pd.DataFrame]:
+    """
+    Columnar extraction of several metrics in one query.
+
+    Raw payload bytes are indexed once per call with msgspec (or a caller's
+    CompanyFacts index is used as is) and the fact arrays of
+    every requested tag are parsed by polars in a single read, so no per-fact
+    Python objects exist at all. Parsed dicts are handed to polars as-is (no
+    per-fact copies or annotation). Either way metric, tag name and priority
+    are attached as columns, and date parsing, quarter derivation, period
+    filtering and dedup run once for all metrics, grouped by metric.
+    """
+    requested = [(m, priority, tag) for m, (name, tags) in enumerate(metrics.items()) for priority, tag in enumerate(tags)]
+    if isinstance(facts, (bytes, bytearray, CompanyFacts)):
+        company = facts if isinstance(facts, CompanyFacts) else CompanyFacts(bytes(facts))
+        raws = {tag: company.fact_array(tag, "us-gaap", "USD") for _, _, tag in requested}
+        found = [(m, priority, tag) for m, priority, tag in requested if raws[tag] is not None]
+        frame, counts = read_fact_arrays([raws[tag] for _, _, tag in found], FACT_SCHEMA)
+    else:
+        if not facts or "facts" not in facts:
+            return {name: pd.DataFrame() for name in metrics}
+        us_gaap = facts.get("facts", {}).get("us-gaap", {})
+        arrays = {tag: us_gaap.get(tag, {}).get("units", {}).get("USD") or [] for _, _, tag in requested}
+        found = [(m, priority, tag) for m, priority, tag in requested if arrays[tag]]
+        frame = pl.from_dicts([f for _, _, tag in found for f in arrays[tag]], schema=FACT_SCHEMA)
+        counts = [len(arrays[tag]) for _, _, tag in found]
+
+    # Facts of array i are rows offsets[i]:offsets[i + 1] of the frame
+    array_idx = np.repeat(np.arange(len(found)), counts)
+    frame = frame.with_columns(
+        pl.Series("_metric", [m for m, _, _ in found], pl.UInt32).gather(array_idx),
+        pl.Series("xbrl_tag", [tag for _, _, tag in found], pl.String).gather(array_idx),
+        pl.Series("tag_priority", [priority for _, priority, _ in found], pl.Int32).gather(array_idx),
+    )
+    if debug:
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        for i, (_, _, tag) in enumerate(found):
+            ends = frame["end"][offsets[i]:offsets[i + 1]]
+            if len(ends):
+                print(f"  {tag}: {len(ends)} facts, {ends.min()} to {ends.max()}")
+
+    # Period length distinguishes quarterly from annual (assume quarterly if a
+    # metric has no start dates)
+    period_days = (
+        pl.when(pl.col("start").is_null().all().over("_metric"))
+        .then(pl.lit(90))
+        .otherwise((pl.col("end") - pl.col("start")).dt.total_days())
+    )
+
+    lf = frame.lazy().with_columns(
+        pl.col("end").str.to_date(),
+        pl.col("start").str.to_date(strict=False),
+        pl.col("filed").str.to_date(strict=False),
+    )
+    if as_of is not None:
+        lf = lf.filter(pl.col("filed") <= pd.Timestamp(as_of).date())
+    if quarterly and derive:
+        lf = derive_quarters(lf, keys=("_metric", "xbrl_tag"))
+
+    # Per metric and end date keep the highest-priority tag, then the most
+    # recent filing; the rest of the pipeline runs as a single query
+    df = (
+        lf.filter(period_days < 120 if quarterly else period_days > 300)
+        .sort(
+            ["_metric", "end", "tag_priority", "filed"],
+            descending=[False, False, False, True],
+            nulls_last=True,
+            maintain_order=True,
+        )
+        .unique(subset=["_metric", "end"], keep="first", maintain_order=True)
+        .sort(["_metric", "end"], descending=[False, True])
+        .with_columns(pl.col("start", "end", "filed").cast(pl.Datetime("ns")))
+        .collect()
+    )
+
+    # One pandas conversion; metrics are contiguous row ranges of it
+    sizes = np.bincount(df["_metric"].to_numpy(), minlength=len(metrics))
+    bounds = np.concatenate([[0], np.cumsum(sizes)])
+    found_metrics = {m for m, _, _ in found}
+    pdf = df.drop("_metric", "tag_priority").to_pandas()
+    results = {}
+    for m, name in enumerate(metrics):
+        if m not in found_metrics:
+            if debug:
+                print(f"{name}: no data found")
+            results[name] = pd.DataFrame()
+            continue
+        if not sizes[m] and debug:
+            print(f"{name}: no {'quarterly' if quarterly else 'annual'} data after filtering")
+        results[name] = pdf.iloc[bounds[m]:bounds[m + 1]].reset_index(drop=True)
+    return results
+
+
+def get_shopify_revenue(facts: Union[Dict, bytes, CompanyFacts], quarterly: bool = True, debug: bool = False) -> pd.DataFrame:
     """Get Shopify's total revenue history."""
     if debug:
         print("Extracting total revenue...")
     return extract_shopify_metric(facts, SHOPIFY_TOTAL_REVENUE_TAGS, quarterly, debug)
 
 
-def get_shopify_net_income(facts: Dict, quarterly: bool = True, debug: bool = False) -> pd.DataFrame:
+def get_shopify_net_income(facts: Union[Dict, bytes, CompanyFacts], quarterly: bool = True, debug: bool = False) -> pd.DataFrame:
     """Get Shopify's net income history."""
     if debug:
         print("Extracting net income...")
     return extract_shopify_metric(facts, SHOPIFY_NET_INCOME_TAGS, quarterly, debug)
 
 
-def get_shopify_gross_profit(facts: Dict, quarterly: bool = True, debug: bool = False) -> pd.DataFrame:
+def get_shopify_gross_profit(facts: Union[Dict, bytes, CompanyFacts], quarterly: bool = True, debug: bool = False) -> pd.DataFrame:
     """Get Shopify's gross profit history."""
     if debug:
         print("Extracting gross profit...")
     return extract_shopify_metric(facts, SHOPIFY_GROSS_PROFIT_TAGS, quarterly, debug)
 
 
-def get_shopify_operating_income(facts: Dict, quarterly: bool = True, debug: bool = False) -> pd.DataFrame:
+def get_shopify_operating_income(facts: Union[Dict, bytes, CompanyFacts], quarterly: bool = True, debug: bool = False) -> pd.DataFrame:
     """Get Shopify's operating income history."""
     if debug:
         print("Extracting operating income...")
     return extract_shopify_metric(facts, SHOPIFY_OPERATING_INCOME_TAGS, quarterly, debug)
 
 
-def get_shopify_operating_cash_flow(facts: Dict, quarterly: bool = True, debug: bool = False) -> pd.DataFrame:
+def get_shopify_operating_cash_flow(facts: Union[Dict, bytes, CompanyFacts], quarterly: bool = True, debug: bool = False) -> pd.DataFrame:
     """Get Shopify's operating cash flow history."""
     if debug:
         print("Extracting operating cash flow...")
     return extract_shopify_metric(facts, SHOPIFY_OPERATING_CF_TAGS, quarterly, debug)
 
 
-def get_all_shopify_metrics(facts: Dict, quarterly: bool = True, debug: bool = False) -> Dict[str, pd.DataFrame]:
+def get_all_shopify_metrics(facts: Union[Dict, bytes, CompanyFacts], quarterly: bool = True, debug: bool = False) -> Dict[str, pd.DataFrame]:
     """
     Get all key metrics for Shopify in one call.
 
     Returns:
         Dict with keys: revenue, net_income, gross_profit, operating_income, operating_cf
     """
-    return {
-        "revenue": get_shopify_revenue(facts, quarterly, debug),
-        "net_income": get_shopify_net_income(facts, quarterly, debug),
-        "gross_profit": get_shopify_gross_profit(facts, quarterly, debug),
-        "operating_income": get_shopify_operating_income(facts, quarterly, debug),
-        "operating_cf": get_shopify_operating_cash_flow(facts, quarterly, debug),
-    }
-
-
-def create_shopify_financials_table(metrics: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    return extract_shopify_metrics(
+        facts,
+        {
+            "revenue": SHOPIFY_TOTAL_REVENUE_TAGS,
+            "net_income": SHOPIFY_NET_INCOME_TAGS,
+            "gross_profit": SHOPIFY_GROSS_PROFIT_TAGS,
+            "operating_income": SHOPIFY_OPERATING_INCOME_TAGS,
+            "operating_cf": SHOPIFY_OPERATING_CF_TAGS,
+        },
+        quarterly,
+        debug,
+    )
+
+
+def create_shopify_financials_table(
+    metrics: Dict[str, pd.DataFrame],
+    existing: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
     """
     Combine all metrics into a single table with periods as rows.
 
     Args:
         metrics: Output from get_all_shopify_metrics()
+        existing: Table from a previous call; when given, only the periods in
+            ``metrics`` are merged into it instead of rebuilding the table
 
     Returns:
-        DataFrame with period_end as index and metrics as columns
+        DataFrame with period_end and one column per metric, newest first
     """
-    combined = []
-
-    for metric_name, df in metrics.items():
-        if df.empty:
-            continue
-
-        for _, row in df.iterrows():
-            combined.append({
-                "period_end": row["end"],
-                "metric": metric_name,
-                "value": row.get("val"),
-                "source_tag": row.get("xbrl_tag"),
-            })
-
-    if not combined:
-        return pd.DataFrame()
-
-    combined_df = pd.DataFrame(combined)
-
-    # Pivot to wide format
-    wide = combined_df.pivot_table(
-        index="period_end",
-        columns="metric",
-        values="value",
-        aggfunc="first"
-    ).reset_index()
-
-    wide = wide.sort_values("period_end", ascending=False)
-
-    return wide
+    if existing is not None:
+        return append_metrics(existing, metrics)
+    return combine_metrics(metrics)
 
 
 # =============================================================================
@@ -318,14 +500,12 @@ def diagnose_revenue_tags(facts: Dict) -> pd.DataFrame:
 # =============================================================================
 
 if __name__ == "__main__":
-    import requests
+    from src.life_agents.core.utils import fetch_company_facts
 
     SHOP_CIK = "0001594805"
-    SEC_HEADER = {"User-Agent": "your.email@example.com"}
 
     print("Fetching Shopify company facts...")
-    url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{SHOP_CIK}.json"
-    facts = requests.get(url, headers=SEC_HEADER, timeout=30).json()
+    facts = fetch_company_facts(SHOP_CIK)
 
     print("\n" + "="*70)
     print("REVENUE TAG DIAGNOSIS")
@@ -0,0 +1,226 @@
+"""
+Vectorized time-series kernels over (company x period) panels.
+
+Every kernel takes a 2-D float array with one row per series (company,
+ticker, metric...) and one column per period in chronological order; NaN
+marks a missing value. Each call processes all rows at once with cumulative
+sums and shifted views, so a screen over thousands of tickers is a handful of
+NumPy operations. 1-D inputs are treated as a single series and come back 1-D.
+
+``panel`` builds such an array from a long pandas/polars frame.
+
+Usage:
+    from life_agents.analytics import panel, ttm, cagr, rolling_zscore, drawdown
+
+    p = panel(features, row="cik", column="cal_quarter", value="val")
+    revenue_ttm = ttm(p.values)                      # trailing four quarters
+    growth = cagr(revenue_ttm, horizons=[4, 12, 20], periods_per_year=4)
+    z = rolling_zscore(p.values, window=12)
+"""
+
+import warnings
+from typing import Dict, Iterable, NamedTuple, Optional, Union
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+ArrayLike = Union[np.ndarray, pd.Series, pd.DataFrame, list]
+
+
+class Panel(NamedTuple):
+    """A dense (row x column) array with the labels of its axes."""
+    values: np.ndarray
+    rows: np.ndarray
+    columns: np.ndarray
+
+    def to_frame(self, values: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Labelled pandas view of ``values`` (defaults to the panel's own)."""
+        return pd.DataFrame(self.values if values is None else values, index=self.rows, columns=self.columns)
+
+
+def panel(
+    df: Union[pd.DataFrame, pl.DataFrame],
+    row: str,
+    column: str,
+    value: str,
+    contiguous: Optional[bool] = None,
+) -> Panel:
+    """
+    Pivot a long frame into a (row x column) float array.
+
+    Args:
+        df: Long frame with one value per (row, column); duplicates keep the last
+        row: Column identifying each series (e.g. 'cik' or 'ticker')
+        column: Period column (e.g. 'cal_quarter' or 'date'), sorted ascending
+        value: Column holding the values
+        contiguous: Fill every integer period between the first and last so
+            that shifts are exact (default: True for integer period columns)
+
+    Returns:
+        Panel of float64 values with NaN where a series has no value
+    """
+    df = pl.from_pandas(df) if isinstance(df, pd.DataFrame) else df
+    rows, row_idx = np.unique(df[row].to_numpy(), return_inverse=True)
+    periods = df[column].to_numpy()
+
+    integer = np.issubdtype(periods.dtype, np.integer)
+    if contiguous is None:
+        contiguous = integer
+    if contiguous and len(periods):
+        columns = np.arange(periods.min(), periods.max() + 1)
+        col_idx = periods - periods.min()
+    else:
+        columns, col_idx = np.unique(periods, return_inverse=True)
+
+    values = np.full((len(rows), len(columns)), np.nan)
+    values[row_idx, col_idx] = df[value].cast(pl.Float64).to_numpy()
+    return Panel(values, rows, columns)
+
+
+def _as_2d(x: ArrayLike) -> np.ndarray:
+    return np.atleast_2d(np.asarray(x, dtype=np.float64))
+
+
+def _like(result: np.ndarray, x: ArrayLike) -> np.ndarray:
+    return result[0] if np.ndim(x) == 1 else result
+
+
+def _shift(x: np.ndarray, periods: int) -> np.ndarray:
+    """Values ``periods`` columns earlier (NaN where there are none)."""
+    out = np.full_like(x, np.nan)
+    if periods < x.shape[1]:
+        out[:, periods:] = x[:, :x.shape[1] - periods]
+    return out
+
+
+def _rolling_sums(x: np.ndarray, window: int):
+    """Rolling count, sum and sum of squares of non-NaN values."""
+    valid = ~np.isnan(x)
+    filled = np.where(valid, x, 0.0)
+    pad = np.zeros((x.shape[0], 1))
+
+    def windowed(a: np.ndarray) -> np.ndarray:
+        c = np.concatenate([pad, np.cumsum(a, axis=1)], axis=1)
+        out = c[:, 1:].copy()
+        out[:, window:] -= c[:, 1:-window]
+        return out
+
+    return windowed(valid.astype(np.float64)), windowed(filled), windowed(filled * filled)
+
+
+def rolling_sum(x: ArrayLike, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    Sum over the trailing ``window`` periods.
+
+    Args:
+        x: (series x period) values
+        window: Periods per window
+        min_periods: Non-missing values required (default: the full window)
+
+    Returns:
+        Array shaped like ``x``; NaN where too few values are present
+    """
+    a = _as_2d(x)
+    count, total, _ = _rolling_sums(a, window)
+    total[count < (window if min_periods is None else min_periods)] = np.nan
+    return _like(total, x)
+
+
+def ttm(x: ArrayLike, window: int = 4) -> np.ndarray:
+    """Trailing-twelve-month sum of quarterly values (all four quarters required)."""
+    return rolling_sum(x, window)
+
+
+def growth(x: ArrayLike, periods: int = 1) -> np.ndarray:
+    """
+    Percent change over ``periods`` (pandas pct_change semantics, times 100).
+
+    Returns:
+        Array shaped like ``x``; NaN where either value is missing or the base is zero
+    """
+    a = _as_2d(x)
+    base = _shift(a, periods)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(base != 0, (a / base - 1) * 100, np.nan)
+    return _like(out, x)
+
+
+def cagr(
+    x: ArrayLike,
+    horizons: Union[int, Iterable[int]],
+    periods_per_year: Optional[float] = None,
+) -> Union[np.ndarray, Dict[int, np.ndarray]]:
+    """
+    Compound growth rate over one or several horizons, in percent.
+
+    Args:
+        x: (series x period) values, e.g. quarterly revenue or TTM revenue
+        horizons: Periods between start and end value (e.g. 4, or [4, 12, 20])
+        periods_per_year: Annualize with this many periods per year (4 for
+            quarters); None gives the compound rate per period
+
+    Returns:
+        Array shaped like ``x`` for a single horizon, else {horizon: array};
+        NaN where either value is missing or not positive
+    """
+    a = _as_2d(x)
+    single = isinstance(horizons, (int, np.integer))
+    out = {}
+    for h in ([horizons] if single else horizons):
+        start = _shift(a, h)
+        exponent = (periods_per_year / h) if periods_per_year else (1 / h)
+        ok = (a > 0) & (start > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[h] = _like(np.where(ok, ((a / start) ** exponent - 1) * 100, np.nan), x)
+    return out[horizons] if single else out
+
+
+def rolling_zscore(x: ArrayLike, window: int, min_periods: Optional[int] = None, ddof: int = 1) -> np.ndarray:
+    """
+    Each value's z-score against its trailing ``window`` (including itself).
+
+    Args:
+        x: (series x period) values
+        window: Periods per window
+        min_periods: Non-missing values required (default: the full window)
+        ddof: Delta degrees of freedom of the standard deviation
+
+    Returns:
+        Array shaped like ``x``; NaN where the window is too sparse or flat
+    """
+    a = _as_2d(x)
+    # Centering each row keeps the running sums of squares well conditioned
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        center = np.nan_to_num(np.nanmean(a, axis=1, keepdims=True))
+    a = a - center
+    count, total, squares = _rolling_sums(a, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / count
+        var = np.clip(squares - total * mean, 0, None) / (count - ddof)
+        z = (a - mean) / np.sqrt(var)
+    z[(count < (window if min_periods is None else min_periods)) | ~np.isfinite(z)] = np.nan
+    return _like(z, x)
+
+
+def drawdown(x: ArrayLike) -> np.ndarray:
+    """
+    Decline from the running peak, in percent (0 at a new high).
+
+    Missing values are skipped when tracking the peak and stay NaN.
+    """
+    a = _as_2d(x)
+    peak = np.fmax.accumulate(a, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = (a / peak - 1) * 100
+    return _like(out, x)
+
+
+def max_drawdown(x: ArrayLike) -> np.ndarray:
+    """Deepest drawdown of each series, in percent (NaN for an all-missing series)."""
+    dd = _as_2d(drawdown(x))
+    out = np.full(dd.shape[0], np.nan)
+    has = ~np.isnan(dd).all(axis=1)
+    out[has] = np.nanmin(dd[has], axis=1)
+    return out[0] if np.ndim(x) == 1 else out
@@ -0,0 +1,137 @@
+"""
+Small-multiples charts: many series of one frame drawn as a single figure.
+
+``small_multiples`` draws each requested column as one panel of a faceted
+matplotlib grid with a shared x axis and returns the rendered PNG, so a
+dashboard cell emits one image instead of one figure per metric. Renders are
+cached on disk keyed on a hash of the plotted data and the layout; a rerun
+with unchanged data reads the image back instead of drawing it again.
+
+Usage:
+    import marimo as mo
+    from life_agents.charts import small_multiples
+
+    mo.image(small_multiples(irvine_df, ["MEDIAN_SALE_PRICE", "MEDIAN_DOM", "INVENTORY"], ncols=3))
+"""
+
+import hashlib
+import io
+import math
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .core.cache import DiskCache
+from .core.config import settings
+
+
+@lru_cache(maxsize=1)
+def get_chart_cache() -> DiskCache:
+    """Process-wide cache of rendered charts under ``DATA_DIR/cache/charts``."""
+    # Keys are content hashes, so entries never go stale; only size evicts them
+    return DiskCache(
+        settings.DATA_DIR / "cache" / "charts",
+        ttl=math.inf,
+        max_bytes=settings.CHART_CACHE_MAX_MB * 1024 * 1024,
+    )
+
+
+def data_hash(df: pd.DataFrame) -> str:
+    """SHA-256 of a frame's index, column names and values."""
+    digest = hashlib.sha256()
+    digest.update(repr(list(df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _render(
+    df: pd.DataFrame,
+    ncols: int,
+    panel_size: Tuple[float, float],
+    sharey: bool,
+    title: Optional[str],
+    dpi: int,
+) -> bytes:
+    # The object-oriented Figure keeps renders off pyplot's global state, so
+    # nothing is left open or shown as a side effect
+    import matplotlib.dates as mdates
+    from matplotlib.figure import Figure
+
+    n = len(df.columns)
+    nrows = math.ceil(n / ncols)
+    width, height = panel_size[0] * ncols, panel_size[1] * nrows
+    fig = Figure(figsize=(width, height))
+    axes = fig.subplots(nrows, ncols, sharex=True, sharey=sharey, squeeze=False)
+    x = df.index.to_numpy()
+    for ax, column in zip(axes.flat, df.columns):
+        ax.plot(x, df[column].to_numpy(dtype=np.float64), linewidth=1)
+        ax.set_title(str(column), fontsize=9)
+        ax.tick_params(labelsize=7)
+        ax.grid(alpha=0.3)
+    for ax in axes.flat[n:]:
+        ax.set_visible(False)
+    # Shared x axis: label the lowest drawn panel of each grid column
+    for i, ax in enumerate(axes.flat[:n]):
+        ax.tick_params(axis="x", labelbottom=i + ncols >= n)
+    if isinstance(df.index, pd.DatetimeIndex):
+        # The default minticks=5 leaves no valid interval for ~3 years of monthly
+        # periods (too few yearly ticks, too many monthly ones)
+        locator = mdates.AutoDateLocator(minticks=3, maxticks=7)
+        axes[0, 0].xaxis.set_major_locator(locator)
+        axes[0, 0].xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+
+    # Fixed margins in inches; a layout engine costs more than the drawing
+    # itself on a grid of dozens of panels
+    top = 0.6 if title else 0.3
+    fig.subplots_adjust(
+        left=0.7 / width, right=1 - 0.2 / width, bottom=0.4 / height, top=1 - top / height,
+        hspace=0.55, wspace=0.3,
+    )
+    if title:
+        fig.suptitle(title, y=1 - 0.15 / height, va="top")
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi)
+    return buf.getvalue()
+
+
+def small_multiples(
+    df: pd.DataFrame,
+    columns: Optional[Sequence[str]] = None,
+    ncols: int = 4,
+    panel_size: Tuple[float, float] = (4.0, 2.4),
+    sharey: bool = False,
+    title: Optional[str] = None,
+    dpi: int = 100,
+    cache: bool = True,
+) -> bytes:
+    """
+    Draw each column as a panel of one faceted figure with a shared x axis.
+
+    Args:
+        df: Frame indexed by the x values (e.g. a DatetimeIndex of periods)
+        columns: Columns to draw, one panel each (default: every numeric column)
+        ncols: Panels per row
+        panel_size: (width, height) of each panel in inches
+        sharey: Share the y axis too (only for metrics in the same units)
+        title: Figure title
+        dpi: Resolution of the PNG
+        cache: Reuse an earlier render of identical data and layout
+
+    Returns:
+        PNG bytes (e.g. for ``mo.image``)
+    """
+    data = df[list(columns)] if columns is not None else df.select_dtypes("number")
+    if not cache:
+        return _render(data, ncols, panel_size, sharey, title, dpi)
+
+    key = f"small_multiples:{data_hash(data)}:{ncols}:{panel_size}:{sharey}:{title}:{dpi}"
+    chart_cache = get_chart_cache()
+    entry = chart_cache.lookup(key)
+    if entry is not None:
+        return chart_cache.read(entry)
+    png = _render(data, ncols, panel_size, sharey, title, dpi)
+    chart_cache.store(key, png)
+    return png
@@ -0,0 +1,163 @@
+import typer
+from pathlib import Path
+from typing import List, Optional
+from typing_extensions import Annotated
+
+app = typer.Typer(help="Life Agents command line tools.")
+sec_app = typer.Typer(help="SEC EDGAR filings and XBRL facts.")
+app.add_typer(sec_app, name="sec")
+fred_app = typer.Typer(help="FRED economic series stored locally.")
+app.add_typer(fred_app, name="fred")
+
+
+@sec_app.command("sync")
+def sec_sync(
+    tickers: Annotated[Optional[List[str]], typer.Argument(help="Tickers or CIKs to add/sync (default: whole watchlist)")] = None,
+    full: Annotated[bool, typer.Option(help="Re-download full fact histories")] = False,
+    workers: Annotated[int, typer.Option(help="Companies synced concurrently")] = 8,
+):
+    """Fetch new filings and their XBRL facts for the watchlist."""
+    from .core.sec_sync import SecSync
+
+    sync = SecSync()
+    if not tickers and not sync.state:
+        print("Watchlist is empty. Add companies with: life sec sync SHOP MSFT ...")
+        raise typer.Exit(1)
+
+    results = sync.sync(tickers, full=full, max_workers=workers)
+    failed = 0
+    for r in results:
+        name = r.ticker or r.cik
+        if r.error:
+            failed += 1
+            print(f"  {name:<8} ERROR: {r.error}")
+        elif r.full_refresh:
+            print(f"  {name:<8} full history: {r.new_facts:,} facts, {r.new_filings} filings indexed")
+        elif r.new_filings:
+            pending = f", {r.pending} awaiting facts" if r.pending else ""
+            print(f"  {name:<8} {r.new_filings} new filings, {r.new_facts:,} new facts{pending}")
+        else:
+            print(f"  {name:<8} up to date")
+    print(f"Synced {len(results) - failed}/{len(results)} companies")
+    if failed:
+        raise typer.Exit(1)
+
+
+@sec_app.command("bulk-ingest")
+def sec_bulk_ingest(
+    zip_path: Annotated[Path, typer.Argument(help="Local copy of the SEC's companyfacts.zip", exists=True, dir_okay=False)],
+    workers: Annotated[Optional[int], typer.Option(help="Parser processes (default: one per CPU)")] = None,
+):
+    """Load every company in companyfacts.zip into the local facts store."""
+    from .core.facts_store import FactsStore
+    from .core.fiscal_calendar import FiscalCalendar
+
+    store = FactsStore()
+    results = store.ingest_bulk(zip_path, max_workers=workers)
+    FiscalCalendar(store).build()
+    errors = results.filter(results["error"].is_not_null())
+    for row in errors.head(20).iter_rows(named=True):
+        print(f"  CIK {row['cik']}: {row['error']}")
+    print(
+        f"Ingested {results.height - errors.height:,} companies, "
+        f"{results['facts'].sum():,} facts ({errors.height:,} failed)"
+    )
+
+
+@sec_app.command("features")
+def sec_features(
+    tickers: Annotated[Optional[List[str]], typer.Argument(help="Tickers or CIKs (default: every stored company)")] = None,
+):
+    """Recompute growth/margin features for companies whose facts changed."""
+    from .core.features import FeatureStore
+    from .core.utils import get_cik_from_ticker
+
+    ciks = None
+    if tickers:
+        ciks = [t if t.isdigit() else get_cik_from_ticker(t) for t in tickers]
+        ciks = [c for c in ciks if c]
+    updated = FeatureStore().update(ciks)
+    print(f"Updated features for {len(updated):,} companies")
+
+
+@sec_app.command("status")
+def sec_status():
+    """Show tracked companies and their last seen filing."""
+    from .core.sec_sync import SecSync
+
+    companies = SecSync().companies()
+    if companies.is_empty():
+        print("Watchlist is empty.")
+        return
+    print(companies.to_pandas().to_string(index=False))
+
+
+@sec_app.command("untrack")
+def sec_untrack(tickers: List[str]):
+    """Remove companies from the watchlist (stored data is kept)."""
+    from .core.sec_sync import SecSync
+
+    SecSync().untrack(tickers)
+
+
+@sec_app.command("filings")
+def sec_filings(
+    ticker: str,
+    form: Annotated[Optional[List[str]], typer.Option(help="Filter by form, e.g. --form 10-Q --form 10-K")] = None,
+    limit: int = 20,
+):
+    """List a synced company's filings with document URLs."""
+    from .core.sec_sync import SecSync
+
+    filings = SecSync().load_filings(ticker, forms=form)
+    if filings.is_empty():
+        print(f"No filings stored for {ticker}; run: life sec sync {ticker}")
+        raise typer.Exit(1)
+    print(filings.head(limit).select("filing_date", "form", "report_date", "url").to_pandas().to_string(index=False))
+
+
+@fred_app.command("update")
+def fred_update(
+    series: Annotated[Optional[List[str]], typer.Argument(help="Series IDs to add/update (default: every stored series)")] = None,
+    full: Annotated[bool, typer.Option(help="Re-download full histories")] = False,
+    force: Annotated[bool, typer.Option(help="Check series even if checked recently")] = False,
+    workers: Annotated[int, typer.Option(help="Series updated concurrently")] = 4,
+):
+    """Fetch new and revised observations for stored FRED series."""
+    from .core.fred import FredStore
+
+    store = FredStore()
+    if not series and store.metadata().is_empty():
+        print("No series stored. Add some with: life fred update FEDFUNDS DGS10 ...")
+        raise typer.Exit(1)
+
+    results = store.update(series, full=full, max_age_hours=0 if force else None, max_workers=workers)
+    failed = 0
+    for r in results:
+        if r.error:
+            failed += 1
+        elif r.skipped:
+            print(f"  {r.series_id:<14} up to date")
+        else:
+            print(f"  {r.series_id:<14} {r.new_observations:,} new observations ({r.fetched:,} fetched)")
+    print(f"Updated {len(results) - failed}/{len(results)} series")
+    if failed:
+        raise typer.Exit(1)
+
+
+@fred_app.command("status")
+def fred_status():
+    """Show stored series with their last observation and update times."""
+    from .core.fred import FredStore
+
+    metadata = FredStore().metadata()
+    if metadata.is_empty():
+        print("No series stored.")
+        return
+    print(metadata.select(
+        "series_id", "frequency", "first_observation", "last_observation", "observations", "last_updated", "checked_at"
+    ).to_pandas().to_string(index=False))
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,88 @@
+"""
+Asyncio helpers for running independent blocking fetches concurrently.
+
+Requests still go through the shared pooled client in ``life_agents.core.http``
+(so keep-alive connections, rate limits and retries apply); asyncio only
+overlaps the waiting, so N independent calls take roughly as long as the
+slowest one instead of the sum of all of them.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Mapping, TypeVar
+
+T = TypeVar("T")
+
+# I/O-bound pool sized for network waits rather than CPU count (the default
+# executor would cap a 9-endpoint refresh at cpu_count + 4 threads)
+_io_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="life-agents-io")
+
+
+def submit_io(func: Callable[..., T], *args, **kwargs) -> "Future[T]":
+    """Start a blocking I/O call on the shared I/O pool without waiting for it."""
+    return _io_executor.submit(func, *args, **kwargs)
+
+
+async def run_blocking(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking I/O call in a worker thread without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_io_executor, functools.partial(func, *args, **kwargs))
+
+
+async def gather_dict(
+    coros: Mapping[str, Awaitable[T]],
+    limit: int | None = None,
+) -> Dict[str, T]:
+    """
+    Await a mapping of coroutines concurrently and return results under the same keys.
+
+    Args:
+        coros: Name -> coroutine
+        limit: Maximum coroutines in flight at once (None = all)
+
+    Returns:
+        Name -> result, in the order of ``coros``. Exceptions propagate.
+    """
+    if limit is None:
+        results = await asyncio.gather(*coros.values())
+        return dict(zip(coros.keys(), results))
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(coro: Awaitable[T]) -> T:
+        async with semaphore:
+            return await coro
+
+    results = await asyncio.gather(*(bounded(c) for c in coros.values()))
+    return dict(zip(coros.keys(), results))
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Works both from plain scripts and from environments that already have an
+    event loop running in this thread (e.g. notebook kernels), where the
+    coroutine is run on a private loop in a helper thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result: Dict[str, Any] = {}
+
+    def runner() -> None:
+        try:
+            result["value"] = asyncio.run(coro)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=runner, daemon=True)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
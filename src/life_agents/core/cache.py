@@ -0,0 +1,204 @@
+"""
+Persistent on-disk cache for large HTTP payloads.
+
+Blobs are stored content-addressed (by SHA-256) under ``<root>/objects`` and
+indexed by key in a small SQLite database, so identical payloads are only
+kept once and the index can be shared safely between processes.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+
+@dataclass
+class CacheEntry:
+    """Index record for one cached key."""
+    key: str
+    digest: str
+    size: int
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    accessed_at: float
+
+    def age(self) -> float:
+        """Seconds since the payload was last fetched or revalidated."""
+        return time.time() - self.fetched_at
+
+    def is_fresh(self, ttl: float) -> bool:
+        """True if the entry was fetched or revalidated within ``ttl`` seconds."""
+        return self.age() < ttl
+
+
+class DiskCache:
+    """
+    Content-addressed blob cache with TTL metadata and size-bounded LRU eviction.
+
+    Args:
+        root: Directory holding the index and the object store
+        ttl: Seconds an entry is considered fresh without revalidation
+        max_bytes: Total blob size above which least-recently-used entries are evicted
+    """
+
+    def __init__(self, root: Path, ttl: float, max_bytes: int):
+        self.root = Path(root)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._objects = self.root / "objects"
+        self._objects.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.root / "index.sqlite", timeout=30)
+
+    def _object_path(self, digest: str) -> Path:
+        return self._objects / digest[:2] / digest
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """Return the index entry for ``key`` if its blob is still on disk."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT key, digest, size, etag, last_modified, fetched_at, accessed_at "
+                "FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        entry = CacheEntry(*row)
+        if not self._object_path(entry.digest).exists():
+            self.delete(key)
+            return None
+        return entry
+
+    def path(self, entry: CacheEntry) -> Path:
+        """Location of the entry's blob, marking it as recently used."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                (time.time(), entry.key),
+            )
+        return self._object_path(entry.digest)
+
+    def read(self, entry: CacheEntry) -> bytes:
+        """Read the entry's blob, marking it as recently used."""
+        return self.path(entry).read_bytes()
+
+    def store(
+        self,
+        key: str,
+        data: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> CacheEntry:
+        """Write ``data`` under ``key`` and evict old entries if over budget."""
+        digest = hashlib.sha256(data).hexdigest()
+        target = self._object_path(digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, target)
+
+        now = time.time()
+        entry = CacheEntry(key, digest, len(data), etag, last_modified, now, now)
+        with self._lock, self._connect() as conn:
+            previous = conn.execute(
+                "SELECT digest FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, digest, entry.size, etag, last_modified, now, now),
+            )
+            if previous and previous[0] != digest:
+                self._drop_orphan(conn, previous[0])
+        self.evict()
+        return entry
+
+    def revalidated(self, entry: CacheEntry) -> CacheEntry:
+        """Reset an entry's freshness after the origin confirmed it (HTTP 304)."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE entries SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, entry.key),
+            )
+        entry.fetched_at = entry.accessed_at = now
+        return entry
+
+    def delete(self, key: str) -> None:
+        """Remove ``key`` from the index, dropping its blob if nothing else uses it."""
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT digest FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            if row:
+                self._drop_orphan(conn, row[0])
+
+    def total_bytes(self) -> int:
+        """Size of all distinct blobs referenced by the index."""
+        with self._connect() as conn:
+            return self._total_bytes(conn)
+
+    def evict(self) -> int:
+        """Evict least-recently-used entries until under ``max_bytes``. Returns entries removed."""
+        removed = 0
+        with self._lock, self._connect() as conn:
+            total = self._total_bytes(conn)
+            if total <= self.max_bytes:
+                return 0
+            rows = conn.execute(
+                "SELECT key, digest, size FROM entries ORDER BY accessed_at ASC"
+            ).fetchall()
+            for key, digest, size in rows:
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                if self._drop_orphan(conn, digest):
+                    total -= size
+                removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry and blob."""
+        with self._connect() as conn:
+            keys = [row[0] for row in conn.execute("SELECT key FROM entries")]
+        for key in keys:
+            self.delete(key)
+
+    @staticmethod
+    def _total_bytes(conn: sqlite3.Connection) -> int:
+        return conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM "
+            "(SELECT digest, MAX(size) AS size FROM entries GROUP BY digest)"
+        ).fetchone()[0]
+
+    def _drop_orphan(self, conn: sqlite3.Connection, digest: str) -> bool:
+        """Delete a blob once no key references it. Returns True if removed."""
+        still_used = conn.execute(
+            "SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)
+        ).fetchone()
+        if still_used:
+            return False
+        self._object_path(digest).unlink(missing_ok=True)
+        return True
@@ -0,0 +1,170 @@
+"""
+Selective decoding of SEC companyfacts documents.
+
+A companyfacts document nests taxonomy -> concept -> unit -> fact array.
+``CompanyFacts`` decodes only the taxonomy -> concept keys up front; every
+concept stays an undecoded slice of the payload until it is asked for.
+Fact arrays can then be decoded to dicts (``CompanyFacts.facts``) or, without
+any per-fact Python objects, straight into polars (``read_fact_array``, or
+``read_fact_arrays`` for many arrays in one read).
+
+Usage:
+    from life_agents.core.companyfacts import CompanyFacts, read_fact_array
+
+    company = CompanyFacts(payload)
+    revenue = read_fact_array(company.fact_array("Revenues"), schema)
+"""
+
+import io
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import msgspec
+import polars as pl
+
+
+class _CompanyFactsIndex(msgspec.Struct):
+    cik: Union[int, str, None] = None
+    entityName: Optional[str] = None
+    facts: Dict[str, Dict[str, msgspec.Raw]] = {}
+
+
+class _ConceptUnits(msgspec.Struct):
+    label: Optional[str] = None
+    description: Optional[str] = None
+    units: Dict[str, msgspec.Raw] = {}
+
+
+_INDEX_DECODER = msgspec.json.Decoder(_CompanyFactsIndex)
+_UNITS_DECODER = msgspec.json.Decoder(_ConceptUnits)
+_FACTS_DECODER = msgspec.json.Decoder(List[dict])
+
+# Boundary between two flat fact objects inside a JSON array
+_FACT_BOUNDARY = re.compile(rb"\}\s*,\s*\{")
+
+
+def fact_array_ndjson(raw: msgspec.Raw) -> Tuple[bytes, int]:
+    """
+    Rewrite one JSON fact array as NDJSON.
+
+    Facts are flat objects, so "},{" only ever separates two facts.
+
+    Returns:
+        (NDJSON body, number of facts); (b"", 0) for an empty array
+    """
+    body = bytes(raw).strip()[1:-1].strip()
+    if not body:
+        return b"", 0
+    body, boundaries = _FACT_BOUNDARY.subn(b"}\n{", body)
+    return body, boundaries + 1
+
+
+def read_fact_array(raw: msgspec.Raw, schema: Dict[str, pl.DataType]) -> pl.DataFrame:
+    """Decode one fact array in polars without creating Python objects per fact."""
+    body, count = fact_array_ndjson(raw)
+    if not count:
+        return pl.DataFrame(schema=schema)
+    return pl.read_ndjson(io.BytesIO(body), schema=schema)
+
+
+def read_fact_arrays(raws: Iterable[msgspec.Raw], schema: Dict[str, pl.DataType]) -> Tuple[pl.DataFrame, List[int]]:
+    """
+    Decode several fact arrays in one polars read.
+
+    Returns:
+        (facts of every array, in order; number of facts of each array)
+    """
+    bodies, counts = [], []
+    for raw in raws:
+        body, count = fact_array_ndjson(raw)
+        counts.append(count)
+        if count:
+            bodies.append(body)
+    if not bodies:
+        return pl.DataFrame(schema=schema), counts
+    return pl.read_ndjson(io.BytesIO(b"\n".join(bodies)), schema=schema), counts
+
+
+class CompanyFacts:
+    """
+    Selectively decoded companyfacts document.
+
+    Pulling a few concepts out of a large filer's document costs a fraction
+    of the time and memory of ``json.loads`` on the whole thing.
+
+    Args:
+        payload: Raw companyfacts JSON bytes
+    """
+
+    def __init__(self, payload: bytes):
+        document = _INDEX_DECODER.decode(payload)
+        self.cik = document.cik
+        self.entity_name = document.entityName
+        self._facts = document.facts
+
+    def taxonomies(self) -> List[str]:
+        """Taxonomies reported by the company (e.g. 'dei', 'us-gaap')."""
+        return list(self._facts)
+
+    def concepts(self, taxonomy: str = "us-gaap") -> List[str]:
+        """Concept tags reported under ``taxonomy``."""
+        return list(self._facts.get(taxonomy, {}))
+
+    def units(self, concept: str, taxonomy: str = "us-gaap") -> List[str]:
+        """Units ``concept`` is reported in (empty if not reported)."""
+        return list(self._concept(concept, taxonomy).units)
+
+    def fact_array(self, concept: str, taxonomy: str = "us-gaap", units: str = "USD") -> Optional[msgspec.Raw]:
+        """Undecoded fact array of one concept and unit (None if not reported)."""
+        return self._concept(concept, taxonomy).units.get(units)
+
+    def fact_arrays(self) -> Iterator[Tuple[str, str, str, msgspec.Raw]]:
+        """(taxonomy, concept, unit, undecoded fact array) for every array in the document."""
+        for taxonomy, concepts in self._facts.items():
+            for concept, raw in concepts.items():
+                for unit, array in _UNITS_DECODER.decode(raw).units.items():
+                    yield taxonomy, concept, unit, array
+
+    def facts(self, concept: str, taxonomy: str = "us-gaap", units: str = "USD") -> List[dict]:
+        """Fact dicts for one concept and unit (empty if not reported)."""
+        raw = self.fact_array(concept, taxonomy, units)
+        return _FACTS_DECODER.decode(raw) if raw is not None else []
+
+    def select(
+        self,
+        concepts: Iterable[str],
+        taxonomy: str = "us-gaap",
+        units: Optional[Iterable[str]] = None,
+    ) -> dict:
+        """
+        Companyfacts-shaped dict holding only the requested concepts and units.
+
+        Args:
+            concepts: Concept tags to keep
+            taxonomy: Taxonomy the tags belong to
+            units: Units to keep (default: all units of each concept)
+
+        Returns:
+            ``{"cik", "entityName", "facts": {taxonomy: {concept: {"label", "description", "units"}}}}``
+        """
+        wanted_units = set(units) if units is not None else None
+        selected = {}
+        for concept in concepts:
+            raw = self._facts.get(taxonomy, {}).get(concept)
+            if raw is None:
+                continue
+            data = _UNITS_DECODER.decode(raw)
+            selected[concept] = {
+                "label": data.label,
+                "description": data.description,
+                "units": {
+                    unit: _FACTS_DECODER.decode(rows)
+                    for unit, rows in data.units.items()
+                    if wanted_units is None or unit in wanted_units
+                },
+            }
+        return {"cik": self.cik, "entityName": self.entity_name, "facts": {taxonomy: selected}}
+
+    def _concept(self, concept: str, taxonomy: str) -> _ConceptUnits:
+        raw = self._facts.get(taxonomy, {}).get(concept)
+        return _UNITS_DECODER.decode(raw) if raw is not None else _ConceptUnits()
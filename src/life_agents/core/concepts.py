@@ -0,0 +1,700 @@
+"""
+XBRL concept registry and compiled multi-company concept resolver.
+
+``ALL_CONCEPTS`` maps each human-readable metric to the XBRL tags companies use
+for it, in priority order. ``ConceptResolver`` compiles that registry into a
+tag table and, per company, a cached resolution plan recording which tag (and
+unit) wins over each span of period ends. Stitching any number of concepts for
+a company is then a single join over its flattened facts (see
+``life_agents.core.facts_store``).
+
+Usage:
+    from life_agents.core.concepts import get_concept_resolver
+
+    resolver = get_concept_resolver()
+    history = resolver.stitch(["SHOP", "MSFT"], ["revenue", "net_income"])
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional
+
+import polars as pl
+
+from .facts_store import FACT_SCHEMA
+
+# =============================================================================
+# CONCEPT MAPPINGS: The Rosetta Stone for XBRL
+# =============================================================================
+
+@dataclass
+class ConceptMapping:
+    """Maps a human-readable metric to its possible XBRL tags"""
+    display_name: str           # What you'd call it (e.g., "Revenue")
+    description: str            # What it means
+    primary_tag: str            # Most common XBRL tag
+    alternate_tags: List[str]   # Other tags companies might use
+    statement: str              # Which statement it appears on
+
+    @property
+    def tags(self) -> List[str]:
+        """All XBRL tags for this metric, in priority order (empty if derived)."""
+        return [tag for tag in [self.primary_tag, *self.alternate_tags] if tag]
+
+
+# -----------------------------------------------------------------------------
+# INCOME STATEMENT CONCEPTS
+# -----------------------------------------------------------------------------
+
+INCOME_STATEMENT_CONCEPTS = {
+    # Revenue / Top Line
+    "revenue": ConceptMapping(
+        display_name="Revenue",
+        description="Total revenue from all sources",
+        primary_tag="Revenues",
+        alternate_tags=[
+            "RevenueFromContractWithCustomerExcludingAssessedTax",
+            "RevenueFromContractWithCustomerIncludingAssessedTax",
+            "SalesRevenueNet",
+            "SalesRevenueGoodsNet",
+            "SalesRevenueServicesNet",
+            "TotalRevenuesAndOtherIncome",
+            "RevenuesNetOfInterestExpense",  # Banks
+        ],
+        statement="income_statement"
+    ),
+
+    # Cost of Revenue
+    "cost_of_revenue": ConceptMapping(
+        display_name="Cost of Revenue",
+        description="Direct costs of producing goods/services sold",
+        primary_tag="CostOfRevenue",
+        alternate_tags=[
+            "CostOfGoodsAndServicesSold",
+            "CostOfGoodsSold",
+            "CostOfServices",
+        ],
+        statement="income_statement"
+    ),
+
+    # Gross Profit
+    "gross_profit": ConceptMapping(
+        display_name="Gross Profit",
+        description="Revenue minus cost of revenue",
+        primary_tag="GrossProfit",
+        alternate_tags=[],
+        statement="income_statement"
+    ),
+
+    # Operating Expenses
+    "operating_expenses": ConceptMapping(
+        display_name="Operating Expenses",
+        description="Total operating expenses (R&D, SG&A, etc.)",
+        primary_tag="OperatingExpenses",
+        alternate_tags=[
+            "CostsAndExpenses",
+            "OperatingCostsAndExpenses",
+        ],
+        statement="income_statement"
+    ),
+
+    "research_and_development": ConceptMapping(
+        display_name="R&D Expense",
+        description="Research and development costs",
+        primary_tag="ResearchAndDevelopmentExpense",
+        alternate_tags=[
+            "ResearchAndDevelopmentExpenseExcludingAcquiredInProcessCost",
+        ],
+        statement="income_statement"
+    ),
+
+    "sga_expense": ConceptMapping(
+        display_name="SG&A Expense",
+        description="Selling, general & administrative expenses",
+        primary_tag="SellingGeneralAndAdministrativeExpense",
+        alternate_tags=[
+            "SellingAndMarketingExpense",
+            "GeneralAndAdministrativeExpense",
+        ],
+        statement="income_statement"
+    ),
+
+    # Operating Income
+    "operating_income": ConceptMapping(
+        display_name="Operating Income",
+        description="Profit from core operations (EBIT proxy)",
+        primary_tag="OperatingIncomeLoss",
+        alternate_tags=[
+            "IncomeLossFromContinuingOperationsBeforeIncomeTaxesExtraordinaryItemsNoncontrollingInterest",
+        ],
+        statement="income_statement"
+    ),
+
+    # Net Income
+    "net_income": ConceptMapping(
+        display_name="Net Income",
+        description="Bottom line profit attributable to shareholders",
+        primary_tag="NetIncomeLoss",
+        alternate_tags=[
+            "NetIncomeLossAvailableToCommonStockholdersBasic",
+            "NetIncomeLossAttributableToParent",
+            "ProfitLoss",
+        ],
+        statement="income_statement"
+    ),
+
+    # EPS
+    "eps_basic": ConceptMapping(
+        display_name="EPS (Basic)",
+        description="Earnings per share - basic",
+        primary_tag="EarningsPerShareBasic",
+        alternate_tags=[],
+        statement="income_statement"
+    ),
+
+    "eps_diluted": ConceptMapping(
+        display_name="EPS (Diluted)",
+        description="Earnings per share - diluted",
+        primary_tag="EarningsPerShareDiluted",
+        alternate_tags=[],
+        statement="income_statement"
+    ),
+
+    # Shares Outstanding
+    "shares_outstanding": ConceptMapping(
+        display_name="Shares Outstanding",
+        description="Weighted average shares outstanding",
+        primary_tag="WeightedAverageNumberOfSharesOutstandingBasic",
+        alternate_tags=[
+            "CommonStockSharesOutstanding",
+            "WeightedAverageNumberOfDilutedSharesOutstanding",
+        ],
+        statement="income_statement"
+    ),
+}
+
+
+# -----------------------------------------------------------------------------
+# BALANCE SHEET CONCEPTS
+# -----------------------------------------------------------------------------
+
+BALANCE_SHEET_CONCEPTS = {
+    # Assets
+    "total_assets": ConceptMapping(
+        display_name="Total Assets",
+        description="Sum of all assets",
+        primary_tag="Assets",
+        alternate_tags=[],
+        statement="balance_sheet"
+    ),
+
+    "current_assets": ConceptMapping(
+        display_name="Current Assets",
+        description="Assets expected to convert to cash within 1 year",
+        primary_tag="AssetsCurrent",
+        alternate_tags=[],
+        statement="balance_sheet"
+    ),
+
+    "cash": ConceptMapping(
+        display_name="Cash & Equivalents",
+        description="Cash and cash equivalents",
+        primary_tag="CashAndCashEquivalentsAtCarryingValue",
+        alternate_tags=[
+            "Cash",
+            "CashCashEquivalentsRestrictedCashAndRestrictedCashEquivalents",
+        ],
+        statement="balance_sheet"
+    ),
+
+    "short_term_investments": ConceptMapping(
+        display_name="Short-Term Investments",
+        description="Marketable securities and short-term investments",
+        primary_tag="ShortTermInvestments",
+        alternate_tags=[
+            "MarketableSecuritiesCurrent",
+            "AvailableForSaleSecuritiesDebtSecuritiesCurrent",
+        ],
+        statement="balance_sheet"
+    ),
+
+    "accounts_receivable": ConceptMapping(
+        display_name="Accounts Receivable",
+        description="Money owed by customers",
+        primary_tag="AccountsReceivableNetCurrent",
+        alternate_tags=[
+            "AccountsReceivableNet",
+            "ReceivablesNetCurrent",
+        ],
+        statement="balance_sheet"
+    ),
+
+    "inventory": ConceptMapping(
+        display_name="Inventory",
+        description="Goods held for sale",
+        primary_tag="InventoryNet",
+        alternate_tags=[
+            "Inventory",
+            "InventoryFinishedGoods",
+        ],
+        statement="balance_sheet"
+    ),
+
+    "property_plant_equipment": ConceptMapping(
+        display_name="PP&E (Net)",
+        description="Property, plant & equipment net of depreciation",
+        primary_tag="PropertyPlantAndEquipmentNet",
+        alternate_tags=[],
+        statement="balance_sheet"
+    ),
+
+    "goodwill": ConceptMapping(
+        display_name="Goodwill",
+        description="Premium paid in acquisitions over fair value",
+        primary_tag="Goodwill",
+        alternate_tags=[],
+        statement="balance_sheet"
+    ),
+
+    "intangible_assets": ConceptMapping(
+        display_name="Intangible Assets",
+        description="Non-physical assets (patents, trademarks, etc.)",
+        primary_tag="IntangibleAssetsNetExcludingGoodwill",
+        alternate_tags=[
+            "FiniteLivedIntangibleAssetsNet",
+        ],
+        statement="balance_sheet"
+    ),
+
+    # Liabilities
+    "total_liabilities": ConceptMapping(
+        display_name="Total Liabilities",
+        description="Sum of all liabilities",
+        primary_tag="Liabilities",
+        alternate_tags=[],
+        statement="balance_sheet"
+    ),
+
+    "current_liabilities": ConceptMapping(
+        display_name="Current Liabilities",
+        description="Obligations due within 1 year",
+        primary_tag="LiabilitiesCurrent",
+        alternate_tags=[],
+        statement="balance_sheet"
+    ),
+
+    "accounts_payable": ConceptMapping(
+        display_name="Accounts Payable",
+        description="Money owed to suppliers",
+        primary_tag="AccountsPayableCurrent",
+        alternate_tags=[
+            "AccountsPayableAndAccruedLiabilitiesCurrent",
+        ],
+        statement="balance_sheet"
+    ),
+
+    "long_term_debt": ConceptMapping(
+        display_name="Long-Term Debt",
+        description="Debt obligations due after 1 year",
+        primary_tag="LongTermDebtNoncurrent",
+        alternate_tags=[
+            "LongTermDebt",
+            "LongTermDebtAndCapitalLeaseObligations",
+        ],
+        statement="balance_sheet"
+    ),
+
+    "total_debt": ConceptMapping(
+        display_name="Total Debt",
+        description="All debt (short + long term)",
+        primary_tag="DebtLongtermAndShorttermCombinedAmount",
+        alternate_tags=[
+            "LongTermDebtAndCapitalLeaseObligations",
+        ],
+        statement="balance_sheet"
+    ),
+
+    # Equity
+    "total_equity": ConceptMapping(
+        display_name="Total Equity",
+        description="Shareholders' equity (book value)",
+        primary_tag="StockholdersEquity",
+        alternate_tags=[
+            "StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest",
+            "Equity",
+        ],
+        statement="balance_sheet"
+    ),
+
+    "retained_earnings": ConceptMapping(
+        display_name="Retained Earnings",
+        description="Accumulated profits not paid as dividends",
+        primary_tag="RetainedEarningsAccumulatedDeficit",
+        alternate_tags=[],
+        statement="balance_sheet"
+    ),
+}
+
+
+# -----------------------------------------------------------------------------
+# CASH FLOW STATEMENT CONCEPTS
+# -----------------------------------------------------------------------------
+
+CASH_FLOW_CONCEPTS = {
+    # Operating Activities
+    "operating_cash_flow": ConceptMapping(
+        display_name="Operating Cash Flow",
+        description="Cash generated from core business operations",
+        primary_tag="NetCashProvidedByUsedInOperatingActivities",
+        alternate_tags=[],
+        statement="cash_flow"
+    ),
+
+    "depreciation_amortization": ConceptMapping(
+        display_name="D&A",
+        description="Depreciation and amortization (non-cash)",
+        primary_tag="DepreciationDepletionAndAmortization",
+        alternate_tags=[
+            "DepreciationAndAmortization",
+            "Depreciation",
+        ],
+        statement="cash_flow"
+    ),
+
+    "stock_based_compensation": ConceptMapping(
+        display_name="Stock-Based Comp",
+        description="Non-cash compensation expense",
+        primary_tag="ShareBasedCompensation",
+        alternate_tags=[
+            "StockIssuedDuringPeriodValueShareBasedCompensation",
+            "AllocatedShareBasedCompensationExpense",
+        ],
+        statement="cash_flow"
+    ),
+
+    # Investing Activities
+    "investing_cash_flow": ConceptMapping(
+        display_name="Investing Cash Flow",
+        description="Cash used for investments (CapEx, acquisitions)",
+        primary_tag="NetCashProvidedByUsedInInvestingActivities",
+        alternate_tags=[],
+        statement="cash_flow"
+    ),
+
+    "capex": ConceptMapping(
+        display_name="Capital Expenditures",
+        description="Cash spent on property, plant & equipment",
+        primary_tag="PaymentsToAcquirePropertyPlantAndEquipment",
+        alternate_tags=[
+            "CapitalExpendituresIncurredButNotYetPaid",
+        ],
+        statement="cash_flow"
+    ),
+
+    "acquisitions": ConceptMapping(
+        display_name="Acquisitions",
+        description="Cash spent acquiring businesses",
+        primary_tag="PaymentsToAcquireBusinessesNetOfCashAcquired",
+        alternate_tags=[
+            "PaymentsToAcquireBusinessesGross",
+        ],
+        statement="cash_flow"
+    ),
+
+    # Financing Activities
+    "financing_cash_flow": ConceptMapping(
+        display_name="Financing Cash Flow",
+        description="Cash from/to shareholders and creditors",
+        primary_tag="NetCashProvidedByUsedInFinancingActivities",
+        alternate_tags=[],
+        statement="cash_flow"
+    ),
+
+    "dividends_paid": ConceptMapping(
+        display_name="Dividends Paid",
+        description="Cash dividends paid to shareholders",
+        primary_tag="PaymentsOfDividendsCommonStock",
+        alternate_tags=[
+            "PaymentsOfDividends",
+            "DividendsCash",
+        ],
+        statement="cash_flow"
+    ),
+
+    "share_repurchases": ConceptMapping(
+        display_name="Share Repurchases",
+        description="Cash spent buying back stock",
+        primary_tag="PaymentsForRepurchaseOfCommonStock",
+        alternate_tags=[
+            "PaymentsForRepurchaseOfEquity",
+        ],
+        statement="cash_flow"
+    ),
+
+    # Free Cash Flow (derived, not a direct XBRL tag)
+    "free_cash_flow": ConceptMapping(
+        display_name="Free Cash Flow",
+        description="Operating cash flow minus CapEx (calculated)",
+        primary_tag="",  # Not a direct tag - must calculate
+        alternate_tags=[],
+        statement="cash_flow"
+    ),
+}
+
+
+# Combine all concepts for easy lookup
+ALL_CONCEPTS = {
+    **INCOME_STATEMENT_CONCEPTS,
+    **BALANCE_SHEET_CONCEPTS,
+    **CASH_FLOW_CONCEPTS,
+}
+
+
+
+# =============================================================================
+# COMPILED RESOLVER
+# =============================================================================
+
+# Units tried for each tag, most preferred first
+UNIT_PRIORITY = ["USD", "USD/shares", "pure", "shares"]
+
+# Columns of a stitched concept history
+RESOLVED_COLUMNS = [
+    "cik", "metric", "end", "start", "val", "xbrl_tag", "unit",
+    "fy", "fp", "form", "filed", "accn",
+]
+
+
+def empty_resolved_frame() -> pl.DataFrame:
+    """Zero-row frame with the RESOLVED_COLUMNS schema."""
+    dtypes = {**FACT_SCHEMA, "metric": pl.String, "xbrl_tag": pl.String}
+    return pl.DataFrame(schema={column: dtypes[column] for column in RESOLVED_COLUMNS})
+
+
+def _period_filter(quarterly: bool) -> pl.Expr:
+    """Durations of ~3 months (quarterly) or ~1 year (annual); instants always
+    count as quarterly and as annual when reported for a fiscal year."""
+    days = (pl.col("end") - pl.col("start")).dt.total_days()
+    if quarterly:
+        return pl.col("start").is_null() | (days < 120)
+    return (pl.col("start").is_null() & (pl.col("fp") == "FY")) | (days > 300)
+
+
+class ConceptResolver:
+    """
+    Tag-fallback resolution for many concepts across many companies.
+
+    The registry is compiled once into a (tag -> metric, priority) table. For
+    each company a resolution plan is computed on first use and cached: for
+    every metric, the runs of consecutive period ends won by one (tag, unit),
+    with the first and last end of each run. Later resolutions just join the
+    company's facts to the plan and keep the latest filing per period (ties
+    broken by the later accession number).
+
+    Args:
+        concepts: Metric key -> ConceptMapping (defaults to ALL_CONCEPTS)
+        taxonomy: Taxonomy the tags belong to
+    """
+
+    def __init__(
+        self,
+        concepts: Optional[Mapping[str, ConceptMapping]] = None,
+        taxonomy: str = "us-gaap",
+    ):
+        self.concepts = dict(ALL_CONCEPTS if concepts is None else concepts)
+        self.taxonomy = taxonomy
+        self.tag_table = pl.DataFrame(
+            [
+                (metric, tag, priority)
+                for metric, mapping in self.concepts.items()
+                for priority, tag in enumerate(mapping.tags)
+            ],
+            schema={"metric": pl.String, "concept": pl.String, "tag_priority": pl.Int32},
+            orient="row",
+        )
+        self._plans: Dict[Hashable, pl.DataFrame] = {}
+
+    @property
+    def tags(self) -> List[str]:
+        """Every tag referenced by the registry."""
+        return self.tag_table["concept"].unique(maintain_order=True).to_list()
+
+    def _candidates(self, facts: pl.LazyFrame, quarterly: bool) -> pl.LazyFrame:
+        """Facts for any registry tag, labelled with metric and tag/unit priority."""
+        return (
+            facts.filter(pl.col("taxonomy") == self.taxonomy, _period_filter(quarterly))
+            .join(self.tag_table.lazy(), on="concept", how="inner")
+            .with_columns(
+                pl.col("unit").replace_strict(
+                    UNIT_PRIORITY, list(range(len(UNIT_PRIORITY))), default=None,
+                    return_dtype=pl.Int32,
+                ).alias("unit_priority")
+            )
+            .filter(pl.col("unit_priority").is_not_null())
+        )
+
+    def compile_plan(self, facts: pl.DataFrame, quarterly: bool = True) -> pl.DataFrame:
+        """
+        Compute one company's resolution plan.
+
+        Args:
+            facts: The company's flattened facts (FACT_SCHEMA columns)
+            quarterly: Resolve quarterly (True) or annual (False) periods
+
+        Returns:
+            DataFrame of (metric, xbrl_tag, unit, first_end, last_end, periods)
+        """
+        return (
+            self._candidates(facts.lazy(), quarterly)
+            .sort(
+                ["metric", "end", "tag_priority", "unit_priority", "filed", "accn"],
+                descending=[False, False, False, False, True, True],
+                nulls_last=True,
+            )
+            .unique(subset=["metric", "end"], keep="first", maintain_order=True)
+            .with_columns(
+                pl.struct("concept", "unit").rle_id().over("metric").alias("run")
+            )
+            .group_by("metric", "run", maintain_order=True)
+            .agg(
+                pl.col("concept").first().alias("xbrl_tag"),
+                pl.col("unit").first(),
+                pl.col("end").min().alias("first_end"),
+                pl.col("end").max().alias("last_end"),
+                pl.len().alias("periods"),
+            )
+            .drop("run")
+            .collect()
+        )
+
+    def plan(
+        self,
+        facts: pl.DataFrame,
+        quarterly: bool = True,
+        key: Optional[Hashable] = None,
+    ) -> pl.DataFrame:
+        """
+        Cached resolution plan for one company.
+
+        Args:
+            facts: The company's flattened facts
+            quarterly: Resolve quarterly (True) or annual (False) periods
+            key: Identifies this version of the facts (e.g. cik plus partition
+                mtime); defaults to the cik, row count and latest filing date
+
+        Returns:
+            The plan from ``compile_plan``
+        """
+        if key is None:
+            key = (
+                facts["cik"][0] if facts.height else None,
+                facts.height,
+                facts["filed"].max() if facts.height else None,
+            )
+        cache_key = (key, quarterly)
+        if cache_key not in self._plans:
+            self._plans[cache_key] = self.compile_plan(facts, quarterly)
+        return self._plans[cache_key]
+
+    def resolve(
+        self,
+        facts: pl.DataFrame,
+        metrics: Optional[Iterable[str]] = None,
+        quarterly: bool = True,
+        key: Optional[Hashable] = None,
+    ) -> pl.DataFrame:
+        """
+        Stitch the history of several metrics for one company in a single pass.
+
+        Args:
+            facts: The company's flattened facts
+            metrics: Registry keys to return (default: all)
+            quarterly: Resolve quarterly (True) or annual (False) periods
+            key: Facts version key, see ``plan``
+
+        Returns:
+            Long DataFrame with RESOLVED_COLUMNS, one row per (metric, end)
+        """
+        plan = self.plan(facts, quarterly, key)
+        if metrics is not None:
+            plan = plan.filter(pl.col("metric").is_in(list(metrics)))
+
+        return (
+            facts.lazy()
+            .filter(_period_filter(quarterly))
+            .join(
+                plan.lazy(),
+                left_on=["concept", "unit"],
+                right_on=["xbrl_tag", "unit"],
+                how="inner",
+            )
+            .filter(pl.col("end").is_between(pl.col("first_end"), pl.col("last_end")))
+            .rename({"concept": "xbrl_tag"})
+            .sort(["metric", "end", "filed", "accn"], descending=[False, True, True, True], nulls_last=True)
+            .unique(subset=["metric", "end"], keep="first", maintain_order=True)
+            .select(RESOLVED_COLUMNS)
+            .collect()
+        )
+
+    def stitch(
+        self,
+        tickers_or_ciks: Iterable[str],
+        metrics: Optional[Iterable[str]] = None,
+        quarterly: bool = True,
+        store=None,
+    ) -> pl.DataFrame:
+        """
+        Stitch metrics for many companies from the local facts store.
+
+        All partitions are read in one scan (only the registry's tags), and
+        each company's plan is reused until its partition is rewritten.
+
+        Args:
+            tickers_or_ciks: Tickers ('SHOP') or CIKs; ingest them into the
+                store first (FactsStore.ingest)
+            metrics: Registry keys to return (default: all)
+            quarterly: Resolve quarterly (True) or annual (False) periods
+            store: FactsStore to read from (defaults to the standard location)
+
+        Returns:
+            Long DataFrame with RESOLVED_COLUMNS for every company
+        """
+        from .facts_store import FactsStore
+        from .utils import get_cik_from_ticker
+
+        store = store if store is not None else FactsStore()
+        metrics = list(metrics) if metrics is not None else None
+        tags = self.tags if metrics is None else [
+            tag for m in metrics for tag in self.concepts[m].tags
+        ]
+
+        versions = {}
+        for item in tickers_or_ciks:
+            cik = str(item).zfill(10) if str(item).isdigit() else get_cik_from_ticker(item)
+            path = store.partition_path(cik) if cik else None
+            if path is None or not path.exists():
+                print(f"No stored SEC facts for {item}")
+                continue
+            versions[cik] = path.stat().st_mtime_ns
+
+        # One scan over every requested partition, then one pass per company
+        facts = store.query(ciks=list(versions), concepts=tags, taxonomy=self.taxonomy).collect()
+        by_cik = facts.partition_by("cik", as_dict=True) if versions else {}
+        frames = [
+            self.resolve(company, metrics, quarterly, key=(cik, versions[cik], tuple(tags)))
+            for (cik,), company in by_cik.items()
+        ]
+
+        if not frames:
+            return empty_resolved_frame()
+        return pl.concat(frames)
+
+    def clear(self) -> None:
+        """Drop every cached plan."""
+        self._plans.clear()
+
+
+@lru_cache(maxsize=1)
+def get_concept_resolver() -> ConceptResolver:
+    """Shared ConceptResolver over ALL_CONCEPTS for the current process."""
+    return ConceptResolver()
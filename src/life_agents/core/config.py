@@ -20,4 +20,31 @@ class Settings(BaseSettings):
     FMP_API_KEY: str | None = None
     FRED_API_KEY: str | None = None
 
+    # HTTP (shared client in life_agents.core.http)
+    HTTP_MAX_RETRIES: int = 3
+    FMP_MAX_REQUESTS_PER_SECOND: float = 5.0  # 300 calls/minute on the starter plan
+    FRED_MAX_REQUESTS_PER_SECOND: float = 2.0  # FRED allows 120 requests/minute
+
+    # FMP response cache (DATA_DIR/cache/fmp, shared by all processes)
+    FMP_CACHE_TTL_HOURS: float = 6.0  # Serve cached responses without refetching for this long
+    FMP_CACHE_STALE_HOURS: float = 168.0  # Past the TTL, serve cached data and refresh in the background
+    FMP_CACHE_MAX_MB: int = 512  # Least-recently-used responses are evicted beyond this size
+
+    # SEC EDGAR
+    SEC_USER_AGENT: str = "life-agents bryan@example.com"  # SEC requires a contact User-Agent
+    SEC_MAX_REQUESTS_PER_SECOND: float = 10.0  # SEC fair-access limit, shared by all threads
+    SEC_CACHE_TTL_HOURS: float = 24.0  # Serve cached companyfacts without revalidating for this long
+    SEC_CACHE_MAX_MB: int = 2048  # Least-recently-used blobs are evicted beyond this size
+    SEC_TICKERS_REFRESH_HOURS: float = 168.0  # Re-check company_tickers.json weekly
+
+    # Redfin Data Center
+    REDFIN_MAX_AGE_HOURS: float = 168.0  # Redfin publishes weekly; reuse a local tracker copy this long
+
+    # FRED series store (DATA_DIR/fred)
+    FRED_MAX_AGE_HOURS: float = 12.0  # Don't ask FRED about a series checked this recently
+    FRED_REVISION_DAYS: int = 400  # Re-fetch this much recent history on update to pick up revisions
+
+    # Rendered charts (DATA_DIR/cache/charts, keyed on a hash of the plotted data)
+    CHART_CACHE_MAX_MB: int = 256  # Least-recently-used images are evicted beyond this size
+
 settings = Settings()
@@ -0,0 +1,454 @@
+"""
+Columnar local store for SEC XBRL company facts.
+
+Each company's ``companyfacts`` document is flattened once into one row per
+fact and written as a Hive-partitioned Parquet dataset::
+
+    DATA_DIR/sec/facts/cik=0001594805/facts.parquet
+
+Queries go through a polars ``LazyFrame``, so filters on cik prune whole
+partitions and filters on concept/unit/dates are pushed down to Parquet
+row-group statistics instead of re-parsing JSON.
+
+For cross-sectional screens the whole universe can be loaded offline from the
+SEC's nightly bulk ``companyfacts.zip`` (``FactsStore.ingest_bulk`` or
+``life sec bulk-ingest companyfacts.zip``).
+
+Usage:
+    from life_agents.core.facts_store import FactsStore
+
+    store = FactsStore()
+    store.ingest(["SHOP", "MSFT"])
+
+    revenue = store.query(
+        tickers=["SHOP", "MSFT"],
+        concepts=["Revenues"],
+        units="USD",
+        quarterly=True,
+    ).collect()
+"""
+
+import datetime as dt
+import io
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import polars as pl
+
+from .companyfacts import CompanyFacts, fact_array_ndjson
+from .config import settings
+
+# Columns of the flattened fact table (cik comes from the partition path)
+FACT_SCHEMA = {
+    "cik": pl.String,
+    "taxonomy": pl.String,
+    "concept": pl.String,
+    "unit": pl.String,
+    "start": pl.Date,
+    "end": pl.Date,
+    "val": pl.Float64,
+    "accn": pl.String,
+    "fy": pl.Int32,
+    "fp": pl.String,
+    "form": pl.String,
+    "filed": pl.Date,
+    "frame": pl.String,
+}
+
+# Raw JSON fields of one fact as published by the SEC
+_RAW_SCHEMA = {
+    "start": pl.String,
+    "end": pl.String,
+    "val": pl.Float64,
+    "accn": pl.String,
+    "fy": pl.Int32,
+    "fp": pl.String,
+    "form": pl.String,
+    "filed": pl.String,
+    "frame": pl.String,
+}
+
+StrOrList = Union[str, Iterable[str], None]
+
+
+def _as_list(value: StrOrList) -> Optional[List[str]]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+def _as_date(value) -> dt.date:
+    """Accept 'YYYY-MM-DD' strings, dates, datetimes and pandas Timestamps."""
+    if isinstance(value, dt.datetime):
+        return value.date()
+    if isinstance(value, dt.date):
+        return value
+    return dt.date.fromisoformat(str(value)[:10])
+
+
+def empty_facts_frame() -> pl.DataFrame:
+    """Zero-row frame with the fact table schema."""
+    return pl.DataFrame(schema=FACT_SCHEMA)
+
+
+def _label_facts(
+    raw: pl.DataFrame,
+    labels: List[Tuple[str, str, str]],
+    lengths: List[int],
+    cik: str,
+) -> pl.DataFrame:
+    """
+    Stamp decoded fact arrays with their labels and parse their dates.
+
+    Args:
+        raw: Facts of every array, in order (_RAW_SCHEMA columns)
+        labels: (taxonomy, concept, unit) of each array
+        lengths: Number of facts in each array
+        cik: CIK to stamp on the rows
+
+    Returns:
+        DataFrame with the FACT_SCHEMA columns
+    """
+    owner = pl.Series(np.repeat(np.arange(len(labels)), lengths))
+    taxonomies, concepts, units = (pl.Series(col, dtype=pl.String) for col in zip(*labels))
+
+    return raw.with_columns(
+        pl.lit(cik).alias("cik"),
+        taxonomies.gather(owner).alias("taxonomy"),
+        concepts.gather(owner).alias("concept"),
+        units.gather(owner).alias("unit"),
+        pl.col("start").str.to_date(strict=False),
+        pl.col("end").str.to_date(strict=False),
+        pl.col("filed").str.to_date(strict=False),
+    ).select(list(FACT_SCHEMA))
+
+
+def flatten_company_facts(facts: dict, cik: Optional[str] = None) -> pl.DataFrame:
+    """
+    Flatten a companyfacts document into one row per (taxonomy, concept, unit, fact).
+
+    All fact lists are decoded in a single ``pl.from_dicts`` call; the
+    taxonomy/concept/unit labels are attached by repeating one label per list
+    rather than copying them into every fact dict.
+
+    Args:
+        facts: Parsed companyfacts JSON
+        cik: CIK to stamp on the rows (defaults to the document's ``cik``)
+
+    Returns:
+        DataFrame with the FACT_SCHEMA columns
+    """
+    cik = str(cik if cik is not None else facts.get("cik", "")).zfill(10)
+
+    labels = []
+    lengths = []
+    lists = []
+    for taxonomy, concepts in facts.get("facts", {}).items():
+        for concept, concept_data in concepts.items():
+            for unit, rows in concept_data.get("units", {}).items():
+                if rows:
+                    labels.append((taxonomy, concept, unit))
+                    lengths.append(len(rows))
+                    lists.append(rows)
+
+    if not lists:
+        return empty_facts_frame()
+    return _label_facts(pl.from_dicts(chain.from_iterable(lists), schema=_RAW_SCHEMA), labels, lengths, cik)
+
+
+def flatten_company_facts_bytes(payload: bytes, cik: Optional[str] = None) -> pl.DataFrame:
+    """
+    Flatten a raw companyfacts document without building Python objects per fact.
+
+    msgspec locates each (taxonomy, concept, unit) fact array, the arrays are
+    rewritten as one NDJSON buffer and decoded by a single ``pl.read_ndjson``.
+    Same result as ``flatten_company_facts(json.loads(payload))``.
+
+    Args:
+        payload: companyfacts JSON bytes
+        cik: CIK to stamp on the rows (defaults to the document's ``cik``)
+
+    Returns:
+        DataFrame with the FACT_SCHEMA columns
+    """
+    document = CompanyFacts(payload)
+    cik = str(cik if cik is not None else document.cik or "").zfill(10)
+
+    labels = []
+    lengths = []
+    chunks = []
+    for taxonomy, concept, unit, array in document.fact_arrays():
+        body, count = fact_array_ndjson(array)
+        if not count:
+            continue
+        labels.append((taxonomy, concept, unit))
+        lengths.append(count)
+        chunks.append(body)
+
+    if not chunks:
+        return empty_facts_frame()
+    return _label_facts(pl.read_ndjson(io.BytesIO(b"\n".join(chunks)), schema=_RAW_SCHEMA), labels, lengths, cik)
+
+
+# Archive opened once per bulk-ingest worker process
+_bulk_archive: Optional[zipfile.ZipFile] = None
+
+
+def _open_bulk_archive(zip_path: str) -> None:
+    global _bulk_archive
+    _bulk_archive = zipfile.ZipFile(zip_path)
+
+
+def _ingest_bulk_member(name: str, root: str) -> Tuple[str, int, Optional[str]]:
+    """Parse one archive member and write its partition (runs in a worker process)."""
+    cik = Path(name).stem.removeprefix("CIK").zfill(10)
+    try:
+        frame = flatten_company_facts_bytes(_bulk_archive.read(name), cik)
+        store = FactsStore(Path(root))
+        if frame.height:
+            store.write_company(frame, cik)
+        else:
+            # No facts left for the company: drop the partition of an earlier ingest
+            store.partition_path(cik).unlink(missing_ok=True)
+        return cik, frame.height, None
+    except Exception as e:
+        return cik, 0, str(e)
+
+
+class FactsStore:
+    """
+    Hive-partitioned Parquet dataset of flattened XBRL facts, one partition per CIK.
+
+    Args:
+        root: Dataset directory (defaults to DATA_DIR/sec/facts)
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root is not None else settings.DATA_DIR / "sec" / "facts"
+
+    def partition_path(self, cik: str) -> Path:
+        """Parquet file holding every fact for ``cik``."""
+        return self.root / f"cik={str(cik).zfill(10)}" / "facts.parquet"
+
+    def ciks(self) -> List[str]:
+        """CIKs that currently have a partition."""
+        if not self.root.exists():
+            return []
+        return sorted(
+            p.parent.name.split("=", 1)[1]
+            for p in self.root.glob("cik=*/facts.parquet")
+        )
+
+    def write_company(self, facts: Union[dict, pl.DataFrame], cik: Optional[str] = None) -> Path:
+        """
+        Replace a company's partition with the given facts.
+
+        Args:
+            facts: companyfacts JSON document, or an already-flattened frame
+            cik: Company CIK (taken from the document when omitted)
+
+        Returns:
+            Path of the written Parquet file
+        """
+        if isinstance(facts, dict):
+            cik = cik if cik is not None else facts.get("cik")
+            frame = flatten_company_facts(facts, cik) if cik is not None else None
+        else:
+            frame = facts
+            if cik is None and frame.height:
+                cik = frame["cik"][0]
+        if cik is None:
+            raise ValueError("A CIK is required to write a facts partition")
+
+        path = self.partition_path(cik)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+
+        # Sorted so row-group statistics on concept/unit/end make pushdown effective;
+        # cik is not stored in the file, it comes from the partition directory
+        (
+            frame.drop("cik", strict=False)
+            .sort(["taxonomy", "concept", "unit", "end", "filed"])
+            .write_parquet(tmp, compression="zstd", statistics=True, row_group_size=50_000)
+        )
+        os.replace(tmp, path)
+        return path
+
+    def read_company(self, cik: str) -> pl.DataFrame:
+        """Every stored fact for ``cik`` (empty frame if it has no partition)."""
+        path = self.partition_path(cik)
+        if not path.exists():
+            return empty_facts_frame()
+        return pl.read_parquet(path).with_columns(
+            pl.lit(str(cik).zfill(10)).alias("cik")
+        ).select(list(FACT_SCHEMA))
+
+    def append_company(self, frame: pl.DataFrame, cik: str) -> Path:
+        """
+        Merge newly filed facts into a company's partition.
+
+        Stored rows from the same accession numbers are replaced, so re-applying
+        a filing is idempotent; every other stored fact is kept.
+
+        Args:
+            frame: Flattened facts (FACT_SCHEMA columns) from the new filings
+            cik: Company CIK
+
+        Returns:
+            Path of the written Parquet file
+        """
+        existing = self.read_company(cik)
+        if existing.height:
+            existing = existing.filter(~pl.col("accn").is_in(frame["accn"].unique().to_list()))
+        merged = pl.concat([existing, frame.select(list(FACT_SCHEMA))])
+        return self.write_company(merged, cik)
+
+    def ingest(self, tickers_or_ciks: Iterable[str], max_age: Optional[float] = None) -> List[Path]:
+        """
+        Fetch (through the SEC cache) and store facts for each ticker or CIK.
+
+        Args:
+            tickers_or_ciks: Tickers ('SHOP') or numeric CIKs ('1594805')
+            max_age: Override the companyfacts cache TTL in seconds
+
+        Returns:
+            Paths of the partitions written; failures are reported and skipped
+        """
+        from .utils import company_facts_url, fetch_sec_bytes, get_cik_from_ticker
+
+        written = []
+        for item in tickers_or_ciks:
+            cik = str(item).zfill(10) if str(item).isdigit() else get_cik_from_ticker(item)
+            if not cik:
+                print(f"Could not find CIK for ticker: {item}")
+                continue
+            try:
+                payload = fetch_sec_bytes(company_facts_url(cik), max_age=max_age)
+                written.append(self.write_company(flatten_company_facts_bytes(payload, cik), cik))
+            except Exception as e:
+                print(f"Error ingesting SEC facts for {item}: {e}")
+        return written
+
+    def ingest_bulk(
+        self,
+        zip_path: Union[str, Path],
+        ciks: Optional[Iterable[str]] = None,
+        max_workers: Optional[int] = None,
+        progress_every: int = 500,
+    ) -> pl.DataFrame:
+        """
+        Load the SEC's nightly bulk ``companyfacts.zip`` into the store.
+
+        Members are read one at a time straight from the archive by a pool of
+        worker processes, each of which writes its company's partition itself,
+        so memory stays bounded by a few companies per worker however large
+        the archive is. Existing partitions for those companies are replaced.
+
+        Args:
+            zip_path: Local path of companyfacts.zip
+            ciks: Only load these CIKs (default: every company in the archive)
+            max_workers: Worker processes (default: one per CPU)
+            progress_every: Print progress every this many companies (0 for silence)
+
+        Returns:
+            DataFrame of (cik, facts, error), one row per archive member processed
+        """
+        zip_path = str(zip_path)
+        with zipfile.ZipFile(zip_path) as archive:
+            names = [n for n in archive.namelist() if n.endswith(".json")]
+        if ciks is not None:
+            wanted = {str(c).zfill(10) for c in ciks}
+            names = [n for n in names if Path(n).stem.removeprefix("CIK").zfill(10) in wanted]
+
+        rows = []
+        # spawn, not fork: forking a process whose polars thread pool is live can deadlock
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_open_bulk_archive,
+            initargs=(zip_path,),
+        ) as executor:
+            results = executor.map(
+                _ingest_bulk_member, names, [str(self.root)] * len(names), chunksize=16
+            )
+            for i, row in enumerate(results, 1):
+                rows.append(row)
+                if progress_every and i % progress_every == 0:
+                    print(f"Ingested {i:,}/{len(names):,} companies")
+
+        return pl.DataFrame(
+            rows, schema={"cik": pl.String, "facts": pl.Int64, "error": pl.String}, orient="row"
+        )
+
+    def scan(self) -> pl.LazyFrame:
+        """Lazy scan over every partition (empty frame if nothing is stored yet)."""
+        if not self.ciks():
+            return empty_facts_frame().lazy()
+        return pl.scan_parquet(
+            self.root / "**" / "*.parquet",
+            hive_partitioning=True,
+            hive_schema={"cik": pl.String},
+        ).select(list(FACT_SCHEMA))
+
+    def query(
+        self,
+        ciks: StrOrList = None,
+        tickers: StrOrList = None,
+        concepts: StrOrList = None,
+        units: StrOrList = None,
+        taxonomy: StrOrList = "us-gaap",
+        forms: StrOrList = None,
+        start_date=None,
+        end_date=None,
+        quarterly: Optional[bool] = None,
+    ) -> pl.LazyFrame:
+        """
+        Filtered lazy view of the store; nothing is read until ``.collect()``.
+
+        Args:
+            ciks: Restrict to these CIKs (prunes partitions)
+            tickers: Restrict to these tickers (resolved to CIKs)
+            concepts: XBRL concept tags
+            units: Units (e.g. 'USD', 'shares')
+            taxonomy: Taxonomy namespace (None for all)
+            forms: Filing forms (e.g. ['10-Q', '10-K'])
+            start_date: Earliest period end to keep
+            end_date: Latest period end to keep
+            quarterly: True for ~3-month durations, False for ~annual durations,
+                None for everything (including instants)
+
+        Returns:
+            LazyFrame with the FACT_SCHEMA columns
+        """
+        wanted_ciks = [str(c).zfill(10) for c in _as_list(ciks) or []]
+        if tickers is not None:
+            from .tickers import get_ticker_index
+
+            index = get_ticker_index()
+            wanted_ciks += [c for c in (index.cik(t) for t in _as_list(tickers)) if c]
+
+        lf = self.scan()
+        if ciks is not None or tickers is not None:
+            lf = lf.filter(pl.col("cik").is_in(wanted_ciks))
+        for column, value in (
+            ("taxonomy", taxonomy), ("concept", concepts), ("unit", units), ("form", forms)
+        ):
+            values = _as_list(value)
+            if values is not None:
+                lf = lf.filter(pl.col(column).is_in(values))
+        if start_date is not None:
+            lf = lf.filter(pl.col("end") >= pl.lit(_as_date(start_date)))
+        if end_date is not None:
+            lf = lf.filter(pl.col("end") <= pl.lit(_as_date(end_date)))
+        if quarterly is not None:
+            days = (pl.col("end") - pl.col("start")).dt.total_days()
+            lf = lf.filter(days < 120 if quarterly else days > 300)
+        return lf
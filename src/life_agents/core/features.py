@@ -0,0 +1,303 @@
+"""
+Materialized growth and margin features for every company in the facts store.
+
+For each company the registry metrics (see ``life_agents.core.concepts``) are
+resolved over discrete quarters, with Q4 and YTD-only quarters derived (see
+``life_agents.core.quarters``), and keyed by calendar quarter (see
+``life_agents.core.fiscal_calendar``). Per (company, metric, quarter) the
+table holds the value plus QoQ/YoY growth, TTM sum, TTM YoY growth, 3-year
+CAGR and margin on revenue.
+
+Features are stored as one Parquet file per company and recomputed only for
+companies whose facts partition changed since, so dashboards read finished
+columns instead of recomputing them on every render.
+
+Usage:
+    from life_agents.core.features import get_feature_store
+
+    features = get_feature_store()
+    features.update()                                  # only stale companies
+    shop = features.wide("SHOP", ["revenue", "net_income"], ["val", "yoy_pct", "margin_pct"])
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+
+import polars as pl
+
+from .config import settings
+from .facts_store import FactsStore, StrOrList, _as_list
+from .fiscal_calendar import calendar_quarter_expr
+from .quarters import derive_quarters
+
+FEATURE_SCHEMA = {
+    "cik": pl.String,
+    "metric": pl.String,
+    "cal_quarter": pl.Int32,
+    "end": pl.Date,
+    "val": pl.Float64,
+    "unit": pl.String,
+    "xbrl_tag": pl.String,
+    "ttm": pl.Float64,
+    "qoq_pct": pl.Float64,
+    "yoy_pct": pl.Float64,
+    "ttm_yoy_pct": pl.Float64,
+    "cagr_3y_pct": pl.Float64,
+    "margin_pct": pl.Float64,
+}
+
+# Metrics computed from others: name -> (minuend, subtrahend)
+DERIVED_METRICS = {"free_cash_flow": ("operating_cash_flow", "capex")}
+
+# Denominator of margin_pct
+MARGIN_BASE = "revenue"
+
+_SERIES = ["cik", "metric"]
+
+
+def _growth_pct(new: pl.Expr, old: pl.Expr) -> pl.Expr:
+    """Percent change, as pandas pct_change (null when the base is zero or missing)."""
+    return pl.when(old != 0).then((new / old - 1) * 100)
+
+
+def compute_features(resolved: pl.DataFrame) -> pl.DataFrame:
+    """
+    Feature table from resolved quarterly metrics.
+
+    Args:
+        resolved: Long frame of (cik, metric, end, start, val, xbrl_tag, unit)
+            rows, e.g. from ConceptResolver.resolve over discrete quarters;
+            instants (null start) are balance-sheet levels without a TTM
+
+    Returns:
+        DataFrame with the FEATURE_SCHEMA columns
+    """
+    base = (
+        resolved.lazy()
+        .with_columns(
+            calendar_quarter_expr("end").alias("cal_quarter"),
+            pl.col("start").is_not_null().alias("_flow"),
+        )
+        .sort([*_SERIES, "cal_quarter", "end", "filed"], nulls_last=True)
+        .unique([*_SERIES, "cal_quarter"], keep="last", maintain_order=True)
+    )
+
+    for name, (minuend, subtrahend) in DERIVED_METRICS.items():
+        left = base.filter(pl.col("metric") == minuend)
+        right = base.filter(pl.col("metric") == subtrahend).select(
+            "cik", "cal_quarter", pl.col("val").alias("_subtrahend")
+        )
+        base = pl.concat([
+            base.filter(pl.col("metric") != name),
+            left.join(right, on=["cik", "cal_quarter"])
+            .with_columns(
+                pl.lit(name).alias("metric"),
+                (pl.col("val") - pl.col("_subtrahend")).alias("val"),
+                pl.lit(None, pl.String).alias("xbrl_tag"),
+            )
+            .drop("_subtrahend"),
+        ]).sort([*_SERIES, "cal_quarter"])
+
+    # TTM: four consecutive quarters of a flow metric
+    consecutive = (pl.col("cal_quarter") - pl.col("cal_quarter").shift(3).over(_SERIES)) == 3
+    base = base.with_columns(
+        pl.when(pl.col("_flow") & consecutive)
+        .then(pl.col("val").rolling_sum(4).over(_SERIES))
+        .alias("ttm")
+    )
+
+    def lagged(quarters: int, columns: Sequence[str]) -> pl.LazyFrame:
+        return base.select(
+            *_SERIES,
+            (pl.col("cal_quarter") + quarters).alias("cal_quarter"),
+            *(pl.col(c).alias(f"_{c}_{quarters}") for c in columns),
+        )
+
+    revenue = base.filter(pl.col("metric") == MARGIN_BASE).select(
+        "cik", "cal_quarter", pl.col("val").alias("_revenue")
+    )
+    level = pl.when(pl.col("_flow")).then(pl.col("ttm")).otherwise(pl.col("val"))
+    level_3y = pl.when(pl.col("_flow")).then(pl.col("_ttm_12")).otherwise(pl.col("_val_12"))
+
+    return (
+        base.join(lagged(1, ["val"]), on=[*_SERIES, "cal_quarter"], how="left")
+        .join(lagged(4, ["val", "ttm"]), on=[*_SERIES, "cal_quarter"], how="left")
+        .join(lagged(12, ["val", "ttm"]), on=[*_SERIES, "cal_quarter"], how="left")
+        .join(revenue, on=["cik", "cal_quarter"], how="left")
+        .with_columns(
+            _growth_pct(pl.col("val"), pl.col("_val_1")).alias("qoq_pct"),
+            _growth_pct(pl.col("val"), pl.col("_val_4")).alias("yoy_pct"),
+            _growth_pct(pl.col("ttm"), pl.col("_ttm_4")).alias("ttm_yoy_pct"),
+            pl.when((level > 0) & (level_3y > 0))
+            .then(((level / level_3y) ** (1 / 3) - 1) * 100)
+            .alias("cagr_3y_pct"),
+            pl.when(pl.col("_flow") & (pl.col("unit") == "USD") & (pl.col("_revenue") != 0))
+            .then(pl.col("val") / pl.col("_revenue") * 100)
+            .alias("margin_pct"),
+        )
+        .select([pl.col(c).cast(t) for c, t in FEATURE_SCHEMA.items()])
+        .sort([*_SERIES, "cal_quarter"])
+        .collect()
+    )
+
+
+class FeatureStore:
+    """
+    Per-company Parquet feature tables derived from a FactsStore.
+
+    Args:
+        store: Facts store to read (defaults to DATA_DIR/sec/facts)
+        root: Directory for the feature tables (defaults to DATA_DIR/sec/features)
+        concepts: Metric key -> ConceptMapping (defaults to ALL_CONCEPTS)
+    """
+
+    def __init__(self, store: Optional[FactsStore] = None, root: Optional[Path] = None, concepts=None):
+        self.store = store if store is not None else FactsStore()
+        self.root = Path(root) if root is not None else settings.DATA_DIR / "sec" / "features"
+        self.concepts = concepts
+
+    def partition_path(self, cik: str) -> Path:
+        """Parquet file holding the features for ``cik``."""
+        return self.root / f"cik={str(cik).zfill(10)}" / "features.parquet"
+
+    def stale(self, ciks: Optional[Iterable[str]] = None) -> List[str]:
+        """Companies whose facts changed after their features were computed."""
+        stale = []
+        for cik in (ciks if ciks is not None else self.store.ciks()):
+            cik = str(cik).zfill(10)
+            facts_path = self.store.partition_path(cik)
+            if not facts_path.exists():
+                continue
+            path = self.partition_path(cik)
+            if not path.exists() or path.stat().st_mtime_ns < facts_path.stat().st_mtime_ns:
+                stale.append(cik)
+        return stale
+
+    def compute(self, ciks: Iterable[str]) -> pl.DataFrame:
+        """
+        Compute features for the given companies from their stored facts.
+
+        Args:
+            ciks: Companies to compute
+
+        Returns:
+            DataFrame with the FEATURE_SCHEMA columns
+        """
+        from .concepts import ConceptResolver
+
+        # A private resolver so plans for a bulk rebuild are not kept around
+        resolver = ConceptResolver(self.concepts)
+        facts = self.store.query(
+            ciks=[str(c).zfill(10) for c in ciks], concepts=resolver.tags, taxonomy=resolver.taxonomy
+        ).collect()
+        # Instants pass through derive_quarters unchanged
+        facts = derive_quarters(facts, keys=("cik", "taxonomy", "concept", "unit")).drop("derived")
+
+        frames = [
+            resolver.resolve(company, quarterly=True, key=cik)
+            for (cik,), company in facts.partition_by("cik", as_dict=True).items()
+        ]
+        if not frames:
+            return pl.DataFrame(schema=FEATURE_SCHEMA)
+        return compute_features(pl.concat(frames))
+
+    def update(self, ciks: Optional[Iterable[str]] = None, batch_size: int = 200) -> List[str]:
+        """
+        Recompute features for companies whose facts changed.
+
+        Args:
+            ciks: Companies to consider (default: every company in the store)
+            batch_size: Companies computed per query
+
+        Returns:
+            CIKs whose feature tables were rewritten
+        """
+        stale = self.stale(ciks)
+        for i in range(0, len(stale), batch_size):
+            batch = stale[i:i + batch_size]
+            features = self.compute(batch)
+            by_cik = features.partition_by("cik", as_dict=True)
+            for cik in batch:
+                self._write(cik, by_cik.get((cik,), features.clear()))
+        return stale
+
+    def _write(self, cik: str, features: pl.DataFrame) -> None:
+        path = self.partition_path(cik)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        features.drop("cik").write_parquet(tmp, compression="zstd")
+        os.replace(tmp, path)
+
+    def scan(self) -> pl.LazyFrame:
+        """Lazy scan over every stored feature table."""
+        if not any(self.root.glob("cik=*/features.parquet")):
+            return pl.DataFrame(schema=FEATURE_SCHEMA).lazy()
+        return pl.scan_parquet(
+            self.root / "**" / "*.parquet",
+            hive_partitioning=True,
+            hive_schema={"cik": pl.String},
+        ).select(list(FEATURE_SCHEMA))
+
+    def query(
+        self,
+        ciks: StrOrList = None,
+        tickers: StrOrList = None,
+        metrics: StrOrList = None,
+    ) -> pl.LazyFrame:
+        """
+        Filtered lazy view of the stored features.
+
+        Args:
+            ciks: Restrict to these CIKs
+            tickers: Restrict to these tickers (resolved to CIKs)
+            metrics: Registry metric keys (e.g. 'revenue', 'free_cash_flow')
+
+        Returns:
+            LazyFrame with the FEATURE_SCHEMA columns
+        """
+        from .utils import get_cik_from_ticker
+
+        wanted = [str(c).zfill(10) for c in _as_list(ciks) or []]
+        wanted += [c for c in (get_cik_from_ticker(t) for t in _as_list(tickers) or []) if c]
+
+        lf = self.scan()
+        if ciks is not None or tickers is not None:
+            lf = lf.filter(pl.col("cik").is_in(wanted))
+        if metrics is not None:
+            lf = lf.filter(pl.col("metric").is_in(_as_list(metrics)))
+        return lf
+
+    def wide(
+        self,
+        ticker_or_cik: str,
+        metrics: StrOrList = None,
+        features: Sequence[str] = ("val", "qoq_pct", "yoy_pct", "margin_pct"),
+    ) -> pl.DataFrame:
+        """
+        One company's features as one row per calendar quarter.
+
+        Returns:
+            DataFrame with cal_quarter and ``{metric}_{feature}`` columns, newest first
+        """
+        key = {"ciks": ticker_or_cik} if str(ticker_or_cik).isdigit() else {"tickers": ticker_or_cik}
+        long = (
+            self.query(metrics=metrics, **key)
+            .select("metric", "cal_quarter", *features)
+            .unpivot(index=["metric", "cal_quarter"], on=list(features), variable_name="feature")
+            .with_columns(pl.format("{}_{}", "metric", "feature").alias("column"))
+            .collect()
+        )
+        if long.is_empty():
+            return pl.DataFrame(schema={"cal_quarter": pl.Int32})
+        return (
+            long.pivot(on="column", index="cal_quarter", values="value")
+            .sort("cal_quarter", descending=True)
+        )
+
+
+@lru_cache(maxsize=1)
+def get_feature_store() -> FeatureStore:
+    """Shared FeatureStore over the default facts store."""
+    return FeatureStore()
@@ -0,0 +1,250 @@
+"""
+Calendar-normalized fiscal periods.
+
+Every period is keyed by an integer calendar quarter, ``year * 4 + quarter - 1``,
+assigned from the calendar quarter end nearest its period end. Microsoft's
+fiscal Q4 (ending June 30) and Alphabet's Q2 therefore share a key, and so do
+52/53-week quarters ending a few days either side of a quarter end. Joining
+companies on this integer replaces parsing period strings and merging on
+exact dates.
+
+``FiscalCalendar`` precomputes, from the facts store, each company's fiscal
+(fy, fp) periods with their period end and calendar quarter, for data that is
+labelled by fiscal period rather than by date.
+
+Usage:
+    from life_agents.core.fiscal_calendar import calendar_quarter, get_fiscal_calendar
+
+    df["cal_quarter"] = calendar_quarter(df["end"])          # 8095 == 2023Q4
+    calendar = get_fiscal_calendar()
+    calendar.build()                                          # after syncing facts
+    msft = calendar.for_company("MSFT")                       # fy, fp -> cal_quarter
+"""
+
+import datetime as dt
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import pandas as pd
+import polars as pl
+
+from .config import settings
+
+# A period end belongs to the calendar quarter ending within this many days of it
+_NEAREST_QUARTER_DAYS = 45
+
+# Forms whose fiscal period labels describe the filing's own report period
+CALENDAR_FORMS = ["10-Q", "10-K", "20-F", "40-F"]
+
+FISCAL_PERIODS = {"Q1": 1, "Q2": 2, "Q3": 3, "Q4": 4, "FY": 4}
+
+CALENDAR_SCHEMA = {
+    "cik": pl.String,
+    "fy": pl.Int32,
+    "fp": pl.String,
+    "end": pl.Date,
+    "cal_quarter": pl.Int32,
+    "fiscal_quarter": pl.Int8,
+    "fy_end_month": pl.Int8,
+}
+
+
+def calendar_quarter_expr(column: Union[str, pl.Expr] = "end") -> pl.Expr:
+    """Polars expression mapping a period-end Date column to its calendar quarter key."""
+    shifted = (pl.col(column) if isinstance(column, str) else column) - pl.duration(days=_NEAREST_QUARTER_DAYS)
+    return (shifted.dt.year() * 4 + shifted.dt.quarter() - 1).cast(pl.Int32)
+
+
+def calendar_quarter(ends: Union[pd.Series, str, dt.date]) -> Union[pd.Series, int]:
+    """
+    Calendar quarter key for period end dates.
+
+    Args:
+        ends: A pandas Series of dates (or strings), or a single date
+
+    Returns:
+        Int Series aligned with ``ends`` (nullable), or an int for a single date
+    """
+    if isinstance(ends, pd.Series):
+        shifted = pd.to_datetime(ends) - pd.Timedelta(days=_NEAREST_QUARTER_DAYS)
+        return (shifted.dt.year * 4 + shifted.dt.quarter - 1).astype("Int32")
+    shifted = pd.Timestamp(ends) - pd.Timedelta(days=_NEAREST_QUARTER_DAYS)
+    return shifted.year * 4 + shifted.quarter - 1
+
+
+def parse_quarter_label(labels: pd.Series) -> pd.Series:
+    """
+    Calendar quarter keys from labels like '2025-Q3', '2025Q3' or 'Q3 2025'.
+
+    Returns:
+        Nullable Int Series (null where a label does not parse)
+    """
+    parts = labels.astype(str).str.extract(r"(?:(\d{4})\D*Q([1-4]))|(?:Q([1-4])\D*(\d{4}))")
+    year = pd.to_numeric(parts[0].fillna(parts[3]))
+    quarter = pd.to_numeric(parts[1].fillna(parts[2]))
+    return (year * 4 + quarter - 1).astype("Int32")
+
+
+def quarter_label(key: int) -> str:
+    """'2025Q3' for a calendar quarter key."""
+    return f"{key // 4}Q{key % 4 + 1}"
+
+
+def quarter_end(key: int) -> dt.date:
+    """Last day of a calendar quarter key."""
+    year, quarter = divmod(key, 4)
+    return (pd.Timestamp(year=year, month=quarter * 3 + 3, day=1) + pd.offsets.MonthEnd(0)).date()
+
+
+class FiscalCalendar:
+    """
+    Per-company fiscal calendar: (cik, fy, fp) -> period end and calendar quarter.
+
+    Built from the facts store: each 10-Q/10-K's report period is the most
+    common period end among its financial-statement facts (cover-page ``dei``
+    facts are dated after it), labelled with the filing's fy/fp.
+
+    Args:
+        store: Facts store to read (defaults to DATA_DIR/sec/facts)
+        path: Parquet file for the index (defaults to DATA_DIR/sec/fiscal_calendar.parquet)
+    """
+
+    def __init__(self, store=None, path: Optional[Path] = None):
+        from .facts_store import FactsStore
+
+        self.store = store if store is not None else FactsStore()
+        self.path = Path(path) if path is not None else settings.DATA_DIR / "sec" / "fiscal_calendar.parquet"
+        self._table: Optional[pl.DataFrame] = None
+
+    @property
+    def table(self) -> pl.DataFrame:
+        """The stored index (empty if never built)."""
+        if self._table is None:
+            self._table = (
+                pl.read_parquet(self.path) if self.path.exists() else pl.DataFrame(schema=CALENDAR_SCHEMA)
+            )
+        return self._table
+
+    def compute(self, ciks: Optional[Iterable[str]] = None) -> pl.DataFrame:
+        """
+        Derive fiscal calendars from stored facts without saving them.
+
+        Args:
+            ciks: Companies to compute (default: every company in the store)
+
+        Returns:
+            DataFrame with the CALENDAR_SCHEMA columns
+        """
+        lf = self.store.scan()
+        if ciks is not None:
+            lf = lf.filter(pl.col("cik").is_in([str(c).zfill(10) for c in ciks]))
+
+        periods = (
+            lf.filter(
+                pl.col("form").is_in(CALENDAR_FORMS)
+                & (pl.col("taxonomy") != "dei")
+                & pl.col("fp").is_in(list(FISCAL_PERIODS))
+                & pl.col("fy").is_not_null()
+            )
+            .group_by("cik", "accn")
+            .agg(
+                pl.col("fy").first(),
+                pl.col("fp").first(),
+                pl.col("end").mode().max(),
+                pl.col("filed").min(),
+            )
+            # Amended or duplicate filings: the first filing's report period wins
+            .sort("cik", "fy", "fp", "filed")
+            .unique(["cik", "fy", "fp"], keep="first", maintain_order=True)
+        )
+        fy_end_month = (
+            periods.filter(pl.col("fp") == "FY")
+            .group_by("cik")
+            .agg(pl.col("end").dt.month().mode().first().cast(pl.Int8).alias("fy_end_month"))
+        )
+        return (
+            periods.join(fy_end_month, on="cik", how="left")
+            .with_columns(
+                calendar_quarter_expr("end").alias("cal_quarter"),
+                pl.col("fp").replace_strict(FISCAL_PERIODS, return_dtype=pl.Int8).alias("fiscal_quarter"),
+            )
+            .select(list(CALENDAR_SCHEMA))
+            .sort("cik", "end")
+            .collect()
+        )
+
+    def build(self, ciks: Optional[Iterable[str]] = None) -> pl.DataFrame:
+        """
+        Recompute and save the index, for all companies or only the given ones.
+
+        Args:
+            ciks: Companies whose facts changed (default: rebuild everything)
+
+        Returns:
+            The full updated index
+        """
+        if ciks is None:
+            table = self.compute()
+        else:
+            ciks = [str(c).zfill(10) for c in ciks]
+            table = pl.concat([
+                self.table.filter(~pl.col("cik").is_in(ciks)),
+                self.compute(ciks),
+            ]).sort("cik", "end")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        table.write_parquet(tmp)
+        os.replace(tmp, self.path)
+        self._table = table
+        return table
+
+    def for_company(self, ticker_or_cik: str) -> pl.DataFrame:
+        """One company's fiscal periods, oldest first."""
+        from .utils import get_cik_from_ticker
+
+        cik = str(ticker_or_cik).zfill(10) if str(ticker_or_cik).isdigit() else get_cik_from_ticker(ticker_or_cik)
+        return self.table.filter(pl.col("cik") == cik)
+
+    def annotate(self, df: pl.DataFrame, by: str = "end") -> pl.DataFrame:
+        """
+        Add calendar quarter and fiscal labels to rows keyed by cik.
+
+        Args:
+            df: Frame with a cik column plus ``end`` (by='end') or ``fy``/``fp`` (by='fiscal')
+            by: 'end' computes cal_quarter from the period end and attaches the
+                company's fiscal fy/fp for that quarter as fiscal_year/fiscal_period;
+                'fiscal' looks up cal_quarter and the period end from fy/fp.
+                Fact rows should use 'end': their fy/fp describe the filing,
+                not the (possibly comparative) period.
+
+        Returns:
+            ``df`` with the added columns
+        """
+        if by == "fiscal":
+            return df.join(
+                self.table.select("cik", "fy", "fp", pl.col("end").alias("period_end"), "cal_quarter"),
+                on=["cik", "fy", "fp"],
+                how="left",
+            )
+        labels = (
+            self.table.filter(pl.col("fp") != "FY")
+            .select("cik", "cal_quarter", pl.col("fy").alias("fiscal_year"), pl.col("fp").alias("fiscal_period"))
+            .vstack(
+                # Q4 is only filed as the annual report
+                self.table.filter(pl.col("fp") == "FY")
+                .select("cik", "cal_quarter", pl.col("fy").alias("fiscal_year"), pl.lit("Q4").alias("fiscal_period"))
+            )
+            .unique(["cik", "cal_quarter"], keep="first", maintain_order=True)
+        )
+        return df.with_columns(calendar_quarter_expr("end").alias("cal_quarter")).join(
+            labels, on=["cik", "cal_quarter"], how="left"
+        )
+
+
+@lru_cache(maxsize=1)
+def get_fiscal_calendar() -> FiscalCalendar:
+    """Shared FiscalCalendar over the default facts store."""
+    return FiscalCalendar()
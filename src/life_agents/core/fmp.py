@@ -0,0 +1,357 @@
+"""
+Financial Modeling Prep (FMP) data access.
+
+``fetch_fmp_data`` fetches one endpoint; ``fetch_fmp_bundle`` fetches a set of
+independent endpoints for one ticker concurrently, so a dashboard's cold start
+costs about one round trip instead of one per statement.
+
+Usage:
+    from life_agents.core.fmp import fetch_fmp_bundle, QUARTERLY
+
+    bundle = fetch_fmp_bundle("SHOP", {
+        "income": ("income-statement", QUARTERLY),
+        "balance": ("balance-sheet-statement", QUARTERLY),
+        "price": ("historical-price-eod/full", None),
+    })
+    income_df = bundle["income"]
+
+Responses are kept in an on-disk cache shared by every process (see
+``FMP_CACHE_TTL_HOURS``). Past the TTL a cached response is still returned
+immediately while a background refresh replaces it, so a restarted dashboard
+renders from disk without spending API quota first.
+
+``CompanyBundles`` keeps the standard company bundle (``COMPANY_CALLS``) per
+ticker in memory and can fetch other tickers in the background, so a
+dashboard switching between tickers only waits on the first load of each.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+from urllib.parse import urlencode
+
+import pandas as pd
+import requests
+
+from .aio import gather_dict, run_blocking, run_sync, submit_io
+from .cache import CacheEntry, DiskCache
+from .config import settings
+from .http import get_http_client
+
+FMP_BASE_URL = "https://financialmodelingprep.com/stable"
+
+# Default params for quarterly statement endpoints
+QUARTERLY = {"period": "quarter", "limit": 20}
+
+# (endpoint, params) per bundle key
+FmpCall = Tuple[str, Optional[dict]]
+
+# Everything the company dashboard reads for one ticker
+COMPANY_CALLS: Dict[str, FmpCall] = {
+    "income": ("income-statement", QUARTERLY),
+    "balance": ("balance-sheet-statement", QUARTERLY),
+    "cashflow": ("cash-flow-statement", QUARTERLY),
+    "metrics": ("key-metrics", QUARTERLY),
+    "ratios": ("ratios", QUARTERLY),
+    "growth": ("financial-growth", QUARTERLY),
+    "price": ("historical-price-eod/full", None),
+    "estimates": ("analyst-estimates", {"period": "quarter", "limit": 4}),
+    "price_target": ("price-target-consensus", None),
+}
+
+
+@lru_cache(maxsize=1)
+def get_fmp_cache() -> DiskCache:
+    """Process-wide cache for FMP responses under ``DATA_DIR/cache/fmp``."""
+    return DiskCache(
+        settings.DATA_DIR / "cache" / "fmp",
+        ttl=settings.FMP_CACHE_TTL_HOURS * 3600,
+        max_bytes=settings.FMP_CACHE_MAX_MB * 1024 * 1024,
+    )
+
+
+def fmp_cache_key(endpoint: str, params: Mapping, base_url: str = FMP_BASE_URL) -> str:
+    """Cache key of a request: its URL and sorted query params, without the API key."""
+    query = sorted((k, str(v)) for k, v in params.items() if k != "apikey")
+    return f"{base_url}/{endpoint}?{urlencode(query)}"
+
+
+def _request(url: str, params: dict, endpoint: str) -> Optional[Tuple[bytes, object]]:
+    """GET an FMP endpoint; (body, decoded JSON), or None after reporting an error."""
+    try:
+        # Shared pooled client: keep-alive, FMP rate limit, retries on 429/5xx
+        response = get_http_client().get(url, params=params, timeout=30)
+        response.raise_for_status()
+        data = json.loads(response.content)
+
+        # Check for API error messages
+        if isinstance(data, dict) and 'Error Message' in data:
+            print(f"FMP API Error: {data['Error Message']}")
+            return None
+        return response.content, data
+
+    except requests.exceptions.Timeout:
+        print(f"Request timed out for {endpoint}")
+    except requests.exceptions.HTTPError as e:
+        print(f"HTTP error for {endpoint}: {e}")
+    except Exception as e:
+        print(f"Unexpected error fetching {endpoint}: {e}")
+    return None
+
+
+def _to_frame(data) -> pd.DataFrame:
+    if not data:
+        return pd.DataFrame()
+
+    # Convert to DataFrame
+    df = pd.DataFrame(data)
+
+    # Parse date columns
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'])
+
+    # Create quarter column if available
+    if 'calendarYear' in df.columns and 'period' in df.columns:
+        df['quarter'] = df['calendarYear'].astype(str) + '-' + df['period']
+
+    return df
+
+
+def _read_cached(cache: DiskCache, entry: CacheEntry) -> Optional[pd.DataFrame]:
+    try:
+        return _to_frame(json.loads(cache.read(entry)))
+    except (OSError, ValueError):
+        # Evicted by another process in the meantime, or unreadable
+        return None
+
+
+# Cache keys with a background refresh in flight in this process
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def _refresh_in_background(key: str, url: str, params: dict, endpoint: str) -> None:
+    """Refetch one stale response off the caller's thread (once per key at a time)."""
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh() -> None:
+        try:
+            fetched = _request(url, params, endpoint)
+            # An empty answer never replaces a cached one
+            if fetched is not None and fetched[1]:
+                get_fmp_cache().store(key, fetched[0])
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    submit_io(refresh)
+
+
+def fetch_fmp_data(
+    ticker: str,
+    endpoint: str,
+    params: Optional[dict] = None,
+    api_key: Optional[str] = None,
+    base_url: str = FMP_BASE_URL,
+    max_age: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Generic FMP API fetcher with error handling
+
+    Responses are cached on disk by (endpoint, params without the API key).
+    Entries younger than the TTL are returned as is; older ones (up to
+    FMP_CACHE_STALE_HOURS) are returned as is while a background refresh
+    replaces them; anything else is fetched now. A failed fetch falls back
+    to whatever is cached; empty responses are returned but never cached.
+
+    Args:
+        ticker: Stock ticker symbol (e.g., 'SHOP')
+        endpoint: API endpoint (e.g., 'income-statement')
+        params: Optional dict of query parameters
+        api_key: FMP key (defaults to settings.FMP_API_KEY)
+        base_url: FMP API root
+        max_age: Override the cache TTL in seconds (0 forces a fetch now)
+
+    Returns:
+        DataFrame with API data or empty DataFrame on error
+    """
+    url = f"{base_url}/{endpoint}"
+    default_params = {"apikey": api_key or settings.FMP_API_KEY, "symbol": ticker.upper()}
+    if params:
+        default_params.update(params)
+
+    cache = get_fmp_cache()
+    key = fmp_cache_key(endpoint, default_params, base_url)
+    entry = cache.lookup(key)
+    if entry is not None:
+        if entry.is_fresh(cache.ttl if max_age is None else max_age):
+            cached = _read_cached(cache, entry)
+            if cached is not None:
+                return cached
+        elif max_age is None and entry.is_fresh(settings.FMP_CACHE_STALE_HOURS * 3600):
+            # Stale-while-revalidate
+            cached = _read_cached(cache, entry)
+            if cached is not None:
+                _refresh_in_background(key, url, default_params, endpoint)
+                return cached
+
+    fetched = _request(url, default_params, endpoint)
+    if fetched is None:
+        cached = _read_cached(cache, entry) if entry is not None else None
+        if cached is not None:
+            print(f"Serving cached {endpoint} for {ticker.upper()}")
+            return cached
+        return pd.DataFrame()
+
+    body, data = fetched
+    # Empty payloads (e.g. a ticker FMP does not cover yet) are not cached,
+    # so the next call asks again instead of serving nothing for a whole TTL
+    if data:
+        cache.store(key, body)
+    return _to_frame(data)
+
+
+async def fetch_fmp_data_async(
+    ticker: str,
+    endpoint: str,
+    params: Optional[dict] = None,
+    api_key: Optional[str] = None,
+    base_url: str = FMP_BASE_URL,
+) -> pd.DataFrame:
+    """Awaitable ``fetch_fmp_data``; run several under ``asyncio.gather`` to overlap them."""
+    return await run_blocking(fetch_fmp_data, ticker, endpoint, params, api_key, base_url)
+
+
+async def gather_fmp_data(
+    ticker: str,
+    calls: Mapping[str, FmpCall],
+    api_key: Optional[str] = None,
+    base_url: str = FMP_BASE_URL,
+) -> Dict[str, pd.DataFrame]:
+    """Fetch every ``name -> (endpoint, params)`` in ``calls`` concurrently."""
+    return await gather_dict({
+        name: fetch_fmp_data_async(ticker, endpoint, params, api_key, base_url)
+        for name, (endpoint, params) in calls.items()
+    })
+
+
+def fetch_fmp_bundle(
+    ticker: str,
+    calls: Mapping[str, FmpCall],
+    api_key: Optional[str] = None,
+    base_url: str = FMP_BASE_URL,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch several independent FMP endpoints for one ticker concurrently.
+
+    Args:
+        ticker: Stock ticker symbol (e.g., 'SHOP')
+        calls: Name -> (endpoint, params) for each dataset wanted
+        api_key: FMP key (defaults to settings.FMP_API_KEY)
+        base_url: FMP API root
+
+    Returns:
+        Name -> DataFrame (empty on error, as with fetch_fmp_data)
+    """
+    return run_sync(gather_fmp_data(ticker, calls, api_key, base_url))
+
+
+class CompanyBundles:
+    """
+    In-memory per-ticker cache of FMP bundles with background prefetch.
+
+    Each ticker is fetched at most once: a ``get`` for a ticker that is being
+    prefetched waits for that fetch instead of starting another. Bundles whose
+    every dataset came back empty (e.g. a bad key or outage) are not kept.
+
+    Args:
+        calls: Name -> (endpoint, params) fetched per ticker
+        api_key: FMP key (defaults to settings.FMP_API_KEY)
+        base_url: FMP API root
+        max_tickers: Bundles kept before the least recently used is dropped
+        prefetch_workers: Tickers fetched in the background at once
+    """
+
+    def __init__(
+        self,
+        calls: Mapping[str, FmpCall] = COMPANY_CALLS,
+        api_key: Optional[str] = None,
+        base_url: str = FMP_BASE_URL,
+        max_tickers: int = 32,
+        prefetch_workers: int = 2,
+    ):
+        self.calls = dict(calls)
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_tickers = max_tickers
+        self._lock = threading.Lock()
+        self._bundles: "OrderedDict[str, Future]" = OrderedDict()
+        # Separate from the I/O pool: each bundle fetch itself fans out there
+        self._executor = ThreadPoolExecutor(
+            max_workers=prefetch_workers, thread_name_prefix="life-agents-prefetch"
+        )
+
+    def _fetch(self, ticker: str) -> Dict[str, pd.DataFrame]:
+        return fetch_fmp_bundle(ticker, self.calls, self.api_key, self.base_url)
+
+    def _future(self, ticker: str, background: bool) -> Future:
+        """The pending or finished fetch for ``ticker``, starting one if needed."""
+        with self._lock:
+            future = self._bundles.get(ticker)
+            if future is not None:
+                self._bundles.move_to_end(ticker)
+                return future
+            future = self._executor.submit(self._fetch, ticker) if background else Future()
+            self._bundles[ticker] = future
+            while len(self._bundles) > self.max_tickers:
+                self._bundles.popitem(last=False)
+        if not background:
+            try:
+                future.set_result(self._fetch(ticker))
+            except BaseException as e:
+                future.set_exception(e)
+        future.add_done_callback(lambda f: self._drop_if_failed(ticker, f))
+        return future
+
+    def _drop_if_failed(self, ticker: str, future: Future) -> None:
+        if future.exception() is None and any(not df.empty for df in future.result().values()):
+            return
+        with self._lock:
+            if self._bundles.get(ticker) is future:
+                del self._bundles[ticker]
+
+    def get(self, ticker: str) -> Dict[str, pd.DataFrame]:
+        """
+        The bundle for ``ticker``, fetching it (or waiting on its prefetch) if needed.
+
+        Returns:
+            Name -> DataFrame (empty on error, as with fetch_fmp_data)
+        """
+        return self._future(ticker.upper(), background=False).result()
+
+    def prefetch(self, tickers: Iterable[str]) -> None:
+        """Start fetching bundles for ``tickers`` in the background; returns immediately."""
+        for ticker in tickers:
+            self._future(ticker.upper(), background=True)
+
+    def cached(self) -> list:
+        """Tickers whose bundles are loaded or loading, least recently used first."""
+        with self._lock:
+            return list(self._bundles)
+
+    def clear(self) -> None:
+        """Forget every bundle (in-flight prefetches still finish)."""
+        with self._lock:
+            self._bundles.clear()
+
+
+@lru_cache(maxsize=None)
+def get_company_bundles(api_key: Optional[str] = None, base_url: str = FMP_BASE_URL) -> CompanyBundles:
+    """Shared CompanyBundles per (api_key, base_url), surviving notebook cell reruns."""
+    return CompanyBundles(api_key=api_key, base_url=base_url)
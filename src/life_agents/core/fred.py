@@ -0,0 +1,346 @@
+"""
+Local FRED series store with incremental observation fetches.
+
+Each series is kept as one Parquet file of its full observation history
+under ``DATA_DIR/fred/series``, and ``DATA_DIR/fred/metadata.parquet`` holds
+one row per series: FRED's descriptive fields and ``last_updated`` stamp,
+the real-time period of the last fetch, the first and last observation, and
+when the series was last fetched and checked.
+
+An update asks FRED for the series' ``last_updated`` stamp first (one small
+request) and only fetches observations when it changed, starting
+FRED_REVISION_DAYS before the last stored observation so recent revisions
+replace the stored values. Series checked within FRED_MAX_AGE_HOURS are not
+requested at all, so a dashboard reads full histories from disk instantly.
+A failed request is reported and leaves the stored history in place.
+
+Usage:
+    from life_agents.core.fred import get_fred_store
+
+    fred = get_fred_store()
+    fred.update(["FEDFUNDS", "DGS10", "MORTGAGE30US"])     # only what changed
+    rates = fred.wide(["FEDFUNDS", "DGS10", "MORTGAGE30US"], start="2015-01-01")
+"""
+
+import datetime as dt
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import polars as pl
+
+from .config import settings
+from .http import get_http_client
+
+FRED_BASE_URL = "https://api.stlouisfed.org/fred"
+
+# Most observations FRED returns per request
+PAGE_LIMIT = 100_000
+
+OBSERVATION_SCHEMA = {
+    "date": pl.Date,
+    "value": pl.Float64,
+}
+
+METADATA_SCHEMA = {
+    "series_id": pl.String,
+    "title": pl.String,
+    "units": pl.String,
+    "frequency": pl.String,
+    "seasonal_adjustment": pl.String,
+    "last_updated": pl.String,
+    "realtime_start": pl.Date,
+    "first_observation": pl.Date,
+    "last_observation": pl.Date,
+    "observations": pl.Int64,
+    "fetched_at": pl.Datetime("us"),
+    "checked_at": pl.Datetime("us"),
+}
+
+DateLike = Optional[Union[str, dt.date]]
+
+
+@dataclass
+class FredUpdate:
+    """Outcome of updating one series."""
+    series_id: str
+    new_observations: int = 0
+    fetched: int = 0
+    skipped: bool = False
+    error: Optional[str] = None
+
+
+def parse_observations(payload: dict) -> pl.DataFrame:
+    """
+    Observations of a ``fred/series/observations`` response.
+
+    Returns:
+        DataFrame with the OBSERVATION_SCHEMA columns; FRED's '.' (no value) becomes null
+    """
+    observations = payload.get("observations") or []
+    if not observations:
+        return pl.DataFrame(schema=OBSERVATION_SCHEMA)
+    return pl.DataFrame({
+        "date": [o["date"] for o in observations],
+        "value": [o["value"] for o in observations],
+    }).with_columns(
+        pl.col("date").str.to_date(),
+        pl.col("value").cast(pl.Float64, strict=False),
+    )
+
+
+def _to_date(value: Union[str, dt.date]) -> dt.date:
+    return dt.date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _as_list(value: Union[str, Iterable[str]]) -> List[str]:
+    return [value] if isinstance(value, str) else list(value)
+
+
+class FredStore:
+    """
+    Parquet observation histories of FRED series plus a metadata table.
+
+    Args:
+        api_key: FRED API key (defaults to settings.FRED_API_KEY)
+        root: Store directory (defaults to DATA_DIR/fred)
+    """
+
+    def __init__(self, api_key: Optional[str] = None, root: Optional[Path] = None):
+        self.api_key = api_key or settings.FRED_API_KEY
+        self.root = Path(root) if root is not None else settings.DATA_DIR / "fred"
+        self.metadata_path = self.root / "metadata.parquet"
+        self._lock = threading.Lock()
+        self._metadata: Dict[str, dict] = (
+            {row["series_id"]: row for row in pl.read_parquet(self.metadata_path).iter_rows(named=True)}
+            if self.metadata_path.exists() else {}
+        )
+
+    # -- FRED API ------------------------------------------------------------
+
+    def _get(self, endpoint: str, **params) -> dict:
+        if not self.api_key:
+            raise RuntimeError("FRED_API_KEY is not set")
+        response = get_http_client().get(
+            f"{FRED_BASE_URL}/{endpoint}",
+            params={**params, "api_key": self.api_key, "file_type": "json"},
+        )
+        if response.status_code != 200:
+            try:
+                message = response.json().get("error_message", "")
+            except ValueError:
+                message = response.text[:200]
+            raise RuntimeError(f"HTTP {response.status_code} from fred/{endpoint}: {message}")
+        return response.json()
+
+    def fetch_info(self, series_id: str) -> dict:
+        """FRED's description of a series (title, units, frequency, last_updated, ...)."""
+        return self._get("series", series_id=series_id)["seriess"][0]
+
+    def fetch_observations(self, series_id: str, start: DateLike = None) -> Tuple[pl.DataFrame, Optional[dt.date]]:
+        """
+        Current-vintage observations of a series, oldest first, across as many pages as needed.
+
+        Args:
+            series_id: FRED series ID
+            start: First observation date to fetch (default: the full history)
+
+        Returns:
+            (DataFrame with the OBSERVATION_SCHEMA columns, realtime_start of the response)
+        """
+        params = {"series_id": series_id, "sort_order": "asc", "limit": PAGE_LIMIT}
+        if start is not None:
+            params["observation_start"] = str(start)
+        pages, offset = [], 0
+        while True:
+            payload = self._get("series/observations", offset=offset, **params)
+            pages.append(parse_observations(payload))
+            offset += pages[-1].height
+            if not pages[-1].height or offset >= payload.get("count", 0):
+                break
+        realtime_start = dt.date.fromisoformat(payload["realtime_start"]) if payload.get("realtime_start") else None
+        return pl.concat(pages), realtime_start
+
+    # -- storage -------------------------------------------------------------
+
+    def series_path(self, series_id: str) -> Path:
+        """Parquet file holding the observations of ``series_id``."""
+        return self.root / "series" / f"{series_id.upper()}.parquet"
+
+    def metadata(self) -> pl.DataFrame:
+        """One row per stored series (see METADATA_SCHEMA)."""
+        return pl.DataFrame(
+            [self._metadata[s] for s in sorted(self._metadata)],
+            schema=METADATA_SCHEMA,
+            orient="row",
+        )
+
+    def _save_metadata(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.metadata_path.with_suffix(f".{os.getpid()}.tmp")
+        with self._lock:
+            self.metadata().write_parquet(tmp)
+        os.replace(tmp, self.metadata_path)
+
+    def _write(self, series_id: str, observations: pl.DataFrame) -> None:
+        path = self.series_path(series_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        observations.write_parquet(tmp, compression="zstd")
+        os.replace(tmp, path)
+
+    # -- updates -------------------------------------------------------------
+
+    def update_series(self, series_id: str, full: bool = False, max_age_hours: Optional[float] = None) -> FredUpdate:
+        """
+        Bring one series up to date (see the module docstring for the rules).
+
+        Args:
+            series_id: FRED series ID
+            full: Re-fetch the whole history regardless of the stored state
+            max_age_hours: Skip a series checked within this many hours
+                (defaults to settings.FRED_MAX_AGE_HOURS; 0 always checks)
+
+        Returns:
+            FredUpdate; errors are recorded on it rather than raised
+        """
+        series_id = series_id.upper()
+        result = FredUpdate(series_id)
+        entry = self._metadata.get(series_id)
+        path = self.series_path(series_id)
+        stored = entry is not None and path.exists() and not full
+        max_age = settings.FRED_MAX_AGE_HOURS if max_age_hours is None else max_age_hours
+        now = dt.datetime.now()
+        try:
+            if stored and entry["checked_at"] and (now - entry["checked_at"]).total_seconds() < max_age * 3600:
+                result.skipped = True
+                return result
+
+            info = self.fetch_info(series_id)
+            if stored and entry["last_updated"] == info.get("last_updated"):
+                result.skipped = True
+                with self._lock:
+                    self._metadata[series_id] = {**entry, "checked_at": now}
+                return result
+
+            start = None
+            if stored and entry["last_observation"]:
+                start = entry["last_observation"] - dt.timedelta(days=settings.FRED_REVISION_DAYS)
+            fetched, realtime_start = self.fetch_observations(series_id, start)
+            result.fetched = fetched.height
+
+            observations = fetched
+            if start is not None:
+                # The re-fetched window replaces what is stored for those dates
+                observations = pl.concat([
+                    pl.read_parquet(path).filter(pl.col("date") < start),
+                    fetched,
+                ])
+            observations = observations.unique("date", keep="last").sort("date")
+            last = entry["last_observation"] if stored else None
+            result.new_observations = (
+                observations.filter(pl.col("date") > last).height if last else observations.height
+            )
+            self._write(series_id, observations)
+
+            with self._lock:
+                self._metadata[series_id] = {
+                    "series_id": series_id,
+                    "title": info.get("title"),
+                    "units": info.get("units"),
+                    "frequency": info.get("frequency"),
+                    "seasonal_adjustment": info.get("seasonal_adjustment"),
+                    "last_updated": info.get("last_updated"),
+                    "realtime_start": realtime_start,
+                    "first_observation": observations["date"].min(),
+                    "last_observation": observations["date"].max(),
+                    "observations": observations.height,
+                    "fetched_at": now,
+                    "checked_at": now,
+                }
+        except Exception as e:
+            result.error = str(e)
+        return result
+
+    def update(
+        self,
+        series_ids: Optional[Iterable[str]] = None,
+        full: bool = False,
+        max_age_hours: Optional[float] = None,
+        max_workers: int = 4,
+    ) -> List[FredUpdate]:
+        """
+        Update many series concurrently (requests share the FRED rate limit).
+
+        Args:
+            series_ids: Series to add/update (default: every stored series)
+            full: Re-fetch whole histories
+            max_age_hours: See update_series
+            max_workers: Series updated concurrently
+
+        Returns:
+            One FredUpdate per series; failures are also printed
+        """
+        ids = _as_list(series_ids) if series_ids is not None else list(self._metadata)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(lambda s: self.update_series(s, full, max_age_hours), ids))
+        self._save_metadata()
+        for r in results:
+            if r.error:
+                print(f"Error updating FRED series {r.series_id}: {r.error}")
+        return results
+
+    # -- reads ---------------------------------------------------------------
+
+    def query(self, series_ids: Union[str, Iterable[str]], start: DateLike = None, end: DateLike = None) -> pl.LazyFrame:
+        """
+        Lazy long view (series_id, date, value) over stored series.
+
+        Series that are not stored are reported and left out.
+        """
+        frames = []
+        for series_id in _as_list(series_ids):
+            path = self.series_path(series_id)
+            if not path.exists():
+                print(f"FRED series {series_id} is not stored; run FredStore.update(['{series_id}'])")
+                continue
+            frames.append(pl.scan_parquet(path).select(pl.lit(series_id.upper()).alias("series_id"), "date", "value"))
+        if not frames:
+            return pl.DataFrame(schema={"series_id": pl.String, **OBSERVATION_SCHEMA}).lazy()
+
+        lf = pl.concat(frames)
+        if start is not None:
+            lf = lf.filter(pl.col("date") >= _to_date(start))
+        if end is not None:
+            lf = lf.filter(pl.col("date") <= _to_date(end))
+        return lf
+
+    def series(self, series_id: str, start: DateLike = None, end: DateLike = None) -> pl.DataFrame:
+        """One stored series as (date, value), oldest first."""
+        return self.query(series_id, start, end).select("date", "value").collect()
+
+    def wide(self, series_ids: Union[str, Iterable[str]], start: DateLike = None, end: DateLike = None) -> pl.DataFrame:
+        """
+        Several stored series side by side, one column per series.
+
+        Returns:
+            DataFrame with a date column and one value column per stored
+            series (in the order given), oldest first; null where a series
+            has no observation on a date
+        """
+        long = self.query(series_ids, start, end).collect()
+        if long.is_empty():
+            return pl.DataFrame(schema={"date": pl.Date})
+        wide = long.pivot(on="series_id", index="date", values="value").sort("date")
+        present = [s.upper() for s in _as_list(series_ids) if s.upper() in wide.columns]
+        return wide.select("date", *present)
+
+
+@lru_cache(maxsize=None)
+def get_fred_store(api_key: Optional[str] = None) -> FredStore:
+    """Shared FredStore under DATA_DIR/fred."""
+    return FredStore(api_key)
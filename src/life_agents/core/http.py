@@ -0,0 +1,231 @@
+"""
+Shared HTTP client for every external data source (SEC, FMP, FRED, ...).
+
+One keep-alive ``requests.Session`` per host avoids a TLS handshake per call,
+one adaptive token bucket per API replaces fixed ``time.sleep`` delays, and
+transient failures (429/5xx/connection errors) are retried with jittered
+exponential backoff. Per-host latency counters are kept for diagnostics.
+
+Usage:
+    from life_agents.core.http import get_http_client
+
+    client = get_http_client()
+    response = client.get("https://data.sec.gov/submissions/CIK0001594805.json")
+    print(client.stats())
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import settings
+from .ratelimit import AdaptiveTokenBucket
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def rate_limit_group(host: str) -> str:
+    """Hosts that share a rate limit (e.g. www.sec.gov and data.sec.gov -> sec.gov)."""
+    host = host.lower().rsplit(":", 1)[0]
+    parts = host.split(".")
+    if len(parts) <= 2 or parts[-1].isdigit():
+        return host
+    return ".".join(parts[-2:])
+
+
+def default_rates() -> Dict[str, float]:
+    """Requests-per-second budget for each known API, keyed by rate-limit group."""
+    return {
+        "sec.gov": settings.SEC_MAX_REQUESTS_PER_SECOND,
+        "financialmodelingprep.com": settings.FMP_MAX_REQUESTS_PER_SECOND,
+        "stlouisfed.org": settings.FRED_MAX_REQUESTS_PER_SECOND,
+    }
+
+
+@dataclass
+class HostStats:
+    """Request counters and latency for one host."""
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    throttled: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    wait_seconds: float = 0.0
+    status_counts: Dict[int, int] = field(default_factory=dict)
+
+    def record(self, seconds: float, status: Optional[int]) -> None:
+        self.requests += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if status is None:
+            self.errors += 1
+        else:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.requests if self.requests else 0.0
+
+
+class HttpClient:
+    """
+    Pooled, rate-limited, retrying HTTP client.
+
+    Args:
+        rates: Requests per second per rate-limit group (see ``rate_limit_group``)
+        default_rate: Rate for hosts not listed in ``rates``
+        max_retries: Retries after the first attempt for retryable failures
+        backoff: Base backoff in seconds (doubles each retry, with full jitter)
+        pool_size: Keep-alive connections per host
+        timeout: Default request timeout in seconds
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, float]] = None,
+        default_rate: float = 5.0,
+        max_retries: Optional[int] = None,
+        backoff: float = 0.5,
+        pool_size: int = 16,
+        timeout: float = 30,
+    ):
+        self.rates = default_rates() if rates is None else rates
+        self.default_rate = default_rate
+        self.max_retries = settings.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, requests.Session] = {}
+        self._limiters: Dict[str, AdaptiveTokenBucket] = {}
+        self._stats: Dict[str, HostStats] = {}
+
+    def session(self, host: str) -> requests.Session:
+        """Keep-alive session (connection pool) for ``host``."""
+        with self._lock:
+            if host not in self._sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+                self._stats.setdefault(host, HostStats())
+            return self._sessions[host]
+
+    def limiter(self, host: str) -> AdaptiveTokenBucket:
+        """Token bucket shared by every host in the same rate-limit group."""
+        group = rate_limit_group(host)
+        with self._lock:
+            if group not in self._limiters:
+                self._limiters[group] = AdaptiveTokenBucket(self.rates.get(group, self.default_rate))
+            return self._limiters[group]
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request, waiting for a rate-limit token and retrying transient failures.
+
+        Accepts the same keyword arguments as ``requests.Session.request``. The final
+        response is returned whatever its status, so callers keep using
+        ``raise_for_status()``; connection errors are re-raised after the last retry.
+        """
+        host = urlsplit(url).netloc
+        session = self.session(host)
+        limiter = self.limiter(host)
+        stats = self._stats[host]
+        kwargs.setdefault("timeout", self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            waited = limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                with self._lock:
+                    stats.wait_seconds += waited
+                    stats.record(time.perf_counter() - start, None)
+                if attempt == self.max_retries:
+                    raise
+                self._sleep_backoff(attempt, stats)
+                continue
+
+            with self._lock:
+                stats.wait_seconds += waited
+                stats.record(time.perf_counter() - start, response.status_code)
+
+            if response.status_code == 429:
+                retry_after = _retry_after_seconds(response)
+                limiter.throttled(retry_after)
+                with self._lock:
+                    stats.throttled += 1
+            elif response.status_code < 500:
+                limiter.succeeded()
+
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+            self._sleep_backoff(attempt, stats)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET ``url`` (see ``request``)."""
+        return self.request("GET", url, **kwargs)
+
+    def _sleep_backoff(self, attempt: int, stats: HostStats) -> None:
+        with self._lock:
+            stats.retries += 1
+        time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+    def stats(self) -> pd.DataFrame:
+        """Per-host request counts, retries, throttling and latency."""
+        with self._lock:
+            rows = [
+                {
+                    "host": host,
+                    "requests": s.requests,
+                    "errors": s.errors,
+                    "retries": s.retries,
+                    "throttled": s.throttled,
+                    "mean_ms": s.mean_seconds * 1000,
+                    "max_ms": s.max_seconds * 1000,
+                    "rate_wait_s": s.wait_seconds,
+                    "current_rate": self._limiters[rate_limit_group(host)].rate
+                    if rate_limit_group(host) in self._limiters else None,
+                }
+                for host, s in self._stats.items()
+            ]
+        return pd.DataFrame(rows)
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parse a ``Retry-After`` header given either in seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> HttpClient:
+    """Shared HttpClient for the current process."""
+    return HttpClient()
@@ -0,0 +1,189 @@
+"""
+Side-by-side comparison of Redfin markets (cities and ZIP codes).
+
+``compare_metros`` resolves any number of cities or ZIP codes through the
+region index of the Parquet mirrors (see ``RedfinStore.index``), reads the
+row groups holding them in one pass per tracker and aligns everything into
+a dense (period x metro x metric) array. Comparing 50 Orange County cities
+is one indexed read rather than 50 scans of the tracker.
+
+Usage:
+    from life_agents.core.metros import compare_metros
+
+    oc = compare_metros(
+        ["Irvine, CA", "Tustin, CA", "Costa Mesa", "92618"],
+        property_type="Single Family Residential",
+        start="2023-01-01",
+    )
+    oc.metric("median_price")        # periods x metros DataFrame
+    oc.latest()                      # metros x metrics snapshot
+    oc.values[:, :, 1]               # raw PPSF array, periods x metros
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .redfin import DateLike, RedfinStore, StrOrList, _as_list, get_redfin_store
+
+# Comparison metric -> tracker column
+COMPARISON_METRICS = {
+    "median_price": "MEDIAN_SALE_PRICE",
+    "ppsf": "MEDIAN_PPSF",
+    "dom": "MEDIAN_DOM",
+    "inventory": "INVENTORY",
+    "sale_to_list": "AVG_SALE_TO_LIST",
+}
+
+_ZIP = re.compile(r"^(?:Zip Code:\s*)?(\d{5})$", re.IGNORECASE)
+
+
+class MetroPanel(NamedTuple):
+    """A dense (period x metro x metric) array with the labels of its axes."""
+    values: np.ndarray
+    periods: pd.DatetimeIndex
+    metros: List[str]
+    metrics: List[str]
+
+    def metric(self, name: str) -> pd.DataFrame:
+        """One metric as a periods x metros DataFrame."""
+        return pd.DataFrame(self.values[:, :, self.metrics.index(name)], index=self.periods, columns=self.metros)
+
+    def metro(self, name: str) -> pd.DataFrame:
+        """One metro as a periods x metrics DataFrame."""
+        return pd.DataFrame(self.values[:, self.metros.index(name), :], index=self.periods, columns=self.metrics)
+
+    def latest(self) -> pd.DataFrame:
+        """Each metro's most recent non-missing value of every metric (metros x metrics)."""
+        present = ~np.isnan(self.values)
+        # Index of the last present period per (metro, metric); -1 if none
+        last = np.where(present.any(axis=0), len(self.periods) - 1 - np.argmax(present[::-1], axis=0), -1)
+        values = np.take_along_axis(self.values, np.clip(last, 0, None)[None], axis=0)[0]
+        values[last < 0] = np.nan
+        return pd.DataFrame(values, index=self.metros, columns=self.metrics)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long frame of (PERIOD_BEGIN, REGION, *metrics), one row per period and metro."""
+        n_periods, n_metros, _ = self.values.shape
+        frame = pd.DataFrame(self.values.reshape(n_periods * n_metros, -1), columns=self.metrics)
+        frame.insert(0, "REGION", np.tile(np.asarray(self.metros, dtype=object), n_periods))
+        frame.insert(0, "PERIOD_BEGIN", np.repeat(self.periods, n_metros))
+        return frame.dropna(how="all", subset=self.metrics).reset_index(drop=True)
+
+
+def _tracker_of(metro: str) -> str:
+    return "zip" if _ZIP.match(metro.strip()) else "city"
+
+
+def resolve_metros(metros: Sequence[str], store: RedfinStore, states: StrOrList = None) -> List[str]:
+    """
+    Tracker regions matching the given names, in the order given.
+
+    A name matches a region exactly ('Irvine, CA', 'Zip Code: 92618'), a
+    bare ZIP code ('92618'), or else a city name case-insensitively
+    ('irvine'), in every state unless ``states`` narrows it.
+
+    Args:
+        metros: Region names, city names or ZIP codes
+        store: Store whose index to search
+        states: Restrict city-name matches to these state codes
+
+    Returns:
+        Distinct REGION values; names without a match are reported and skipped
+    """
+    index = store.index()
+    regions = set(index["REGION"].dropna())
+    by_city: Dict[str, List[str]] = {}
+    cities = index.dropna(subset=["CITY"])
+    if states is not None:
+        cities = cities[cities["STATE_CODE"].isin(_as_list(states))]
+    for city, region in zip(cities["CITY"].str.lower(), cities["REGION"]):
+        by_city.setdefault(city, [])
+        if region not in by_city[city]:
+            by_city[city].append(region)
+
+    resolved: List[str] = []
+    for metro in metros:
+        name = metro.strip()
+        zip_code = _ZIP.match(name)
+        if zip_code:
+            name = f"Zip Code: {zip_code.group(1)}"
+        matches = [name] if name in regions else by_city.get(name.lower(), [])
+        if not matches:
+            print(f"No Redfin {store.tracker} region matches '{metro}'")
+        resolved.extend(m for m in matches if m not in resolved)
+    return resolved
+
+
+def compare_metros(
+    metros: Sequence[str],
+    metrics: Optional[Sequence[str]] = None,
+    property_type: str = "All Residential",
+    start: DateLike = None,
+    end: DateLike = None,
+    states: StrOrList = None,
+    period_duration: int = 30,
+    seasonally_adjusted: bool = False,
+) -> MetroPanel:
+    """
+    Aligned panels of housing metrics for several cities and/or ZIP codes.
+
+    Cities are read from the city tracker's mirror and ZIP codes from the
+    ZIP tracker's (see ``get_redfin_store``; refresh those first).
+
+    Args:
+        metros: Region names ('Irvine, CA'), city names ('Irvine') or ZIP codes ('92618')
+        metrics: COMPARISON_METRICS keys or tracker columns (default: all of COMPARISON_METRICS)
+        property_type: Redfin property type, e.g. 'Single Family Residential'
+        start: First PERIOD_BEGIN to include
+        end: Last PERIOD_BEGIN to include
+        states: Restrict city-name matches to these state codes
+        period_duration: PERIOD_DURATION in days of the rows to compare
+            (30 for Redfin's monthly periods)
+        seasonally_adjusted: Compare the seasonally adjusted rows instead of
+            the unadjusted ones
+
+    Returns:
+        MetroPanel over the union of periods, with metros in the order
+        resolved and NaN where a metro has no value for a period
+
+    Raises:
+        ValueError: if a metro still has several rows for one period
+    """
+    metrics = list(metrics or COMPARISON_METRICS)
+    columns = [COMPARISON_METRICS.get(m, m.upper()) for m in metrics]
+
+    regions: List[str] = []
+    frames = []
+    for tracker in dict.fromkeys(_tracker_of(m) for m in metros):
+        store = get_redfin_store(tracker)
+        wanted = resolve_metros([m for m in metros if _tracker_of(m) == tracker], store, states)
+        if not wanted:
+            continue
+        regions.extend(wanted)
+        frame = store.load(
+            regions=wanted,
+            property_types=property_type,
+            start=start,
+            end=end,
+            columns=["PERIOD_BEGIN", "REGION", "PERIOD_DURATION", "IS_SEASONALLY_ADJUSTED", *columns],
+        )
+        # The trackers hold one row per duration and adjustment of each period
+        frames.append(frame[
+            (frame["PERIOD_DURATION"] == period_duration)
+            & (frame["IS_SEASONALLY_ADJUSTED"].astype(str) == ("t" if seasonally_adjusted else "f"))
+        ])
+
+    long = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["PERIOD_BEGIN", "REGION", *columns])
+    duplicated = long.duplicated(["PERIOD_BEGIN", "REGION"])
+    if duplicated.any():
+        first = long[duplicated].iloc[0]
+        raise ValueError(f"Several rows for {first['REGION']} in the period beginning {first['PERIOD_BEGIN']:%Y-%m-%d}")
+    periods = pd.DatetimeIndex(np.unique(long["PERIOD_BEGIN"].to_numpy()), name="PERIOD_BEGIN")
+    values = np.full((len(periods), len(regions), len(metrics)), np.nan)
+    period_idx = periods.get_indexer(long["PERIOD_BEGIN"])
+    metro_idx = pd.Index(regions).get_indexer(long["REGION"].astype(object))
+    values[period_idx, metro_idx, :] = long[columns].to_numpy(dtype=np.float64)
+    return MetroPanel(values, periods, regions, metrics)
@@ -0,0 +1,190 @@
+"""
+Point-in-time (as-filed) view of SEC XBRL facts for look-ahead-free backtests.
+
+Every reported period (cik, taxonomy, concept, unit, start, end) keeps all of
+its versions, sorted by filing date. ``as_of(D)`` returns, for each period,
+the latest value filed on or before D, so restatements filed after D are
+never visible. Lookups are a single vectorized binary search over a sorted
+(period, filed date) key; answering another as-of date never rescans facts.
+
+Usage:
+    from life_agents.core.point_in_time import PointInTimeIndex
+
+    pit = PointInTimeIndex.from_store(tickers=["MSFT", "GOOGL"], concepts=["Revenues"])
+    known = pit.as_of("2023-06-30", quarterly=True)       # what was known then
+    panel = pit.as_of_many(pd.date_range("2020-01-31", "2024-12-31", freq="ME"))
+"""
+
+import datetime as dt
+from typing import Iterable, Optional
+
+import numpy as np
+import polars as pl
+
+from .facts_store import FACT_SCHEMA, StrOrList, _as_date, _as_list
+
+# Columns identifying one reported period (each may be filed several times)
+PERIOD_KEY = ["cik", "taxonomy", "concept", "unit", "start", "end"]
+
+_EPOCH = dt.date(1970, 1, 1)
+
+
+def _day(value) -> int:
+    """Days since 1970-01-01 (the physical value of a polars Date)."""
+    return (_as_date(value) - _EPOCH).days
+
+
+class PointInTimeIndex:
+    """
+    Bitemporal index over flattened facts (FACT_SCHEMA columns).
+
+    Args:
+        facts: Flattened facts, e.g. ``FactsStore().query(...).collect()``
+    """
+
+    def __init__(self, facts: pl.DataFrame):
+        facts = (
+            facts.select(list(FACT_SCHEMA))
+            .filter(pl.col("end").is_not_null() & pl.col("filed").is_not_null())
+            .sort([*PERIOD_KEY, "filed", "accn"], nulls_last=True)
+        )
+        group = facts.select(pl.struct(PERIOD_KEY).rle_id()).to_series()
+        filed = facts["filed"].to_physical().to_numpy().astype(np.int64)
+
+        self.facts = facts
+        self._group = group.to_numpy().astype(np.int64)
+        self._base = int(filed.min()) if len(filed) else 0
+        self._span = int(filed.max()) - self._base + 2 if len(filed) else 1
+        # Sorted composite key: period id, then filing day within the period
+        self._keys = self._group * self._span + (filed - self._base)
+
+        self.periods = (
+            facts.with_columns(group.alias("period_id"))
+            .group_by("period_id", maintain_order=True)
+            .agg(
+                *(pl.col(c).first() for c in PERIOD_KEY),
+                pl.len().alias("versions"),
+                pl.col("filed").min().alias("first_filed"),
+                pl.col("filed").max().alias("last_filed"),
+            )
+        )
+
+    @classmethod
+    def from_store(
+        cls,
+        store=None,
+        ciks: StrOrList = None,
+        tickers: StrOrList = None,
+        concepts: StrOrList = None,
+        units: StrOrList = None,
+        taxonomy: StrOrList = "us-gaap",
+    ) -> "PointInTimeIndex":
+        """
+        Build an index from the local facts store.
+
+        Args:
+            store: FactsStore to read (defaults to the standard location)
+            ciks, tickers, concepts, units, taxonomy: Filters, as in FactsStore.query
+
+        Returns:
+            PointInTimeIndex over the matching facts
+        """
+        from .facts_store import FactsStore
+
+        store = store if store is not None else FactsStore()
+        return cls(store.query(
+            ciks=ciks, tickers=tickers, concepts=concepts, units=units, taxonomy=taxonomy
+        ).collect())
+
+    def _period_ids(
+        self,
+        concepts: StrOrList = None,
+        ciks: StrOrList = None,
+        units: StrOrList = None,
+        quarterly: Optional[bool] = None,
+    ) -> np.ndarray:
+        periods = self.periods
+        for column, value in (("concept", concepts), ("unit", units)):
+            values = _as_list(value)
+            if values is not None:
+                periods = periods.filter(pl.col(column).is_in(values))
+        if ciks is not None:
+            periods = periods.filter(pl.col("cik").is_in([str(c).zfill(10) for c in _as_list(ciks)]))
+        if quarterly is not None:
+            days = (pl.col("end") - pl.col("start")).dt.total_days()
+            periods = periods.filter(days < 120 if quarterly else days > 300)
+        return periods["period_id"].to_numpy().astype(np.int64)
+
+    def as_of(
+        self,
+        date,
+        concepts: StrOrList = None,
+        ciks: StrOrList = None,
+        units: StrOrList = None,
+        quarterly: Optional[bool] = None,
+    ) -> pl.DataFrame:
+        """
+        Facts as they were known on ``date``.
+
+        For every period with at least one filing on or before ``date``, the
+        latest such version is returned; later filings (including restatements)
+        are invisible.
+
+        Args:
+            date: As-of date ('YYYY-MM-DD', date, datetime or Timestamp)
+            concepts: Restrict to these concept tags
+            ciks: Restrict to these CIKs
+            units: Restrict to these units
+            quarterly: True for ~3-month durations, False for ~annual, None for all
+
+        Returns:
+            DataFrame with the FACT_SCHEMA columns, one row per known period
+        """
+        period_ids = self._period_ids(concepts, ciks, units, quarterly)
+        rows = self._lookup(period_ids, _day(date))
+        return self.facts[rows]
+
+    def as_of_many(
+        self,
+        dates: Iterable,
+        concepts: StrOrList = None,
+        ciks: StrOrList = None,
+        units: StrOrList = None,
+        quarterly: Optional[bool] = None,
+    ) -> pl.DataFrame:
+        """
+        Stack ``as_of`` snapshots for a sequence of dates (e.g. backtest rebalance dates).
+
+        Returns:
+            DataFrame with an ``as_of`` Date column followed by the FACT_SCHEMA columns
+        """
+        period_ids = self._period_ids(concepts, ciks, units, quarterly)
+        frames = []
+        for date in dates:
+            rows = self._lookup(period_ids, _day(date))
+            frames.append(self.facts[rows].select(
+                pl.lit(_as_date(date)).alias("as_of"), pl.all()
+            ))
+        if not frames:
+            return pl.DataFrame(schema={"as_of": pl.Date, **FACT_SCHEMA})
+        return pl.concat(frames)
+
+    def first_reported(
+        self,
+        concepts: StrOrList = None,
+        ciks: StrOrList = None,
+        units: StrOrList = None,
+        quarterly: Optional[bool] = None,
+    ) -> pl.DataFrame:
+        """Each period's value as originally filed (its earliest version)."""
+        period_ids = self._period_ids(concepts, ciks, units, quarterly)
+        first_rows = np.searchsorted(self._keys, period_ids * self._span, side="left")
+        return self.facts[first_rows]
+
+    def _lookup(self, period_ids: np.ndarray, day: int) -> np.ndarray:
+        """Row of the latest version filed on or before ``day`` for each period."""
+        offset = min(max(day - self._base, -1), self._span - 1)
+        pos = np.searchsorted(self._keys, period_ids * self._span + offset, side="right") - 1
+        known = (pos >= 0) & (offset >= 0)
+        known[known] &= self._group[pos[known]] == period_ids[known]
+        return pos[known]
@@ -0,0 +1,163 @@
+"""
+Derive discrete quarters from year-to-date and annual XBRL facts.
+
+Companies report Q4 only inside the 10-K annual total, and cash-flow concepts
+only as fiscal-year-to-date cumulatives (3, 6, 9 and 12 months from the same
+start). Within each cumulative chain consecutive values are differenced, so
+Q2 = H1 - Q1, Q3 = 9M - H1 and Q4 = FY - 9M; if no 9M figure exists,
+Q4 = FY - (Q1 + Q2 + Q3) from the discrete quarters instead. Everything runs
+as one polars query grouped by company and concept, so any number of
+companies and concepts are processed at once.
+
+Usage:
+    from life_agents.core.quarters import derive_quarters
+
+    facts = FactsStore().query(tickers=["MSFT", "GOOGL"], concepts=["PaymentsToAcquirePropertyPlantAndEquipment"])
+    quarters = derive_quarters(facts.collect())     # reported + derived quarters
+"""
+
+from typing import Sequence, Union
+
+import pandas as pd
+import polars as pl
+
+# Columns that identify one series (those missing from the input are ignored)
+SERIES_KEYS = ("cik", "ticker", "taxonomy", "concept", "unit", "xbrl_tag")
+
+# Duration of a reported discrete quarter, in days
+QUARTER_DAYS = (60, 120)
+
+# Spacing between consecutive cumulative period ends (covers 52/53-week years)
+QUARTER_GAP_DAYS = (75, 105)
+
+# Duration of an annual period, in days
+ANNUAL_DAYS = (300, 380)
+
+Frame = Union[pl.DataFrame, pl.LazyFrame, pd.DataFrame]
+
+
+def _as_date_col(name: str, dtype: pl.DataType) -> pl.Expr:
+    if dtype == pl.String:
+        return pl.col(name).str.to_date(strict=False)
+    if isinstance(dtype, pl.Datetime):
+        return pl.col(name).dt.date()
+    return pl.col(name)
+
+
+def derive_quarters(facts: Frame, keys: Sequence[str] = SERIES_KEYS) -> Frame:
+    """
+    Discrete quarterly values, reported and derived.
+
+    Only duration facts are de-accumulated; instants (null ``start``, e.g.
+    Assets) need none and are passed through unchanged with
+    ``derived=False``. For each (series, start, end) the latest filing wins
+    (the last row on a tie), so pass point-in-time facts to avoid
+    look-ahead. Reported quarters are preferred over derived ones. Derived
+    rows copy the later cumulative fact's filing columns (filed, accn, form,
+    ...), get ``fp='Q4'`` when derived from an annual figure, and are flagged
+    with ``derived=True``.
+
+    Args:
+        facts: Fact rows with start, end, val and filed columns (polars or pandas)
+        keys: Columns identifying a series; those absent from ``facts`` are skipped
+
+    Returns:
+        Same type as ``facts`` with one row per series and quarter end, sorted
+        by series and end; dates come back as Date (polars) or datetime64 (pandas)
+    """
+    is_pandas = isinstance(facts, pd.DataFrame)
+    lf = (pl.from_pandas(facts) if is_pandas else facts).lazy()
+    schema = lf.collect_schema()
+    keys = [k for k in keys if k in schema]
+    columns = [*schema.names(), "derived"]
+
+    days = (pl.col("end") - pl.col("start")).dt.total_days()
+    dated = lf.with_columns(_as_date_col(c, schema[c]) for c in ("start", "end", "filed") if c in schema)
+    instants = dated.filter(pl.col("start").is_null()).with_columns(pl.lit(False).alias("derived")).select(columns)
+    # One sort; series, cumulative chain and period become integer run ids
+    ordered = (
+        dated
+        .filter(pl.col("start").is_not_null() & pl.col("end").is_not_null() & pl.col("val").is_not_null())
+        .sort([*keys, "start", "end", "filed"], nulls_last=True, maintain_order=True)
+        .with_columns(
+            (pl.struct(keys).rle_id() if keys else pl.lit(0, pl.UInt32)).alias("_series"),
+            pl.struct([*keys, "start"]).rle_id().alias("_chain"),
+            pl.struct([*keys, "start", "end"]).rle_id().alias("_period"),
+        )
+    )
+    # Latest filing of each (series, start, end); materialized once since
+    # every branch below reads it
+    latest = ordered.filter(pl.col("_period") != pl.col("_period").shift(-1).fill_null(-1)).collect().lazy()
+
+    def as_derived(start: pl.Expr, val: pl.Expr) -> list:
+        marked = [
+            start.alias("start"),
+            val.alias("val"),
+            pl.lit(True).alias("derived"),
+        ]
+        if "fp" in schema:
+            marked.append(pl.when(pl.col("fp") == "FY").then(pl.lit("Q4")).otherwise(pl.col("fp")).alias("fp"))
+        if "frame" in schema:
+            marked.append(pl.lit(None, pl.String).alias("frame"))
+        return marked
+
+    internal = [*columns, "_series"]
+    reported = latest.filter(days.is_between(*QUARTER_DAYS)).with_columns(pl.lit(False).alias("derived"))
+
+    # Difference consecutive cumulatives that share a fiscal-year start
+    same_chain = pl.col("_chain") == pl.col("_chain").shift(1)
+    from_ytd = (
+        latest.with_columns(
+            pl.when(same_chain).then(pl.col("end").shift(1)).alias("_prev_end"),
+            pl.when(same_chain).then(pl.col("val").shift(1)).alias("_prev_val"),
+        )
+        .filter((pl.col("end") - pl.col("_prev_end")).dt.total_days().is_between(*QUARTER_GAP_DAYS))
+        .with_columns(as_derived(
+            pl.col("_prev_end") + pl.duration(days=1),
+            pl.col("val") - pl.col("_prev_val"),
+        ))
+        .select(internal)
+    )
+
+    # Per series and end: reported before derived, then the latest filing
+    quarters = (
+        pl.concat([reported.select(internal), from_ytd])
+        .sort(["_series", "end", "derived", "filed"], descending=[False, False, False, True], nulls_last=True)
+        .filter(pl.struct("_series", "end").is_first_distinct())
+    )
+
+    # Q4 = FY - (Q1 + Q2 + Q3) for years without a 9-month cumulative
+    annual = latest.filter(days.is_between(*ANNUAL_DAYS)).join(
+        quarters.select("_series", "end"), on=["_series", "end"], how="anti"
+    )
+    covered = (
+        annual.select("_series", pl.col("start").alias("_fy_start"), pl.col("end").alias("_fy_end"))
+        .join(quarters.select("_series", "start", "end", "val"), on="_series")
+        .filter((pl.col("start") >= pl.col("_fy_start")) & (pl.col("end") < pl.col("_fy_end")))
+        .group_by("_series", "_fy_end")
+        .agg(
+            pl.len().alias("_n"),
+            pl.col("val").sum().alias("_q_val"),
+            pl.col("end").max().alias("_q_end"),
+        )
+    )
+    from_annual = (
+        annual.join(covered, left_on=["_series", "end"], right_on=["_series", "_fy_end"])
+        .filter((pl.col("_n") == 3) & (pl.col("end") - pl.col("_q_end")).dt.total_days().is_between(*QUARTER_GAP_DAYS))
+        .with_columns(as_derived(
+            pl.col("_q_end") + pl.duration(days=1),
+            pl.col("val") - pl.col("_q_val"),
+        ))
+        .select(internal)
+    )
+
+    out = (
+        pl.concat([pl.concat([quarters, from_annual]).drop("_series"), instants])
+        .sort([*keys, "end"], nulls_last=True, maintain_order=True)
+        .collect()
+    )
+    if is_pandas:
+        return out.with_columns(
+            pl.col(c).cast(pl.Datetime("ns")) for c in ("start", "end", "filed") if c in schema
+        ).to_pandas()
+    return out if isinstance(facts, pl.DataFrame) else out.lazy()
@@ -0,0 +1,79 @@
+"""
+Thread-safe token-bucket rate limiting.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket shared by every thread that talks to one API.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``; each
+    request takes one, blocking only as long as needed instead of sleeping a
+    fixed amount before every call.
+
+    Args:
+        rate: Sustained requests per second
+        capacity: Burst size (defaults to one second's worth of tokens)
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are available. Returns seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """
+    Token bucket that backs off when the server says it is being hammered.
+
+    Every HTTP 429 halves the rate (down to ``min_rate``) and pauses the bucket
+    for any ``Retry-After`` the server sent; each success then creeps the rate
+    back towards ``max_rate``.
+
+    Args:
+        max_rate: Rate to start at and never exceed (requests per second)
+        min_rate: Floor the rate never drops below
+        recovery: Requests per second added back after each success
+    """
+
+    def __init__(self, max_rate: float, min_rate: float | None = None, recovery: float | None = None):
+        super().__init__(max_rate)
+        self.max_rate = max_rate
+        self.min_rate = min_rate if min_rate is not None else max_rate / 10
+        self.recovery = recovery if recovery is not None else max_rate / 50
+
+    def throttled(self, retry_after: float | None = None) -> None:
+        """Record a 429: halve the rate and drain the bucket for ``retry_after`` seconds."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0) - (retry_after or 0.0) * self.rate
+
+    def succeeded(self) -> None:
+        """Record a successful response: recover the rate additively."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.recovery)
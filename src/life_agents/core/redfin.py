@@ -0,0 +1,698 @@
+"""
+Redfin Data Center market tracker (city, ZIP, ... level housing metrics).
+
+The tracker files are gzipped TSVs of millions of rows. ``load_tracker``
+streams a local copy block by block and applies the region, property type
+and date predicates while parsing, so only matching rows of the requested
+columns are ever held in memory: strings as dictionary-encoded categoricals,
+dates as dates and metrics as float32. Filtering one city out of the full
+city tracker takes megabytes instead of gigabytes.
+
+``RedfinStore`` mirrors a tracker as a Parquet dataset partitioned by state
+and property type, with region labels dictionary-encoded. It is built once
+from the gzip and afterwards only periods newer than the stored maximum
+PERIOD_BEGIN are appended, so one metro's history is a millisecond read.
+A region index records which row groups hold each region, so region and
+city lookups read only those groups.
+
+Usage:
+    from life_agents.core.redfin import download_tracker, load_tracker
+
+    path = download_tracker("city")              # refreshed weekly
+    irvine = load_tracker(
+        path,
+        cities="Irvine",
+        states="CA",
+        property_types="Single Family Residential",
+        start="2023-01-01",
+    )
+
+    store = get_redfin_store("city")
+    store.refresh()                               # download + append new periods
+    oc = store.load(cities=["Irvine", "Tustin"], states="CA")
+"""
+
+import csv
+import datetime as dt
+import gzip
+import json
+import os
+import shutil
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .config import settings
+from .http import get_http_client
+
+REDFIN_BASE_URL = "https://redfin-public-data.s3.us-west-2.amazonaws.com/redfin_market_tracker"
+
+# Tracker name -> file
+TRACKER_FILES = {
+    "city": "city_market_tracker.tsv000.gz",
+    "zip": "zip_code_market_tracker.tsv000.gz",
+    "county": "county_market_tracker.tsv000.gz",
+    "metro": "redfin_metro_market_tracker.tsv000.gz",
+}
+
+DATE_COLUMNS = ["PERIOD_BEGIN", "PERIOD_END"]
+
+INTEGER_COLUMNS = [
+    "PERIOD_DURATION",
+    "REGION_TYPE_ID",
+    "TABLE_ID",
+    "PROPERTY_TYPE_ID",
+    "PARENT_METRO_REGION_METRO_CODE",
+]
+
+# Descriptive columns, dictionary-encoded (categoricals in pandas)
+LABEL_COLUMNS = [
+    "REGION_TYPE",
+    "IS_SEASONALLY_ADJUSTED",
+    "REGION",
+    "CITY",
+    "STATE",
+    "STATE_CODE",
+    "PROPERTY_TYPE",
+    "PARENT_METRO_REGION",
+]
+
+# Each metric comes with its month-over-month and year-over-year change
+BASE_METRICS = [
+    "MEDIAN_SALE_PRICE",
+    "MEDIAN_LIST_PRICE",
+    "MEDIAN_PPSF",
+    "MEDIAN_LIST_PPSF",
+    "HOMES_SOLD",
+    "PENDING_SALES",
+    "NEW_LISTINGS",
+    "INVENTORY",
+    "MONTHS_OF_SUPPLY",
+    "MEDIAN_DOM",
+    "AVG_SALE_TO_LIST",
+    "SOLD_ABOVE_LIST",
+    "PRICE_DROPS",
+    "OFF_MARKET_IN_TWO_WEEKS",
+]
+METRIC_COLUMNS = [f"{m}{suffix}" for m in BASE_METRICS for suffix in ("", "_MOM", "_YOY")]
+
+# Columns kept when none are requested
+DEFAULT_COLUMNS = [
+    "PERIOD_BEGIN",
+    "PERIOD_END",
+    "REGION",
+    "CITY",
+    "STATE_CODE",
+    "PROPERTY_TYPE",
+    "PARENT_METRO_REGION",
+    *METRIC_COLUMNS,
+]
+
+StrOrList = Optional[Union[str, Sequence[str]]]
+DateLike = Optional[Union[str, dt.date]]
+
+
+def _as_list(value: StrOrList) -> Optional[List[str]]:
+    if value is None:
+        return None
+    return [value] if isinstance(value, str) else list(value)
+
+
+def _column_type(name: str) -> pa.DataType:
+    if name in DATE_COLUMNS:
+        return pa.date32()
+    if name == "LAST_UPDATED":
+        return pa.timestamp("s")
+    if name in INTEGER_COLUMNS:
+        return pa.int32()
+    if name in METRIC_COLUMNS:
+        return pa.float32()
+    return pa.dictionary(pa.int32(), pa.string())
+
+
+def tracker_path(tracker: str = "city") -> Path:
+    """Local copy of a tracker file under ``DATA_DIR/redfin``."""
+    return settings.DATA_DIR / "redfin" / TRACKER_FILES[tracker]
+
+
+def download_tracker(
+    tracker: str = "city",
+    path: Optional[Path] = None,
+    max_age_hours: Optional[float] = None,
+) -> Path:
+    """
+    Download a tracker file to disk unless the local copy is recent enough.
+
+    The body is streamed to a temporary file and moved into place, so a
+    failed download never leaves a truncated copy behind.
+
+    Args:
+        tracker: One of TRACKER_FILES ('city', 'zip', 'county', 'metro')
+        path: Destination (defaults to tracker_path(tracker))
+        max_age_hours: Reuse a local copy younger than this (defaults to
+            settings.REDFIN_MAX_AGE_HOURS; 0 forces a download)
+
+    Returns:
+        Path of the local copy
+    """
+    path = Path(path) if path is not None else tracker_path(tracker)
+    max_age = settings.REDFIN_MAX_AGE_HOURS if max_age_hours is None else max_age_hours
+    if path.exists() and time.time() - path.stat().st_mtime < max_age * 3600:
+        return path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    response = get_http_client().get(f"{REDFIN_BASE_URL}/{TRACKER_FILES[tracker]}", stream=True, timeout=300)
+    response.raise_for_status()
+    try:
+        with open(tmp, "wb") as f:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+        os.replace(tmp, path)
+    finally:
+        response.close()
+        tmp.unlink(missing_ok=True)
+    return path
+
+
+def _header(path: Path) -> List[str]:
+    with gzip.open(path, "rt", newline="") as f:
+        return next(csv.reader(f, delimiter="\t"))
+
+
+def tracker_columns(path: Path) -> List[str]:
+    """Upper-case column names of a tracker file."""
+    return [name.upper() for name in _header(Path(path))]
+
+
+def iter_tracker(
+    path: Path,
+    regions: StrOrList = None,
+    cities: StrOrList = None,
+    states: StrOrList = None,
+    property_types: StrOrList = None,
+    start: DateLike = None,
+    end: DateLike = None,
+    columns: Optional[Sequence[str]] = None,
+    block_size: int = 4 << 20,
+) -> Iterator[pa.RecordBatch]:
+    """
+    Stream the matching rows of a tracker file as Arrow record batches.
+
+    Args:
+        path: Local gzipped TSV (see download_tracker)
+        regions: REGION values (e.g. 'Irvine, CA' or 'Zip Code: 92618')
+        cities: CITY values (e.g. 'Irvine')
+        states: STATE_CODE values (e.g. 'CA')
+        property_types: PROPERTY_TYPE values (e.g. 'Single Family Residential')
+        start: Earliest PERIOD_BEGIN (inclusive)
+        end: Latest PERIOD_BEGIN (inclusive)
+        columns: Columns to keep (default DEFAULT_COLUMNS); names are
+            upper-case whatever the file's header case
+        block_size: Bytes of decompressed text parsed per batch
+
+    Yields:
+        Non-empty record batches with upper-case column names
+    """
+    # Older files use lower-case headers; address columns by their upper-case name
+    header = {name.upper(): name for name in _header(Path(path))}
+    predicates = {
+        "REGION": _as_list(regions),
+        "CITY": _as_list(cities),
+        "STATE_CODE": _as_list(states),
+        "PROPERTY_TYPE": _as_list(property_types),
+    }
+    wanted = [c.upper() for c in (columns or DEFAULT_COLUMNS)]
+    needed = list(dict.fromkeys(
+        [*wanted, *(c for c, v in predicates.items() if v is not None),
+         *(["PERIOD_BEGIN"] if start is not None or end is not None else [])]
+    ))
+    missing = [c for c in needed if c not in header]
+    if missing:
+        raise ValueError(f"Columns not in {Path(path).name}: {missing}")
+
+    convert = pacsv.ConvertOptions(
+        include_columns=[header[c] for c in needed],
+        column_types={header[c]: _column_type(c) for c in needed},
+        strings_can_be_null=True,
+    )
+    reader = pacsv.open_csv(
+        pa.input_stream(str(path), compression="gzip"),
+        read_options=pacsv.ReadOptions(block_size=block_size),
+        parse_options=pacsv.ParseOptions(delimiter="\t"),
+        convert_options=convert,
+    )
+
+    start = pd.Timestamp(start).date() if start is not None else None
+    end = pd.Timestamp(end).date() if end is not None else None
+    for batch in reader:
+        batch = batch.rename_columns([name.upper() for name in batch.schema.names])
+        mask = None
+        for column, values in predicates.items():
+            if values is not None:
+                mask = _and(mask, pc.is_in(batch.column(column), value_set=pa.array(values)))
+        if start is not None:
+            mask = _and(mask, pc.greater_equal(batch.column("PERIOD_BEGIN"), pa.scalar(start)))
+        if end is not None:
+            mask = _and(mask, pc.less_equal(batch.column("PERIOD_BEGIN"), pa.scalar(end)))
+        if mask is not None:
+            batch = batch.filter(mask)
+        if batch.num_rows:
+            yield batch.select(wanted)
+
+
+def _and(mask, condition):
+    return condition if mask is None else pc.and_(mask, condition)
+
+
+def load_tracker(
+    path: Path,
+    regions: StrOrList = None,
+    cities: StrOrList = None,
+    states: StrOrList = None,
+    property_types: StrOrList = None,
+    start: DateLike = None,
+    end: DateLike = None,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Matching rows of a tracker file (see ``iter_tracker`` for the filters).
+
+    Returns:
+        DataFrame sorted by region, property type and period, with
+        categorical labels, datetime64 dates and float32 metrics
+    """
+    batches = list(iter_tracker(path, regions, cities, states, property_types, start, end, columns))
+    wanted = [c.upper() for c in (columns or DEFAULT_COLUMNS)]
+    return _to_pandas(pa.Table.from_batches(batches) if batches else None, wanted)
+
+
+def _to_pandas(table: Optional[pa.Table], columns: Sequence[str]) -> pd.DataFrame:
+    if table is None or table.num_rows == 0:
+        return pa.schema([(c, _column_type(c)) for c in columns]).empty_table().to_pandas()
+
+    # Labels come back as categoricals whether stored plain or dictionary-encoded;
+    # batches carry their own dictionaries, so unify them to share categories
+    table = table.combine_chunks()
+    for i, field in enumerate(table.schema):
+        if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            table = table.set_column(i, field.name, pc.dictionary_encode(table.column(i)))
+    df = table.unify_dictionaries().to_pandas(date_as_object=False)
+    order = [c for c in ("REGION", "PROPERTY_TYPE", "PERIOD_BEGIN") if c in df.columns]
+    return df.sort_values(order, ignore_index=True) if order else df
+
+
+# Hive partition columns of the Parquet mirror (values are URI-encoded, so
+# 'Condo/Co-op' stays one directory)
+PARTITION_COLUMNS = ["STATE_CODE", "PROPERTY_TYPE"]
+_PARTITIONING = ds.partitioning(pa.schema([(c, pa.string()) for c in PARTITION_COLUMNS]), flavor="hive")
+
+# Rows per Parquet row group; with rows sorted by region, a metro's history
+# falls in one or two groups and the rest are skipped on their statistics
+ROW_GROUP_ROWS = 8192
+
+# Rows buffered across partitions while building before they are spilled to disk
+SPILL_ROWS = 256 * 1024
+
+# Columns identifying one tracker row within a partition
+ROW_KEY_COLUMNS = ["REGION", "PERIOD_BEGIN", "PERIOD_DURATION", "IS_SEASONALLY_ADJUSTED"]
+
+
+def _partition_dir(key: Tuple[Optional[str], ...]) -> Path:
+    """Hive directory of a partition key, encoded the way pyarrow decodes it."""
+    return Path(*(
+        f"{column}={'__HIVE_DEFAULT_PARTITION__' if value is None else quote(value, safe='')}"
+        for column, value in zip(PARTITION_COLUMNS, key)
+    ))
+
+
+# Region index columns and their pandas dtypes (see RedfinStore.index)
+INDEX_COLUMNS = {
+    "STATE_CODE": "object",
+    "PROPERTY_TYPE": "object",
+    "REGION": "object",
+    "CITY": "object",
+    "ROWS": "int64",
+    "FIRST_PERIOD": "datetime64[ms]",
+    "LAST_PERIOD": "datetime64[ms]",
+    "ROW_GROUP_START": "int64",
+    "ROW_GROUP_END": "int64",
+}
+
+
+def _partition_key(directory: Path) -> Tuple[Optional[str], ...]:
+    """Partition key of a hive directory (inverse of ``_partition_dir``)."""
+    values = [part.split("=", 1)[1] for part in directory.parts[-len(PARTITION_COLUMNS):]]
+    return tuple(None if v == "__HIVE_DEFAULT_PARTITION__" else unquote(v) for v in values)
+
+
+def _split_partitions(batch: pa.RecordBatch) -> Iterator[Tuple[Tuple[Optional[str], ...], pa.RecordBatch]]:
+    """(partition key, rows without the partition columns) for each partition in ``batch``."""
+    keys = pa.Table.from_batches([batch.select(PARTITION_COLUMNS)]).group_by(PARTITION_COLUMNS).aggregate([])
+    data = batch.drop_columns(PARTITION_COLUMNS)
+    for key in keys.to_pylist():
+        mask = None
+        for column, value in key.items():
+            condition = pc.is_null(batch.column(column)) if value is None else pc.equal(batch.column(column), value)
+            mask = _and(mask, condition)
+        yield tuple(key[c] for c in PARTITION_COLUMNS), data.filter(mask)
+
+
+def _storage_type(name: str) -> pa.DataType:
+    # Labels are stored as plain strings (Parquet dictionary-encodes them on
+    # disk) so that filters on them are pushed down to row-group statistics
+    column_type = _column_type(name)
+    return pa.string() if pa.types.is_dictionary(column_type) else column_type
+
+
+class RedfinStore:
+    """
+    Parquet mirror of one Redfin tracker, partitioned by state and property type::
+
+        DATA_DIR/redfin/city/STATE_CODE=CA/PROPERTY_TYPE=Single%20Family%20Residential/data.parquet
+
+    Each partition is one file sorted by region and period. A refresh stages
+    the new rows per partition, then rewrites only the partitions that
+    received rows, each through a temporary file moved into place, and
+    re-indexes them (see ``index``). The refresh state is saved last, so a
+    refresh interrupted before then is redone in full on the next run and
+    its rows replace, rather than duplicate, the ones already merged.
+
+    Args:
+        tracker: One of TRACKER_FILES
+        root: Dataset directory (defaults to DATA_DIR/redfin/<tracker>)
+    """
+
+    def __init__(self, tracker: str = "city", root: Optional[Path] = None):
+        self.tracker = tracker
+        self.root = Path(root) if root is not None else settings.DATA_DIR / "redfin" / tracker
+        self._dataset: Optional[ds.Dataset] = None
+        self._index: Optional[pd.DataFrame] = None
+
+    @property
+    def _state_path(self) -> Path:
+        return self.root / "_refresh.json"
+
+    @property
+    def _index_path(self) -> Path:
+        return self.root / "_index.parquet"
+
+    def _state(self) -> dict:
+        if not self._state_path.exists():
+            return {}
+        return json.loads(self._state_path.read_text())
+
+    def dataset(self) -> Optional[ds.Dataset]:
+        """The stored dataset (discovered once per refresh), or None if empty."""
+        if self._dataset is None and any(self.root.glob("*=*/*=*/data.parquet")):
+            self._dataset = ds.dataset(self.root, format="parquet", partitioning=_PARTITIONING)
+        return self._dataset
+
+    def max_period(self) -> Optional[dt.date]:
+        """Latest PERIOD_BEGIN in the store."""
+        period = self._state().get("max_period_begin")
+        return dt.date.fromisoformat(period) if period else None
+
+    def refresh(self, source: Optional[Path] = None, download: bool = True) -> int:
+        """
+        Append periods newer than the stored maximum from a tracker file.
+
+        The source is only re-read when it changed since the last refresh.
+
+        Args:
+            source: Local tracker file (default: the downloaded copy)
+            download: Fetch a new copy first if the local one is stale
+                (see download_tracker); ignored when ``source`` is given
+
+        Returns:
+            Number of rows appended
+        """
+        if source is None:
+            source = download_tracker(self.tracker) if download else tracker_path(self.tracker)
+        source = Path(source)
+        state = self._state()
+        mtime = source.stat().st_mtime
+        if state.get("source_mtime") == mtime:
+            return 0
+
+        latest = self.max_period()
+        columns = tracker_columns(source)
+        schema = pa.schema([(c, _storage_type(c)) for c in columns])
+        batches = iter_tracker(source, start=latest + dt.timedelta(days=1) if latest else None, columns=columns)
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = self.root / f".staging-{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        rows, newest = 0, latest
+        writers: Dict[Tuple[str, ...], pq.ParquetWriter] = {}
+        pending: Dict[Tuple[str, ...], List[pa.RecordBatch]] = {}
+
+        def spill() -> None:
+            for key, parts in pending.items():
+                if key not in writers:
+                    path = staging / _partition_dir(key) / "part.parquet"
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    writers[key] = pq.ParquetWriter(path, parts[0].schema)
+                writers[key].write_table(pa.Table.from_batches(parts))
+            pending.clear()
+
+        try:
+            # Buffer blocks per partition and spill them to staging files in
+            # bounded chunks, so memory stays flat however large the source
+            buffered = 0
+            for batch in batches:
+                rows += batch.num_rows
+                batch_max = pc.max(batch.column("PERIOD_BEGIN")).as_py()
+                if batch_max and (newest is None or batch_max > newest):
+                    newest = batch_max
+                for key, part in _split_partitions(batch.cast(schema)):
+                    pending.setdefault(key, []).append(part)
+                buffered += batch.num_rows
+                if buffered >= SPILL_ROWS:
+                    spill()
+                    buffered = 0
+            spill()
+            for writer in writers.values():
+                writer.close()
+            for key in writers:
+                self._merge_partition(staging / _partition_dir(key), self.root / _partition_dir(key))
+            if writers:
+                self._update_index(list(writers))
+        finally:
+            for writer in writers.values():
+                writer.close()
+            shutil.rmtree(staging, ignore_errors=True)
+
+        state.update(
+            source_mtime=mtime,
+            max_period_begin=newest.isoformat() if newest else None,
+            refreshed_at=time.time(),
+        )
+        tmp = self._state_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, self._state_path)
+        self._dataset = None
+        return rows
+
+    @staticmethod
+    def _merge_partition(staged: Path, target: Path) -> None:
+        """
+        Rewrite ``target/data.parquet`` with the staged rows added, sorted by region and period.
+
+        Rows already stored under the same ROW_KEY_COLUMNS are replaced by the
+        staged ones, so re-applying a refresh interrupted before its state
+        was saved does not duplicate them.
+        """
+        path = target / "data.parquet"
+        parts = [pq.read_table(staged / "part.parquet")]
+        if path.exists():
+            parts.insert(0, pq.read_table(path))
+        table = pa.concat_tables(parts, promote_options="permissive")
+        row_keys = [c for c in ROW_KEY_COLUMNS if c in table.column_names]
+        if row_keys and len(parts) > 1:
+            # Staged rows come last, so the highest row number is the newest
+            numbered = table.append_column("_row", pa.array(np.arange(table.num_rows)))
+            newest = numbered.group_by(row_keys, use_threads=False).aggregate([("_row", "max")])
+            table = table.take(pc.sort_indices(newest["_row_max"]))
+        keys = [(c, "ascending") for c in ("REGION", "PERIOD_BEGIN") if c in table.column_names]
+        if keys:
+            table = table.sort_by(keys)
+
+        target.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        pq.write_table(table, tmp, row_group_size=ROW_GROUP_ROWS)
+        os.replace(tmp, path)
+
+    def index(self) -> pd.DataFrame:
+        """
+        Where each stored region lives: one row per (region, property type).
+
+        Written on refresh (and built on first use for a store without one),
+        so resolving and reading N regions touches only their row groups
+        instead of scanning the dataset once per region.
+
+        Returns:
+            DataFrame of STATE_CODE, PROPERTY_TYPE, REGION, CITY, ROWS,
+            FIRST_PERIOD, LAST_PERIOD and the [ROW_GROUP_START, ROW_GROUP_END)
+            range of the partition file holding the region's rows
+        """
+        if self._index is None:
+            if self._index_path.exists():
+                self._index = pq.read_table(self._index_path).to_pandas().astype(INDEX_COLUMNS)
+            else:
+                self._update_index()
+        return self._index
+
+    def _update_index(self, keys: Optional[List[Tuple[Optional[str], ...]]] = None) -> None:
+        """Re-index the given partitions (default: all) and write the index."""
+        paths = sorted(self.root.glob("*=*/*=*/data.parquet"))
+        keys = set(keys) if keys is not None and self._index_path.exists() else None
+        frames = []
+        if keys is not None:
+            kept = pq.read_table(self._index_path).to_pandas().astype(INDEX_COLUMNS)
+            stale = pd.Series(list(zip(*(kept[c] for c in PARTITION_COLUMNS))), dtype=object).isin(keys)
+            frames.append(kept[~stale.to_numpy()])
+        for path in paths:
+            key = _partition_key(path.parent)
+            if keys is None or key in keys:
+                frames.append(_index_partition(path, key))
+
+        index = pd.concat(frames, ignore_index=True) if frames else _index_partition(None, ())
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self._index_path.with_suffix(f".{os.getpid()}.tmp")
+        pq.write_table(pa.Table.from_pandas(index, preserve_index=False), tmp)
+        os.replace(tmp, self._index_path)
+        self._index = index
+
+    def _read_indexed(
+        self,
+        entries: pd.DataFrame,
+        columns: Sequence[str],
+        start: Optional[dt.date],
+        end: Optional[dt.date],
+    ) -> Optional[pa.Table]:
+        """Rows of the indexed regions, reading only the row groups that hold them."""
+        file_columns = [c for c in dict.fromkeys(["REGION", *columns]) if c not in PARTITION_COLUMNS]
+        tables = []
+        for key, group in entries.groupby(PARTITION_COLUMNS, dropna=False, sort=False):
+            key = tuple(None if pd.isna(v) else v for v in key)
+            row_groups = sorted({
+                g for first, last in zip(group["ROW_GROUP_START"], group["ROW_GROUP_END"])
+                for g in range(first, last)
+            })
+            source = pq.ParquetFile(self.root / _partition_dir(key) / "data.parquet")
+            table = source.read_row_groups(
+                row_groups, columns=[c for c in file_columns if c in source.schema_arrow.names]
+            )
+
+            mask = pc.is_in(table.column("REGION"), value_set=pa.array(group["REGION"].tolist()))
+            if start is not None:
+                mask = pc.and_(mask, pc.greater_equal(table.column("PERIOD_BEGIN"), pa.scalar(start)))
+            if end is not None:
+                mask = pc.and_(mask, pc.less_equal(table.column("PERIOD_BEGIN"), pa.scalar(end)))
+            table = table.filter(mask)
+            for column, value in zip(PARTITION_COLUMNS, key):
+                table = table.append_column(column, pa.array([value] * table.num_rows, pa.string()))
+            tables.append(table.select([c for c in columns if c in table.column_names]))
+        return pa.concat_tables(tables, promote_options="permissive") if tables else None
+
+    def load(
+        self,
+        regions: StrOrList = None,
+        cities: StrOrList = None,
+        states: StrOrList = None,
+        property_types: StrOrList = None,
+        start: DateLike = None,
+        end: DateLike = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Stored rows matching the filters (same filters and output as ``load_tracker``).
+
+        State and property type filters only open the matching partitions;
+        region and city filters are resolved through ``index`` and read only
+        the row groups holding those regions.
+        """
+        wanted = [c.upper() for c in (columns or DEFAULT_COLUMNS)]
+        dataset = self.dataset()
+        if dataset is None:
+            return _to_pandas(None, wanted)
+
+        if regions is not None or cities is not None:
+            entries = self.index()
+            for column, values in {
+                "REGION": regions,
+                "CITY": cities,
+                "STATE_CODE": states,
+                "PROPERTY_TYPE": property_types,
+            }.items():
+                if values is not None:
+                    entries = entries[entries[column].isin(_as_list(values))]
+            start = pd.Timestamp(start).date() if start is not None else None
+            end = pd.Timestamp(end).date() if end is not None else None
+            return _to_pandas(self._read_indexed(entries, wanted, start, end), wanted)
+
+        conditions = [
+            ds.field(column).isin(_as_list(values))
+            for column, values in {
+                "REGION": regions,
+                "CITY": cities,
+                "STATE_CODE": states,
+                "PROPERTY_TYPE": property_types,
+            }.items()
+            if values is not None
+        ]
+        if start is not None:
+            conditions.append(ds.field("PERIOD_BEGIN") >= pd.Timestamp(start).date())
+        if end is not None:
+            conditions.append(ds.field("PERIOD_BEGIN") <= pd.Timestamp(end).date())
+
+        condition = None
+        for c in conditions:
+            condition = c if condition is None else condition & c
+        return _to_pandas(dataset.to_table(columns=wanted, filter=condition), wanted)
+
+
+def _index_partition(path: Optional[Path], key: Tuple[Optional[str], ...]) -> pd.DataFrame:
+    """Index rows of one sorted partition file (an empty index for no path)."""
+    if path is None:
+        return pd.DataFrame({c: pd.Series(dtype=t) for c, t in INDEX_COLUMNS.items()})
+
+    source = pq.ParquetFile(path)
+    names = [c for c in ("REGION", "CITY", "PERIOD_BEGIN") if c in source.schema_arrow.names]
+    rows = source.read(columns=names).to_pandas(date_as_object=False)
+    if "CITY" not in rows:
+        rows["CITY"] = None
+    rows["_ROW"] = range(len(rows))
+    # Rows are sorted by region, so each region is one contiguous run of rows
+    index = rows.groupby("REGION", sort=False).agg(
+        CITY=("CITY", "first"),
+        ROWS=("_ROW", "size"),
+        FIRST_PERIOD=("PERIOD_BEGIN", "min"),
+        LAST_PERIOD=("PERIOD_BEGIN", "max"),
+        _FIRST=("_ROW", "min"),
+        _LAST=("_ROW", "max"),
+    ).reset_index()
+
+    ends = np.cumsum([source.metadata.row_group(i).num_rows for i in range(source.num_row_groups)])
+    index["ROW_GROUP_START"] = np.searchsorted(ends, index["_FIRST"], side="right")
+    index["ROW_GROUP_END"] = np.searchsorted(ends, index["_LAST"], side="right") + 1
+    for column, value in zip(PARTITION_COLUMNS, key):
+        index[column] = value
+    return index[list(INDEX_COLUMNS)].astype(INDEX_COLUMNS)
+
+
+@lru_cache(maxsize=None)
+def get_redfin_store(tracker: str = "city") -> RedfinStore:
+    """Shared RedfinStore for a tracker under DATA_DIR/redfin."""
+    return RedfinStore(tracker)
@@ -0,0 +1,348 @@
+"""
+Incremental SEC EDGAR sync for a watchlist of companies.
+
+For every tracked company the last seen accession number is kept in
+``DATA_DIR/sec/sync_state.json``. A sync revalidates the company's submissions
+feed (a 304 when nothing was filed), records any new filings in a per-company
+filing index, and merges only the XBRL facts from those new filings into the
+local facts store. The fiscal-calendar index and growth/margin features of
+companies with new facts are refreshed afterwards.
+
+The SEC publishes XBRL facts per company rather than per filing, so the
+companyfacts document is fetched only for companies with a new XBRL filing;
+a nightly watchlist refresh with no new filings costs one conditional request
+per company.
+
+Usage:
+    from life_agents.core.sec_sync import SecSync
+
+    sync = SecSync()
+    sync.sync(["SHOP", "MSFT"])      # adds them to the watchlist
+    sync.sync()                      # refresh the whole watchlist
+    filings = sync.load_filings("SHOP", forms=["10-Q", "10-K"])
+
+Or from the command line: ``life sec sync SHOP MSFT``.
+"""
+
+import datetime as dt
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import polars as pl
+
+from .config import settings
+from .facts_store import FactsStore, flatten_company_facts_bytes
+from .features import FeatureStore
+from .fiscal_calendar import FiscalCalendar
+
+SUBMISSIONS_URL = "https://data.sec.gov/submissions/CIK{cik}.json"
+ARCHIVES_ROOT = "https://www.sec.gov/Archives/edgar/data"
+
+# Forms whose XBRL financial statements appear in companyfacts
+FACT_FORMS = ["10-K", "10-Q", "20-F", "40-F", "10-K/A", "10-Q/A", "20-F/A", "40-F/A"]
+
+# Stop waiting for a filing's facts to appear in companyfacts after this long
+PENDING_DAYS = 14
+
+# Columns of the per-company filing index
+FILING_SCHEMA = {
+    "accession": pl.String,
+    "form": pl.String,
+    "filing_date": pl.Date,
+    "report_date": pl.Date,
+    "primary_document": pl.String,
+    "is_xbrl": pl.Boolean,
+    "url": pl.String,
+}
+
+
+@dataclass
+class SyncResult:
+    """Outcome of syncing one company."""
+    ticker: Optional[str]
+    cik: Optional[str]
+    new_filings: int = 0
+    new_facts: int = 0
+    full_refresh: bool = False
+    pending: int = 0
+    error: Optional[str] = None
+
+
+def parse_submissions(submissions: dict, cik: str) -> pl.DataFrame:
+    """
+    Filing index from a submissions document's ``filings.recent`` block (newest first).
+
+    Args:
+        submissions: Parsed ``submissions/CIK##########.json``
+        cik: Company CIK (used to build document URLs)
+
+    Returns:
+        DataFrame with the FILING_SCHEMA columns
+    """
+    recent = submissions.get("filings", {}).get("recent", {})
+    if not recent.get("accessionNumber"):
+        return pl.DataFrame(schema=FILING_SCHEMA)
+
+    archive_cik = str(int(cik))
+    return pl.DataFrame({
+        "accession": recent["accessionNumber"],
+        "form": recent["form"],
+        "filing_date": recent["filingDate"],
+        "report_date": recent.get("reportDate", [None] * len(recent["accessionNumber"])),
+        "primary_document": recent["primaryDocument"],
+        "is_xbrl": recent.get("isXBRL", [0] * len(recent["accessionNumber"])),
+    }).with_columns(
+        pl.col("filing_date").str.to_date(strict=False),
+        pl.col("report_date").replace("", None).str.to_date(strict=False),
+        pl.col("is_xbrl").cast(pl.Boolean),
+        pl.format(
+            f"{ARCHIVES_ROOT}/{archive_cik}/{{}}/{{}}",
+            pl.col("accession").str.replace_all("-", ""),
+            pl.col("primary_document"),
+        ).alias("url"),
+    ).select(list(FILING_SCHEMA))
+
+
+class SecSync:
+    """
+    Watchlist of companies kept in sync with EDGAR.
+
+    Args:
+        store: Facts store to update (defaults to DATA_DIR/sec/facts)
+        root: Directory for the sync state and filing indexes (defaults to DATA_DIR/sec)
+    """
+
+    def __init__(self, store: Optional[FactsStore] = None, root: Optional[Path] = None):
+        self.root = Path(root) if root is not None else settings.DATA_DIR / "sec"
+        self.store = store if store is not None else FactsStore(self.root / "facts")
+        self.state_path = self.root / "sync_state.json"
+        self.calendar = FiscalCalendar(self.store, self.root / "fiscal_calendar.parquet")
+        self.features = FeatureStore(self.store, self.root / "features")
+        self._lock = threading.Lock()
+        self.state: Dict[str, dict] = (
+            json.loads(self.state_path.read_text()) if self.state_path.exists() else {}
+        )
+
+    # -- watchlist -----------------------------------------------------------
+
+    def companies(self) -> pl.DataFrame:
+        """Tracked companies with their last seen accession and sync time."""
+        columns = ["cik", "ticker", "last_accession", "last_filed", "synced_at"]
+        return pl.DataFrame(
+            [[cik, *(entry.get(c) for c in columns[1:])] for cik, entry in sorted(self.state.items())],
+            schema={c: pl.String for c in columns},
+            orient="row",
+        )
+
+    def untrack(self, tickers_or_ciks: Iterable[str]) -> None:
+        """Remove companies from the watchlist (their stored data is kept)."""
+        for item in tickers_or_ciks:
+            cik = self._resolve(item)
+            if cik:
+                self.state.pop(cik, None)
+        self._save_state()
+
+    def _resolve(self, item: str) -> Optional[str]:
+        from .utils import get_cik_from_ticker
+
+        return str(item).zfill(10) if str(item).isdigit() else get_cik_from_ticker(item)
+
+    def _save_state(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(f".{os.getpid()}.tmp")
+        with self._lock:
+            tmp.write_text(json.dumps(self.state, indent=2, sort_keys=True))
+        os.replace(tmp, self.state_path)
+
+    # -- filings -------------------------------------------------------------
+
+    def filings_path(self, cik: str) -> Path:
+        """Parquet filing index for ``cik``."""
+        return self.root / "filings" / f"cik={str(cik).zfill(10)}" / "filings.parquet"
+
+    def load_filings(self, ticker_or_cik: str, forms: Optional[Iterable[str]] = None) -> pl.DataFrame:
+        """
+        Stored filing index for a company, newest first.
+
+        Args:
+            ticker_or_cik: Ticker ('SHOP') or CIK
+            forms: Restrict to these forms (e.g. ['10-Q', '10-K'])
+
+        Returns:
+            DataFrame with the FILING_SCHEMA columns (empty if never synced)
+        """
+        cik = self._resolve(ticker_or_cik)
+        path = self.filings_path(cik) if cik else None
+        if path is None or not path.exists():
+            return pl.DataFrame(schema=FILING_SCHEMA)
+        filings = pl.read_parquet(path)
+        if forms is not None:
+            filings = filings.filter(pl.col("form").is_in(list(forms)))
+        return filings
+
+    def fetch_recent_filings(self, cik: str) -> pl.DataFrame:
+        """
+        Filings listed in the company's submissions feed (up to the latest 1000).
+
+        The feed is always revalidated, but an unchanged feed is a 304 served
+        from the disk cache.
+        """
+        from .utils import fetch_sec_bytes
+
+        submissions = json.loads(fetch_sec_bytes(SUBMISSIONS_URL.format(cik=cik), max_age=0))
+        return parse_submissions(submissions, cik)
+
+    def update_filings(self, cik: str, recent: Optional[pl.DataFrame] = None) -> pl.DataFrame:
+        """
+        Merge filings from the submissions feed into the stored index.
+
+        Only the index is updated; ``sync_company`` merges the facts of
+        filings made since the last sync whether or not they are indexed yet.
+
+        Args:
+            cik: 10-digit CIK
+            recent: Already fetched feed (fetched when omitted)
+
+        Returns:
+            Filings not previously in the index, newest first
+        """
+        recent = self.fetch_recent_filings(cik) if recent is None else recent
+        stored = self.load_filings(cik)
+        new = recent.filter(~pl.col("accession").is_in(stored["accession"].to_list()))
+        if new.height:
+            path = self.filings_path(cik)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            (
+                pl.concat([new, stored])
+                .sort("filing_date", descending=True, maintain_order=True)
+                .write_parquet(tmp)
+            )
+            os.replace(tmp, path)
+        return new
+
+    # -- sync ----------------------------------------------------------------
+
+    def sync_company(self, ticker_or_cik: str, full: bool = False) -> SyncResult:
+        """
+        Bring one company's filing index and facts up to date.
+
+        The first sync (or ``full=True``, or a gap longer than the submissions
+        feed) stores the complete facts history; later syncs merge only the
+        facts reported by 10-K/10-Q-type filings made since the last
+        successful sync. Filings whose facts the SEC has not published yet are
+        retried for PENDING_DAYS.
+
+        Args:
+            ticker_or_cik: Ticker ('SHOP') or CIK
+            full: Replace the stored facts with the full history
+
+        Returns:
+            SyncResult; failures are reported in ``error`` rather than raised
+        """
+        from .utils import company_facts_url, fetch_sec_bytes
+        from .tickers import get_ticker_index
+
+        cik = self._resolve(ticker_or_cik)
+        ticker = str(ticker_or_cik).upper() if not str(ticker_or_cik).isdigit() else None
+        if not cik:
+            return SyncResult(ticker, None, error="unknown ticker")
+        entry = dict(self.state.get(cik, {}))
+        result = SyncResult(ticker or entry.get("ticker"), cik)
+
+        try:
+            ticker = result.ticker = result.ticker or get_ticker_index().ticker(cik)
+            recent = self.fetch_recent_filings(cik)
+            new = self.update_filings(cik, recent)
+            result.new_filings = new.height
+
+            # A gap longer than the feed means filings may have been missed
+            last = entry.get("last_accession")
+            full = (
+                full or last is None
+                or not self.store.partition_path(cik).exists()
+                or last not in recent["accession"].to_list()
+            )
+
+            if full:
+                payload = fetch_sec_bytes(company_facts_url(cik), max_age=0)
+                facts = flatten_company_facts_bytes(payload, cik)
+                self.store.write_company(facts, cik)
+                result.full_refresh = True
+                result.new_facts = facts.height
+                pending = []
+            else:
+                cutoff = dt.date.today() - dt.timedelta(days=PENDING_DAYS)
+                wanted = set(
+                    self.load_filings(cik)
+                    .filter(
+                        pl.col("accession").is_in(entry.get("pending", []))
+                        & (pl.col("filing_date") >= cutoff)
+                    )["accession"].to_list()
+                )
+                # Everything the feed lists above the last synced filing, not
+                # just what is new to the filing index: the index may already
+                # hold filings whose facts were never merged (an earlier sync
+                # failed after indexing them, or update_filings ran on its own)
+                unseen = recent.head(recent["accession"].to_list().index(last))
+                result.new_filings = unseen.height
+                wanted.update(
+                    unseen.filter(pl.col("is_xbrl") & pl.col("form").is_in(FACT_FORMS))["accession"].to_list()
+                )
+                pending = []
+                if wanted:
+                    payload = fetch_sec_bytes(company_facts_url(cik), max_age=0)
+                    facts = flatten_company_facts_bytes(payload, cik)
+                    facts = facts.filter(pl.col("accn").is_in(list(wanted)))
+                    if facts.height:
+                        self.store.append_company(facts, cik)
+                    result.new_facts = facts.height
+                    pending = sorted(wanted - set(facts["accn"].unique().to_list()))
+            result.pending = len(pending)
+
+            latest = self.load_filings(cik).head(1)
+            entry.update(
+                ticker=ticker,
+                last_accession=latest["accession"][0] if latest.height else last,
+                last_filed=str(latest["filing_date"][0]) if latest.height else entry.get("last_filed"),
+                pending=pending,
+                synced_at=dt.datetime.now().isoformat(timespec="seconds"),
+            )
+            with self._lock:
+                self.state[cik] = entry
+        except Exception as e:
+            result.error = str(e)
+        return result
+
+    def sync(
+        self,
+        tickers_or_ciks: Optional[Iterable[str]] = None,
+        full: bool = False,
+        max_workers: int = 8,
+    ) -> List[SyncResult]:
+        """
+        Sync the given companies (adding them to the watchlist) or the whole watchlist.
+
+        Args:
+            tickers_or_ciks: Companies to sync (default: every tracked company)
+            full: Replace stored facts with the full history
+            max_workers: Companies synced concurrently (requests share the SEC rate limit)
+
+        Returns:
+            One SyncResult per company
+        """
+        items = list(tickers_or_ciks) if tickers_or_ciks else list(self.state)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(lambda item: self.sync_company(item, full), items))
+        self._save_state()
+
+        changed = [r.cik for r in results if r.new_facts]
+        if changed:
+            self.calendar.build(changed)
+            self.features.update(changed)
+        return results
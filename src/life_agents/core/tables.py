@@ -0,0 +1,228 @@
+"""
+Combine per-metric fact frames into one wide table.
+
+Each metric frame (one row per reported period, as returned by the SEC
+extraction helpers) is reduced to its key and value columns, stacked with a
+single ``concat`` and pivoted on the key columns. ``append_metrics`` merges new
+periods into an existing wide table without rebuilding it. ``join_statements``
+aligns whole statement frames (income, balance sheet, ...) side by side on a
+shared key.
+
+Usage:
+    from life_agents.core.tables import combine_metrics, append_metrics
+
+    wide = combine_metrics({"revenue": revenue_df, "net_income": net_income_df})
+
+    # Later, after a new quarter is filed
+    wide = append_metrics(wide, {"revenue": latest_revenue_df})
+
+    unified = join_statements({"income": income_df, "balance": balance_df}, on="date")
+"""
+
+from typing import Mapping, Optional, Sequence, Union
+
+import pandas as pd
+
+# Output key column -> source column in each metric frame
+PERIOD_KEYS = {"period_end": "end"}
+
+# How join_statements resolves a column present in several statements
+CONFLICT_RULES = ("first", "last", "coalesce", "suffix")
+
+
+def stack_metrics(
+    metrics: Mapping[str, pd.DataFrame],
+    keys: Mapping[str, str] = PERIOD_KEYS,
+    value_col: str = "val",
+    extra: Optional[Mapping[str, str]] = None,
+) -> pd.DataFrame:
+    """
+    Stack metric frames into long format (keys..., metric, value, extras...).
+
+    Args:
+        metrics: Metric name -> frame with the key and value columns
+        keys: Output key column -> source column (e.g. add {"ticker": "ticker"}
+            to combine several companies)
+        value_col: Column holding the metric value
+        extra: Output column -> source column to carry along (e.g. the XBRL tag)
+
+    Returns:
+        Long DataFrame; empty if no metric has rows
+    """
+    columns = {**keys, "value": value_col, **(extra or {})}
+    parts = []
+    for name, df in metrics.items():
+        if df is None or df.empty:
+            continue
+        part = df.reindex(columns=list(columns.values()))
+        part.columns = list(columns)
+        parts.append(part.assign(metric=name))
+
+    if not parts:
+        return pd.DataFrame()
+    return pd.concat(parts, ignore_index=True)
+
+
+def combine_metrics(
+    metrics: Mapping[str, pd.DataFrame],
+    keys: Mapping[str, str] = PERIOD_KEYS,
+    value_col: str = "val",
+    sort_by: Optional[str] = "period_end",
+) -> pd.DataFrame:
+    """
+    Combine metric frames into a wide table: one row per key, one column per metric.
+
+    The first non-null value is kept when a metric reports the same key twice.
+
+    Args:
+        metrics: Metric name -> frame with the key and value columns
+        keys: Output key column -> source column
+        value_col: Column holding the metric value
+        sort_by: Key column to sort by, newest first (None to leave unsorted)
+
+    Returns:
+        DataFrame with the key columns followed by one column per metric
+    """
+    long = stack_metrics(metrics, keys, value_col)
+    if long.empty:
+        return pd.DataFrame()
+
+    index = list(keys)
+    long = long.dropna(subset=["value"]).drop_duplicates(subset=[*index, "metric"])
+    wide = long.set_index([*index, "metric"])["value"].unstack("metric")
+    wide = wide.reindex(columns=[m for m in metrics if m in wide.columns]).reset_index()
+    wide.columns.name = None
+
+    if sort_by is not None:
+        wide = wide.sort_values(sort_by, ascending=False, ignore_index=True)
+    return wide
+
+
+def append_metrics(
+    wide: pd.DataFrame,
+    metrics: Mapping[str, pd.DataFrame],
+    keys: Mapping[str, str] = PERIOD_KEYS,
+    value_col: str = "val",
+    sort_by: Optional[str] = "period_end",
+) -> pd.DataFrame:
+    """
+    Merge newly reported values into a table built by ``combine_metrics``.
+
+    Only the new rows are pivoted. Keys already in ``wide`` are updated in
+    place (new non-null values win, other metrics are kept); new keys are
+    prepended, and the table is only re-sorted if they arrive out of order.
+
+    Args:
+        wide: Existing wide table
+        metrics: Metric name -> frame with only the new/restated periods
+        keys: Output key column -> source column (must match ``wide``)
+        value_col: Column holding the metric value
+        sort_by: Key column the table is sorted by, newest first
+
+    Returns:
+        Updated wide table
+    """
+    new = combine_metrics(metrics, keys, value_col, sort_by)
+    if new.empty:
+        return wide
+    if wide is None or wide.empty:
+        return new
+
+    index = list(keys)
+    old = wide.set_index(index)
+    new = new.set_index(index)
+
+    added_columns = [c for c in new.columns if c not in old.columns]
+    if added_columns:
+        old = old.reindex(columns=[*old.columns, *added_columns])
+
+    existing = new.index.isin(old.index)
+    if existing.any():
+        old = old.copy()
+        old.update(new[existing])
+
+    out = pd.concat([new[~existing].reindex(columns=old.columns), old]).reset_index()
+    if sort_by is not None and not out[sort_by].is_monotonic_decreasing:
+        out = out.sort_values(sort_by, ascending=False, ignore_index=True)
+    return out
+
+
+def join_statements(
+    statements: Mapping[str, pd.DataFrame],
+    on: Union[str, Sequence[str]] = "date",
+    how: str = "left",
+    conflict: str = "first",
+    ascending: bool = False,
+) -> pd.DataFrame:
+    """
+    Align statement frames on a shared key in one pass.
+
+    Each frame is indexed by the key once, reindexed onto the output keys and
+    reduced to the columns it contributes; all of them are then joined with a
+    single column-wise ``concat``, instead of re-merging an ever wider frame
+    once per statement.
+
+    Args:
+        statements: Statement name -> frame with the key columns; earlier
+            statements take precedence. Empty or None frames are skipped.
+        on: Key column(s), e.g. 'date' or ['symbol', 'date'] for several tickers
+        how: 'left' keeps the keys of the first statement, 'outer' their union
+        conflict: Rule for a column found in several statements:
+            'first' keeps the earliest statement's column,
+            'last' the latest one's,
+            'coalesce' takes the first non-null value per row in statement order,
+            'suffix' keeps them all, renaming later ones to '{column}_{statement}'
+        ascending: Sort order of the key (newest first by default)
+
+    Returns:
+        DataFrame with the key columns followed by the statement columns;
+        the first row per key is used when a statement repeats a key
+    """
+    if how not in ("left", "outer"):
+        raise ValueError(f"how must be 'left' or 'outer', not {how!r}")
+    if conflict not in CONFLICT_RULES:
+        raise ValueError(f"conflict must be one of {CONFLICT_RULES}, not {conflict!r}")
+
+    keys = [on] if isinstance(on, str) else list(on)
+    frames = {}
+    for name, df in statements.items():
+        if df is None or df.empty:
+            continue
+        df = df.set_index(keys)
+        frames[name] = df if df.index.is_unique else df[~df.index.duplicated()]
+    if not frames:
+        return pd.DataFrame(columns=keys)
+
+    indexes = [df.index for df in frames.values()]
+    index = indexes[0]
+    if how == "outer":
+        for other in indexes[1:]:
+            index = index.union(other)
+    index = index.sort_values(ascending=ascending)
+
+    # Column -> statements that have it, in precedence order
+    sources = {}
+    for name, df in frames.items():
+        for column in df.columns:
+            sources.setdefault(column, []).append(name)
+    owner = {c: names[-1] if conflict == "last" else names[0] for c, names in sources.items()}
+
+    # Reindex each statement once, restricted to the columns it contributes
+    blocks = []
+    for name, df in frames.items():
+        if conflict == "suffix":
+            block = df.rename(columns={c: f"{c}_{name}" for c in df.columns if owner[c] != name})
+        else:
+            block = df[[c for c in df.columns if owner[c] == name]]
+        if not block.columns.empty:
+            blocks.append(block if block.index.equals(index) else block.reindex(index))
+    out = pd.concat(blocks, axis=1)
+
+    if conflict == "coalesce":
+        for column, names in sources.items():
+            for name in names[1:]:
+                out[column] = out[column].fillna(frames[name][column].reindex(index))
+    elif conflict == "last":
+        out = out[list(sources)]
+    out.index.names = keys
+    return out.reset_index()
@@ -0,0 +1,121 @@
+"""
+Process-wide ticker <-> CIK index for SEC EDGAR lookups.
+
+The full ``company_tickers.json`` map is loaded at most once per process (and
+persisted through the SEC disk cache), and a small table of common companies
+answers the usual lookups without touching the network at all.
+"""
+
+import json
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from .config import settings
+
+TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+
+# Common CIKs for quick access (warm seed, no network needed)
+COMMON_CIKS = {
+    "SHOP": "0001594805",  # Shopify
+    "AAPL": "0000320193",  # Apple
+    "MSFT": "0000789019",  # Microsoft
+    "GOOGL": "0001652044", # Alphabet
+    "AMZN": "0001018724",  # Amazon
+    "META": "0001326801",  # Meta
+    "NVDA": "0001045810",  # NVIDIA
+    "TSLA": "0001318605",  # Tesla
+}
+
+
+class TickerIndex:
+    """
+    O(1) ticker -> CIK and CIK -> ticker/name lookups.
+
+    Seeded from ``COMMON_CIKS``; the full SEC table is only loaded the first time
+    a lookup misses, and is re-read from the SEC cache once it is older than
+    ``refresh_hours``.
+
+    Args:
+        seed: Ticker -> 10-digit CIK pairs known without a download
+        refresh_hours: How long a loaded table is trusted before revalidating
+    """
+
+    def __init__(
+        self,
+        seed: Optional[Dict[str, str]] = None,
+        refresh_hours: Optional[float] = None,
+    ):
+        self.refresh_hours = (
+            settings.SEC_TICKERS_REFRESH_HOURS if refresh_hours is None else refresh_hours
+        )
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._by_ticker: Dict[str, str] = {}
+        self._by_cik: Dict[str, Tuple[str, Optional[str]]] = {}
+        for ticker, cik in (COMMON_CIKS if seed is None else seed).items():
+            self._add(ticker, cik, None)
+
+    def _add(self, ticker: str, cik, name: Optional[str]) -> None:
+        ticker = ticker.upper()
+        cik = str(cik).zfill(10)
+        self._by_ticker[ticker] = cik
+        # company_tickers.json lists a company's primary ticker first
+        if cik not in self._by_cik or self._by_cik[cik][1] is None:
+            self._by_cik[cik] = (ticker, name)
+
+    def load(self, force: bool = False) -> None:
+        """Load the full SEC ticker table (from the disk cache when fresh)."""
+        from .utils import fetch_sec_bytes
+
+        with self._lock:
+            if self._is_current() and not force:
+                return
+            max_age = 0 if force else self.refresh_hours * 3600
+            data = json.loads(fetch_sec_bytes(TICKERS_URL, max_age=max_age))
+            for entry in data.values():
+                self._add(entry["ticker"], entry["cik_str"], entry.get("title"))
+            self._loaded_at = time.time()
+
+    def _is_current(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.time() - self._loaded_at < self.refresh_hours * 3600
+        )
+
+    def cik(self, ticker: str) -> Optional[str]:
+        """10-digit CIK for ``ticker``, or None if the SEC does not list it."""
+        ticker = ticker.upper()
+        if ticker not in self._by_ticker and not self._is_current():
+            self.load()
+        return self._by_ticker.get(ticker)
+
+    def ticker(self, cik) -> Optional[str]:
+        """Primary ticker for ``cik``, or None if unknown."""
+        cik = str(cik).zfill(10)
+        if cik not in self._by_cik and not self._is_current():
+            self.load()
+        entry = self._by_cik.get(cik)
+        return entry[0] if entry else None
+
+    def name(self, cik) -> Optional[str]:
+        """Registrant name for ``cik`` as listed by the SEC, or None if unknown."""
+        cik = str(cik).zfill(10)
+        entry = self._by_cik.get(cik)
+        if (entry is None or entry[1] is None) and not self._is_current():
+            self.load()
+            entry = self._by_cik.get(cik)
+        return entry[1] if entry else None
+
+    def __contains__(self, ticker: str) -> bool:
+        return self.cik(ticker) is not None
+
+    def __len__(self) -> int:
+        return len(self._by_ticker)
+
+
+@lru_cache(maxsize=1)
+def get_ticker_index() -> TickerIndex:
+    """Shared TickerIndex for the current process."""
+    return TickerIndex()
@@ -1,10 +1,18 @@
 import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 import requests
 import pandas as pd
-from typing import Optional
-import time
+from typing import Dict, Iterable, List, Optional
+
+from .cache import DiskCache
+from .companyfacts import CompanyFacts
+from .config import settings
+from .http import get_http_client
+from .tickers import get_ticker_index
 
 def load_env_vars() -> dict:
     """
@@ -34,32 +42,120 @@ def get_cik_from_ticker(ticker: str) -> Optional[str]:
     Returns:
         10-digit CIK string with leading zeros, or None if not found
     """
-    # SEC maintains a ticker to CIK mapping JSON file
-    url = "https://www.sec.gov/files/company_tickers.json"
-    headers = {'User-Agent': 'bryan smith me@brybrydataguy.com'}  # SEC requires User-Agent
-
+    # SEC maintains a ticker to CIK mapping JSON file; the shared index loads it
+    # once per process and answers common tickers without any download
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-
-        # Search for the ticker in the data
-        for entry in data.values():
-            if entry['ticker'].upper() == ticker.upper():
-                # Return CIK padded to 10 digits
-                return str(entry['cik_str']).zfill(10)
-
-        return None
+        return get_ticker_index().cik(ticker)
     except Exception as e:
         print(f"Error fetching CIK for {ticker}: {e}")
         return None
 
 
+@lru_cache(maxsize=1)
+def get_sec_cache() -> DiskCache:
+    """Process-wide cache for SEC EDGAR payloads under ``DATA_DIR/cache/sec``."""
+    return DiskCache(
+        settings.DATA_DIR / "cache" / "sec",
+        ttl=settings.SEC_CACHE_TTL_HOURS * 3600,
+        max_bytes=settings.SEC_CACHE_MAX_MB * 1024 * 1024,
+    )
+
+
+def fetch_sec_bytes(url: str, max_age: Optional[float] = None) -> bytes:
+    """
+    Fetch a raw SEC EDGAR payload through the on-disk cache.
+
+    Fresh entries are read from disk without touching the network. Stale entries
+    are revalidated with ``If-None-Match`` / ``If-Modified-Since`` so an unchanged
+    document costs a 304 instead of a full download.
+
+    Args:
+        url: SEC URL (e.g., a companyfacts or submissions endpoint)
+        max_age: Override the cache TTL in seconds (0 forces revalidation)
+
+    Returns:
+        Response body as bytes
+    """
+    cache = get_sec_cache()
+    ttl = cache.ttl if max_age is None else max_age
+
+    entry = cache.lookup(url)
+    if entry and entry.is_fresh(ttl):
+        return cache.read(entry)
+
+    headers = {'User-Agent': settings.SEC_USER_AGENT}
+    if entry and entry.etag:
+        headers['If-None-Match'] = entry.etag
+    if entry and entry.last_modified:
+        headers['If-Modified-Since'] = entry.last_modified
+
+    # The shared client keeps connections alive and rate limits SEC to 10 req/s
+    response = get_http_client().get(url, headers=headers, timeout=60)
+    if response.status_code == 304 and entry:
+        return cache.read(cache.revalidated(entry))
+    response.raise_for_status()
+
+    cache.store(
+        url,
+        response.content,
+        etag=response.headers.get('ETag'),
+        last_modified=response.headers.get('Last-Modified'),
+    )
+    return response.content
+
+
+def company_facts_url(cik: str) -> str:
+    """companyfacts API URL for ``cik``."""
+    return f"https://data.sec.gov/api/xbrl/companyfacts/CIK{str(cik).zfill(10)}.json"
+
+
+def fetch_company_facts(
+    cik: str,
+    max_age: Optional[float] = None,
+    concepts: Optional[Iterable[str]] = None,
+    taxonomy: str = "us-gaap",
+    units: Optional[Iterable[str]] = None,
+) -> dict:
+    """
+    Fetch every XBRL fact a company has filed, served from the local cache when fresh.
+
+    Args:
+        cik: CIK with or without leading zeros
+        max_age: Override the cache TTL in seconds (0 forces revalidation)
+        concepts: Only decode these concept tags (much faster and lighter for
+            large filers); None decodes the whole document
+        taxonomy: Taxonomy of ``concepts``
+        units: Only keep these units of ``concepts`` (default: all)
+
+    Returns:
+        Parsed companyfacts JSON document (pruned to ``concepts`` when given)
+    """
+    payload = fetch_sec_bytes(company_facts_url(cik), max_age=max_age)
+    if concepts is None:
+        return json.loads(payload)
+    return CompanyFacts(payload).select(concepts, taxonomy, units)
+
+
+def fetch_company_facts_index(cik: str, max_age: Optional[float] = None) -> CompanyFacts:
+    """
+    Fetch a company's facts as a lazily decoded ``CompanyFacts`` view.
+
+    Args:
+        cik: CIK with or without leading zeros
+        max_age: Override the cache TTL in seconds (0 forces revalidation)
+
+    Returns:
+        CompanyFacts over the cached payload
+    """
+    return CompanyFacts(fetch_sec_bytes(company_facts_url(cik), max_age=max_age))
+
+
 def get_sec_financial_concept(
     ticker: str,
     concept: str,
     taxonomy: str = "us-gaap",
-    units: str = "USD"
+    units: str = "USD",
+    max_age: Optional[float] = None
 ) -> pd.DataFrame:
     """
     Fetch time series data for a financial concept from SEC EDGAR Company Facts API.
@@ -73,6 +169,7 @@ def get_sec_financial_concept(
         taxonomy: XBRL taxonomy namespace (default: 'us-gaap' for US GAAP)
                  Other options: 'dei', 'srt', or company-specific
         units: Unit of measurement (default: 'USD', other options: 'shares', 'pure')
+        max_age: Override the companyfacts cache TTL in seconds (0 forces revalidation)
 
     Returns:
         DataFrame with columns:
@@ -102,6 +199,8 @@ def get_sec_financial_concept(
 
     Note:
         - SEC rate limits to 10 requests per second
+        - Company facts are cached under DATA_DIR/cache/sec, so repeated lookups
+          for the same company are a local read (see SEC_CACHE_TTL_HOURS)
         - Data availability depends on company's XBRL tagging
         - Some companies may use custom taxonomies for certain concepts
     """
@@ -110,40 +209,30 @@ def get_sec_financial_concept(
     if not cik:
         raise ValueError(f"Could not find CIK for ticker: {ticker}")
 
-    # Build SEC Company Facts API URL
-    url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
-    headers = {'User-Agent': 'life-agents bryan@example.com'}  # SEC requires User-Agent
-
-    # Rate limiting: SEC allows 10 requests per second
-    time.sleep(0.11)
-
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        facts = response.json()
+        # Only the requested concept is decoded out of the cached document
+        facts = fetch_company_facts_index(cik, max_age=max_age)
 
         # Navigate to the specific concept
-        if taxonomy not in facts['facts']:
-            available = list(facts['facts'].keys())
+        if taxonomy not in facts.taxonomies():
+            available = facts.taxonomies()
             raise ValueError(f"Taxonomy '{taxonomy}' not found. Available: {available}")
 
-        if concept not in facts['facts'][taxonomy]:
+        if concept not in facts.concepts(taxonomy):
             # Show available concepts for this taxonomy
-            available = list(facts['facts'][taxonomy].keys())
+            available = facts.concepts(taxonomy)
             raise ValueError(
                 f"Concept '{concept}' not found in {taxonomy}. "
                 f"Available concepts (first 10): {available[:10]}"
             )
 
-        concept_data = facts['facts'][taxonomy][concept]
-
         # Get units data
-        if units not in concept_data['units']:
-            available = list(concept_data['units'].keys())
+        if units not in facts.units(concept, taxonomy):
+            available = facts.units(concept, taxonomy)
             raise ValueError(f"Units '{units}' not found. Available: {available}")
 
         # Convert to DataFrame
-        df = pd.DataFrame(concept_data['units'][units])
+        df = pd.DataFrame(facts.facts(concept, taxonomy, units))
 
         # Convert end date to datetime
         df['end'] = pd.to_datetime(df['end'])
@@ -159,3 +248,80 @@ def get_sec_financial_concept(
         raise
     except Exception as e:
         raise Exception(f"Error fetching SEC data for {ticker}: {e}")
+
+
+def get_sec_financial_concepts(
+    tickers: Iterable[str],
+    concepts: Iterable[str],
+    taxonomy: str = "us-gaap",
+    units: str = "USD",
+    max_age: Optional[float] = None,
+    max_workers: int = 8
+) -> pd.DataFrame:
+    """
+    Fetch several concepts for several companies in one call.
+
+    Each company's facts document is fetched once (concurrently across companies,
+    under the shared SEC rate limiter) and every requested concept is pulled out
+    of that single document.
+
+    Args:
+        tickers: Stock ticker symbols (e.g., ['MSFT', 'GOOGL', 'AMZN', 'META'])
+        concepts: XBRL concept tags (e.g., ['Revenues', 'PaymentsToAcquirePropertyPlantAndEquipment'])
+        taxonomy: XBRL taxonomy namespace (default: 'us-gaap')
+        units: Unit of measurement (default: 'USD')
+        max_age: Override the companyfacts cache TTL in seconds (0 forces revalidation)
+        max_workers: Companies fetched in parallel
+
+    Returns:
+        Long-format DataFrame with one row per fact and columns ticker, cik,
+        concept, plus the usual SEC fact columns (end, val, accn, fy, fp, form,
+        filed, frame, and start for duration concepts). Concepts a company does
+        not report are simply absent; tickers that fail are reported and skipped.
+
+    Example:
+        capex = get_sec_financial_concepts(
+            ['MSFT', 'GOOGL', 'AMZN', 'META'],
+            ['PaymentsToAcquirePropertyPlantAndEquipment']
+        )
+        annual = capex[capex['form'] == '10-K']
+    """
+    tickers = [t.upper() for t in dict.fromkeys(tickers)]
+    concepts = list(dict.fromkeys(concepts))
+
+    def fetch_one(ticker: str) -> list[pd.DataFrame]:
+        cik = get_cik_from_ticker(ticker)
+        if not cik:
+            raise ValueError(f"Could not find CIK for ticker: {ticker}")
+        facts = fetch_company_facts_index(cik, max_age=max_age)
+
+        frames = []
+        for concept in concepts:
+            rows = facts.facts(concept, taxonomy, units)
+            if not rows:
+                continue
+            df = pd.DataFrame(rows)
+            df.insert(0, 'concept', concept)
+            df.insert(0, 'cik', cik)
+            df.insert(0, 'ticker', ticker)
+            frames.append(df)
+        return frames
+
+    frames = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as pool:
+        futures = {ticker: pool.submit(fetch_one, ticker) for ticker in tickers}
+        for ticker, future in futures.items():
+            try:
+                frames.extend(future.result())
+            except Exception as e:
+                print(f"Error fetching SEC data for {ticker}: {e}")
+
+    if not frames:
+        return pd.DataFrame(columns=[
+            'ticker', 'cik', 'concept', 'start', 'end', 'val',
+            'accn', 'fy', 'fp', 'form', 'filed', 'frame'
+        ])
+
+    df = pd.concat(frames, ignore_index=True)
+    df['end'] = pd.to_datetime(df['end'])
+    return df.sort_values(['ticker', 'concept', 'end']).reset_index(drop=True)
@@ -0,0 +1,45 @@
+import json
+import zipfile
+
+from life_agents.core import facts_store
+from life_agents.core.facts_store import FactsStore, flatten_company_facts, flatten_company_facts_bytes
+
+CIK = "0000000001"
+
+
+def _document(n_facts: int) -> dict:
+    facts = [
+        {"start": "2024-01-01", "end": "2024-03-31", "val": float(i), "accn": f"A{i}",
+         "fy": 2024, "fp": "Q1", "form": "10-Q", "filed": "2024-05-01"}
+        for i in range(n_facts)
+    ]
+    return {
+        "cik": 1,
+        "facts": {
+            "us-gaap": {"Revenues": {"units": {"USD": facts}}},
+            "dei": {"EntityCommonStockSharesOutstanding": {"units": {"shares": facts[:1]}}},
+        },
+    }
+
+
+def test_bytes_and_dict_paths_agree():
+    document = _document(3)
+    from_dict = flatten_company_facts(document)
+    from_bytes = flatten_company_facts_bytes(json.dumps(document).encode())
+
+    assert from_bytes.equals(from_dict)
+    assert from_bytes["concept"].to_list() == ["Revenues"] * 3 + ["EntityCommonStockSharesOutstanding"]
+
+
+def test_bulk_reingest_without_facts_drops_the_old_partition(tmp_path):
+    store = FactsStore(tmp_path / "facts")
+    store.write_company(flatten_company_facts(_document(2)), CIK)
+
+    archive = tmp_path / "companyfacts.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr(f"CIK{CIK}.json", json.dumps({"cik": 1, "facts": {}}))
+    facts_store._open_bulk_archive(str(archive))
+
+    assert facts_store._ingest_bulk_member(f"CIK{CIK}.json", str(store.root)) == (CIK, 0, None)
+    assert not store.partition_path(CIK).exists()
+    assert store.read_company(CIK).is_empty()
@@ -0,0 +1,48 @@
+import gzip
+
+import numpy as np
+import pytest
+
+from life_agents.core import metros
+from life_agents.core.redfin import RedfinStore
+
+COLUMNS = [
+    "PERIOD_BEGIN", "PERIOD_END", "PERIOD_DURATION", "REGION_TYPE", "IS_SEASONALLY_ADJUSTED",
+    "REGION", "CITY", "STATE_CODE", "PROPERTY_TYPE", "MEDIAN_SALE_PRICE",
+]
+
+
+def _row(begin: str, duration: int, adjusted: str, price: float) -> list:
+    return [begin, begin, duration, "place", adjusted, "Irvine, CA", "Irvine", "CA", "All Residential", price]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    rows = []
+    for month, begin in enumerate(["2024-01-01", "2024-02-01", "2024-03-01"]):
+        # Monthly unadjusted, monthly adjusted and rolling 90-day rows of one period
+        rows += [_row(begin, 30, "f", 100.0 + month), _row(begin, 30, "t", 200.0 + month), _row(begin, 90, "f", 300.0 + month)]
+    source = tmp_path / "city.tsv.gz"
+    with gzip.open(source, "wt") as f:
+        f.write("\t".join(f'"{c}"' for c in COLUMNS) + "\n")
+        for row in rows:
+            f.write("\t".join(str(v) for v in row) + "\n")
+
+    store = RedfinStore("city", tmp_path / "city")
+    store.refresh(source=source)
+    monkeypatch.setattr(metros, "get_redfin_store", lambda tracker: store)
+    return store
+
+
+def test_compares_monthly_unadjusted_rows_by_default(store):
+    panel = metros.compare_metros(["Irvine, CA"], metrics=["median_price"])
+
+    assert np.array_equal(panel.values[:, 0, 0], [100.0, 101.0, 102.0])
+
+
+def test_selects_duration_and_adjustment(store):
+    adjusted = metros.compare_metros(["Irvine, CA"], metrics=["median_price"], seasonally_adjusted=True)
+    rolling = metros.compare_metros(["Irvine, CA"], metrics=["median_price"], period_duration=90)
+
+    assert np.array_equal(adjusted.values[:, 0, 0], [200.0, 201.0, 202.0])
+    assert np.array_equal(rolling.values[:, 0, 0], [300.0, 301.0, 302.0])
@@ -0,0 +1,65 @@
+import datetime as dt
+
+import pandas as pd
+import polars as pl
+
+from life_agents.core.quarters import derive_quarters
+
+
+def _facts() -> pl.DataFrame:
+    d = dt.date
+    rows = [
+        # Cash-flow concept reported only as fiscal-year-to-date cumulatives
+        ("Capex", d(2024, 1, 1), d(2024, 3, 31), 10.0, d(2024, 5, 1), "Q1"),
+        ("Capex", d(2024, 1, 1), d(2024, 6, 30), 25.0, d(2024, 8, 1), "Q2"),
+        ("Capex", d(2024, 1, 1), d(2024, 9, 30), 45.0, d(2024, 11, 1), "Q3"),
+        ("Capex", d(2024, 1, 1), d(2024, 12, 31), 70.0, d(2025, 2, 1), "FY"),
+        # Balance-sheet instants (no start date)
+        ("Assets", None, d(2024, 6, 30), 500.0, d(2024, 8, 1), "Q2"),
+        ("Assets", None, d(2024, 12, 31), 550.0, d(2025, 2, 1), "FY"),
+    ]
+    return pl.DataFrame(
+        rows,
+        schema={"concept": pl.String, "start": pl.Date, "end": pl.Date, "val": pl.Float64, "filed": pl.Date, "fp": pl.String},
+        orient="row",
+    )
+
+
+def test_instants_pass_through_unchanged():
+    out = derive_quarters(_facts())
+    assets = out.filter(pl.col("concept") == "Assets")
+
+    assert assets["val"].to_list() == [500.0, 550.0]
+    assert assets["start"].is_null().all()
+    assert not assets["derived"].any()
+
+
+def test_durations_are_deaccumulated_alongside_instants():
+    out = derive_quarters(_facts())
+    capex = out.filter(pl.col("concept") == "Capex")
+
+    assert capex["val"].to_list() == [10.0, 15.0, 20.0, 25.0]
+    assert capex["derived"].to_list() == [False, True, True, True]
+    assert capex["fp"].to_list() == ["Q1", "Q2", "Q3", "Q4"]
+
+
+def test_instant_only_pandas_input():
+    facts = _facts().filter(pl.col("concept") == "Assets").to_pandas()
+    facts["start"] = pd.to_datetime(facts["start"])
+    out = derive_quarters(facts)
+
+    assert isinstance(out, pd.DataFrame)
+    assert out["val"].tolist() == [500.0, 550.0]
+
+
+def test_same_day_refilings_keep_the_last_row():
+    facts = _facts()
+    # Q2 cumulative refiled the same day with new values: the last row wins,
+    # whatever other series are processed alongside
+    q2 = facts.filter(pl.col("concept") == "Capex", pl.col("fp") == "Q2")
+    refiled = pl.concat(q2.with_columns(pl.lit(float(v)).alias("val")) for v in range(26, 46))
+    others = pl.concat(facts.with_columns(pl.lit(f"Opex{i}").alias("concept")) for i in range(2000))
+    out = derive_quarters(pl.concat([others, facts, refiled, others]))
+    capex = out.filter(pl.col("concept") == "Capex").sort("end")
+
+    assert capex["val"].to_list() == [10.0, 35.0, 0.0, 25.0]
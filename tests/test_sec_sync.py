@@ -0,0 +1,87 @@
+import json
+
+import polars as pl
+import pytest
+
+from life_agents.core import tickers, utils
+from life_agents.core.sec_sync import SecSync
+
+CIK = "0000000001"
+
+
+class FakeSec:
+    """Submissions feed and companyfacts of one company, served as raw bytes."""
+
+    def __init__(self):
+        self.filings = []
+        self.fail_facts = False
+
+    def file(self, accession: str, filed: str, end: str, val: float) -> None:
+        self.filings.insert(0, {"accession": accession, "filed": filed, "end": end, "val": val})
+
+    def fetch(self, url: str, max_age=None) -> bytes:
+        if "submissions" in url:
+            recent = {
+                "accessionNumber": [f["accession"] for f in self.filings],
+                "form": ["10-Q"] * len(self.filings),
+                "filingDate": [f["filed"] for f in self.filings],
+                "reportDate": [f["end"] for f in self.filings],
+                "primaryDocument": ["q.htm"] * len(self.filings),
+                "isXBRL": [1] * len(self.filings),
+            }
+            return json.dumps({"filings": {"recent": recent}}).encode()
+        if self.fail_facts:
+            raise RuntimeError("companyfacts unavailable")
+        facts = [
+            {"start": f["end"][:4] + "-01-01", "end": f["end"], "val": f["val"], "accn": f["accession"],
+             "fy": int(f["end"][:4]), "fp": "Q1", "form": "10-Q", "filed": f["filed"]}
+            for f in self.filings
+        ]
+        return json.dumps({"cik": 1, "facts": {"us-gaap": {"Revenues": {"units": {"USD": facts}}}}}).encode()
+
+
+class _Tickers:
+    def ticker(self, cik):
+        return "TEST"
+
+
+@pytest.fixture
+def sec(monkeypatch):
+    fake = FakeSec()
+    fake.file("A1", "2024-05-01", "2024-03-31", 100.0)
+    monkeypatch.setattr(utils, "fetch_sec_bytes", fake.fetch)
+    monkeypatch.setattr(tickers, "get_ticker_index", lambda: _Tickers())
+    return fake
+
+
+def _stored_accessions(sync: SecSync) -> list:
+    return sorted(pl.read_parquet(sync.store.partition_path(CIK))["accn"].unique().to_list())
+
+
+def test_facts_of_filings_indexed_by_update_filings_are_still_merged(sec, tmp_path):
+    sync = SecSync(root=tmp_path)
+    assert sync.sync_company(CIK).full_refresh
+
+    sec.file("A2", "2024-08-01", "2024-06-30", 250.0)
+    sync.update_filings(CIK)
+    result = sync.sync_company(CIK)
+
+    assert not result.full_refresh
+    assert (result.new_filings, result.new_facts) == (1, 1)
+    assert _stored_accessions(sync) == ["A1", "A2"]
+
+
+def test_facts_are_merged_after_a_failed_sync(sec, tmp_path):
+    sync = SecSync(root=tmp_path)
+    sync.sync_company(CIK)
+
+    sec.file("A2", "2024-08-01", "2024-06-30", 250.0)
+    sec.fail_facts = True
+    assert sync.sync_company(CIK).error
+
+    sec.fail_facts = False
+    result = sync.sync_company(CIK)
+
+    assert result.error is None and not result.full_refresh
+    assert result.new_facts == 1
+    assert _stored_accessions(sync) == ["A1", "A2"]